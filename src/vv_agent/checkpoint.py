@@ -18,6 +18,7 @@ _SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
 _EXTENSION_NAMESPACE_RE = re.compile(r"^[a-z0-9][a-z0-9._-]*\.[a-z0-9._-]+$")
 _CAPABILITY_SLOT_RE = re.compile(r"^[a-z][a-z0-9_.:-]*$")
 _JSON_POINTER_ESCAPE_RE = re.compile(r"~(?:0|1)")
+_UTF16_SURROGATE_RE = re.compile(r"[\ud800-\udfff]")
 _ARTIFACT_PATH_RE = re.compile(r"^\.vv-agent/artifacts/(?:[A-Za-z0-9][A-Za-z0-9._-]{0,127}/)*[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
 RUN_DEFINITION_SCHEMA = "vv-agent.run-definition.v5"
 OPERATION_REQUEST_SCHEMA = "vv-agent.operation-request.v1"
@@ -549,6 +550,14 @@ def canonical_json_bytes(value: Any, field_name: str = "value") -> bytes:
     return _canonical_json(value, field_name).encode("utf-8")
 
 
+def validate_i_json(value: Any, field_name: str = "value") -> None:
+    """Check that ``value`` is RFC 8785 I-JSON without rendering its canonical text."""
+    try:
+        _jcs_validate(value)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError(f"{field_name} must be RFC 8785 I-JSON: {exc}") from exc
+
+
 def canonical_json_sha256(value: Any, field_name: str = "value") -> str:
     return hashlib.sha256(canonical_json_bytes(value, field_name)).hexdigest()
 
@@ -1214,6 +1223,41 @@ def _jcs_encode(value: Any) -> str:
     raise TypeError(f"unsupported JSON value type {type(value).__name__}")
 
 
+def _jcs_validate(value: Any) -> None:
+    # Mirrors the checks _jcs_encode performs while rendering, in one pass without output.
+    if value is None or value is True or value is False:
+        return
+    if isinstance(value, str):
+        _jcs_validate_string(value)
+        return
+    if isinstance(value, int):
+        if not -MAX_WIRE_INTEGER <= value <= MAX_WIRE_INTEGER:
+            raise ValueError("integer is outside the I-JSON safe range")
+        return
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("non-finite number")
+        return
+    if isinstance(value, Mapping):
+        for key in value:
+            if not isinstance(key, str):
+                raise TypeError("object keys must be strings")
+            _jcs_validate_string(key)
+        for item in value.values():
+            _jcs_validate(item)
+        return
+    if isinstance(value, list | tuple):
+        for item in value:
+            _jcs_validate(item)
+        return
+    raise TypeError(f"unsupported JSON value type {type(value).__name__}")
+
+
+def _jcs_validate_string(value: str) -> None:
+    if _UTF16_SURROGATE_RE.search(value) is not None:
+        raise UnicodeError("unpaired UTF-16 surrogate")
+
+
 def _jcs_quote(value: str) -> str:
     parts = ['"']
     escapes = {
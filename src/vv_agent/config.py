@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import ast
 import json
+import pickle
 import tomllib
-from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -69,10 +70,35 @@ class ConfigError(RuntimeError):
 
 def load_llm_settings_from_file(path: str | Path) -> dict[str, Any]:
     source_path = Path(path)
-    if not source_path.exists():
-        raise ConfigError(f"Settings file not found: {source_path}")
+    try:
+        stat = source_path.stat()
+    except FileNotFoundError:
+        raise ConfigError(f"Settings file not found: {source_path}") from None
+
+    absolute_path = str(source_path.absolute())
+    snapshot = _load_llm_settings_snapshot(source_path, absolute_path, stat.st_mtime_ns, stat.st_size)
+    if snapshot is None:
+        return _parse_llm_settings_file(source_path, Path(absolute_path))
+    return pickle.loads(snapshot)
+
+
+@lru_cache(maxsize=32)
+def _load_llm_settings_snapshot(source_path: Path, absolute_path: str, mtime_ns: int, size: int) -> bytes | None:
+    """Parse a settings file once per (mtime, size) version, like bytecode caching.
+
+    The mapping is kept pickled so every caller unpickles its own mutable copy,
+    which is several times cheaper than re-parsing it. ``None`` marks a version
+    whose values cannot be pickled; callers then parse the file every time.
+    """
+    settings = _parse_llm_settings_file(source_path, Path(absolute_path))
+    try:
+        return pickle.dumps(settings, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return None
+
 
-    source = source_path.read_text(encoding="utf-8")
+def _parse_llm_settings_file(source_path: Path, absolute_path: Path) -> dict[str, Any]:
+    source = absolute_path.read_text(encoding="utf-8")
     suffix = source_path.suffix.lower()
     if suffix == ".json":
         try:
@@ -157,8 +183,21 @@ def resolve_model_endpoint(settings: dict[str, Any], backend: str, model: str) -
     if not isinstance(endpoint_candidates, list) or not endpoint_candidates:
         raise ConfigError(f"Model {selected_model!r} has no endpoint candidates")
 
-    endpoint_map = {str(item.get("id")): item for item in endpoints if isinstance(item, dict) and item.get("id")}
-    if not endpoint_map:
+    # Only the endpoints this model can use are indexed; the rest are just checked for validity.
+    wanted_ids = {
+        candidate if isinstance(candidate, str) else str(candidate.get("endpoint_id", "")).strip()
+        for candidate in endpoint_candidates
+        if isinstance(candidate, str | dict)
+    }
+    endpoint_map: dict[str, dict[str, Any]] = {}
+    has_valid_endpoint = False
+    for item in endpoints:
+        if isinstance(item, dict) and (item_id := item.get("id")):
+            has_valid_endpoint = True
+            item_key = item_id if isinstance(item_id, str) else str(item_id)
+            if item_key in wanted_ids:
+                endpoint_map[item_key] = item
+    if not has_valid_endpoint:
         raise ConfigError("No valid endpoints found in LLM_SETTINGS")
 
     options: list[EndpointOption] = []
@@ -251,7 +290,8 @@ def build_vv_llm_from_local_settings(
 def _build_vv_llm_settings(settings: dict[str, Any]) -> Settings:
     from vv_llm.settings import Settings
 
-    normalized = deepcopy(_require_settings_mapping(settings, "runtime settings"))
+    # Settings() deep-copies its input, so the caller's mapping is never mutated.
+    normalized = _require_settings_mapping(settings, "runtime settings")
 
     try:
         return Settings(**normalized)
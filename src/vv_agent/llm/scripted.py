@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass, field
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 
 from vv_agent.llm.base import LLMClient, LlmRequest, ScriptExhaustedError
 from vv_agent.types import LLMResponse
@@ -9,14 +10,17 @@ from vv_agent.types import LLMResponse
 ScriptStep = LLMResponse | Callable[[LlmRequest], LLMResponse]
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, init=False)
 class ScriptedLLM(LLMClient):
-    steps: list[ScriptStep] = field(default_factory=list)
+    steps: deque[ScriptStep]
+
+    def __init__(self, steps: Iterable[ScriptStep] = ()) -> None:
+        self.steps = deque(steps)
 
     def complete(self, request: LlmRequest) -> LLMResponse:
         if not self.steps:
             raise ScriptExhaustedError("No scripted LLM steps left.")
-        step = self.steps.pop(0)
+        step = self.steps.popleft()
         if isinstance(step, LLMResponse):
             return step
         return step(request)
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import random
 import re
+import threading
 import time
 import uuid
 from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, cast
 
@@ -23,6 +29,8 @@ from vv_agent.prompt import CacheBreakTracker, hash_system_prompt_sections, hash
 from vv_agent.types import LLMResponse, Message, ToolCall
 
 StreamCallback = Callable[[dict[str, Any]], None]
+# Streamed tool-call slots are keyed by (delta index, tool call id).
+_ToolCallKey = tuple[int, str]
 
 _REASONING_CHAIN_PROVIDERS = {
     "deepseek",
@@ -30,6 +38,10 @@ _REASONING_CHAIN_PROVIDERS = {
     "moonshot",
 }
 
+# A provider name matches exactly or followed by "-"/"_" (e.g. "deepseek_beta").
+_REASONING_CHAIN_PROVIDER_RE = re.compile(rf"(?:{'|'.join(sorted(map(re.escape, _REASONING_CHAIN_PROVIDERS)))})(?:[-_]|\Z)")
+_DEEPSEEK_PROVIDER_RE = re.compile(r"deepseek(?:[-_]|\Z)")
+
 _REASONING_CHAIN_MODEL_PREFIXES = (
     "deepseek-",
     "minimax-",
@@ -56,6 +68,13 @@ _TOOL_CALL_INCREMENTAL_ENDPOINT_PREFIXES = (
     "zhipuai",
 )
 
+# Upper bound on how long a provider's Retry-After hint may stall a retry on the same endpoint.
+_RETRY_AFTER_MAX_SECONDS = 60.0
+
+# Endpoint types whose chat clients bake a short-lived access token into the raw client,
+# so a fresh chat client has to be built per attempt to pick up refreshed tokens.
+_UNPOOLED_CHAT_CLIENT_ENDPOINT_TYPES = frozenset({"openai_vertex"})
+
 _KIMI_K3_OMITTED_EXTRA_BODY_FIELDS = (
     "enable_thinking",
     "frequency_penalty",
@@ -91,6 +110,31 @@ class _RequestOptions:
     tool_call_incremental: bool = True
 
 
+@dataclass(slots=True)
+class _ToolCallSlot:
+    """A tool call being assembled from stream deltas."""
+
+    id: str
+    name: str
+    argument_parts: list[str]
+    arguments_chars: int = 0
+    extra_content: Any = None
+    stream_started_emitted: bool = False
+
+    @property
+    def arguments(self) -> str:
+        return "".join(self.argument_parts)
+
+    def merge_arguments(self, incoming: str, *, incremental: bool) -> None:
+        # Deltas are buffered and joined once; concatenating per delta is quadratic in the payload size.
+        if incremental and self.argument_parts:
+            self.argument_parts.append(incoming)
+            self.arguments_chars += len(incoming)
+        else:
+            self.argument_parts = [incoming]
+            self.arguments_chars = len(incoming)
+
+
 @dataclass(slots=True)
 class EndpointTarget:
     endpoint_id: str
@@ -111,9 +155,15 @@ class VvLlmClient(LLMClient):
     backoff_seconds: float = 2.0
     randomize_endpoints: bool = True
     debug_dump_dir: str | None = None
+    hedge_delay_seconds: float | None = None
+    max_in_flight: int = 2
     _preferred_endpoint_id: str | None = field(default=None, init=False, repr=False)
     _request_counter: int = field(default=0, init=False, repr=False)
     _prompt_cache_tracker: CacheBreakTracker = field(default_factory=CacheBreakTracker, init=False, repr=False)
+    _chat_client_pool: dict[tuple[Any, ...], list[Any]] = field(default_factory=dict, init=False, repr=False)
+    _chat_client_pool_settings: Settings | None = field(default=None, init=False, repr=False)
+    # Guards the client-wide state above, which hedged endpoint requests share across threads.
+    _state_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def complete(self, request: LlmRequest) -> LLMResponse:
         return self._complete(request, stream_callback=None)
@@ -160,20 +210,149 @@ class VvLlmClient(LLMClient):
         ordered_targets = self._ordered_targets()
         errors: list[str] = []
         last_error: Exception | None = None
+        # Prepared+formatted messages only vary by the MiniMax system-turn rule and
+        # whether the endpoint speaks the OpenAI format, so fail-over targets reuse them.
+        formatted_by_variant: dict[tuple[bool, bool], list[dict[str, Any]]] = {}
+
+        run_target = partial(
+            self._complete_on_target,
+            request=request,
+            backend_type=backend_type,
+            model_name=model_name,
+            settings=settings,
+            message_payload=message_payload,
+            tool_payload=tool_payload,
+            request_metadata=request_metadata,
+            stream_callback=stream_callback,
+        )
 
-        for target in ordered_targets:
-            selected_model_id = target.model_id or model
-            should_stream = self._should_use_stream(selected_model_id)
-            request_options = self._resolve_request_options(
-                selected_model_id,
-                stream=should_stream,
-                endpoint_type=target.endpoint_type,
-                model_settings=model_settings,
-            )
-            request_tool_payload, request_options.tool_choice = self._apply_tool_choice(
-                tool_payload,
-                request_options.tool_choice,
-            )
+        if self._should_hedge(ordered_targets, stream_callback=stream_callback):
+            response, last_error = self._race_targets(ordered_targets, run_target, errors=errors)
+        else:
+            response = None
+            for target in ordered_targets:
+                response, target_error = run_target(
+                    target,
+                    formatted_by_variant=formatted_by_variant,
+                    share_formatted_messages=len(ordered_targets) > 1,
+                    errors=errors,
+                )
+                if response is not None:
+                    break
+                last_error = target_error or last_error
+        if response is not None:
+            self._preferred_endpoint_id = response.raw["used_endpoint_id"]
+            return response
+
+        details = "; ".join(errors) if errors else "no attempts made"
+        raise RuntimeError(f"All endpoints failed: {details}") from last_error
+
+    def _should_hedge(self, ordered_targets: list[EndpointTarget], *, stream_callback: StreamCallback | None) -> bool:
+        # Racing streams would interleave deltas from several endpoints in the callback.
+        return (
+            self.hedge_delay_seconds is not None
+            and self.max_in_flight > 1
+            and len(ordered_targets) > 1
+            and stream_callback is None
+        )
+
+    def _race_targets(
+        self,
+        ordered_targets: list[EndpointTarget],
+        run_target: Callable[..., tuple[LLMResponse | None, Exception | None]],
+        *,
+        errors: list[str],
+    ) -> tuple[LLMResponse | None, Exception | None]:
+        """Hedge across endpoints and return the first successful response.
+
+        The next endpoint starts when the in-flight ones have not answered within
+        ``hedge_delay_seconds``, or as soon as one of them gives up. Losing requests
+        cannot be interrupted mid-flight; they finish in the background and are dropped.
+        A non-retryable error from any endpoint propagates at once, as it does when
+        endpoints are tried serially, without waiting for the ones still in flight.
+        """
+        last_error: Exception | None = None
+        next_index = 0
+        # Legs run concurrently, so each one formats messages and records errors in
+        # its own scratch state. Errors are merged in start order once every leg failed.
+        errors_by_leg: list[list[str]] = []
+        pending: set[Future[tuple[LLMResponse | None, Exception | None]]] = set()
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="vv-agent-llm-hedge")
+        try:
+            while True:
+                if next_index < len(ordered_targets) and len(pending) < self.max_in_flight:
+                    leg_errors: list[str] = []
+                    errors_by_leg.append(leg_errors)
+                    pending.add(
+                        executor.submit(
+                            run_target,
+                            ordered_targets[next_index],
+                            formatted_by_variant={},
+                            share_formatted_messages=False,
+                            errors=leg_errors,
+                        )
+                    )
+                    next_index += 1
+                if not pending:
+                    errors.extend(error for leg_errors in errors_by_leg for error in leg_errors)
+                    return None, last_error
+                can_hedge = next_index < len(ordered_targets) and len(pending) < self.max_in_flight
+                done, pending = wait(
+                    pending,
+                    timeout=self.hedge_delay_seconds if can_hedge else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                fatal_errors = [error for future in done if (error := future.exception()) is not None]
+                for future in done:
+                    if future.exception() is not None:
+                        continue
+                    response, target_error = future.result()
+                    if response is not None:
+                        return response, None
+                    last_error = target_error or last_error
+                if fatal_errors:
+                    raise fatal_errors[0]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _complete_on_target(
+        self,
+        target: EndpointTarget,
+        *,
+        request: LlmRequest,
+        backend_type: BackendType,
+        model_name: str,
+        settings: Settings,
+        message_payload: list[ChatCompletionMessageParam],
+        tool_payload: list[dict[str, Any]],
+        request_metadata: dict[str, Any],
+        formatted_by_variant: dict[tuple[bool, bool], list[dict[str, Any]]],
+        share_formatted_messages: bool,
+        stream_callback: StreamCallback | None,
+        errors: list[str],
+    ) -> tuple[LLMResponse | None, Exception | None]:
+        """Run the retry loop against one endpoint.
+
+        Returns the response on success, or ``(None, last_error)`` once the endpoint's
+        attempts are exhausted. Non-retryable errors propagate.
+        """
+        last_error: Exception | None = None
+        backoff_delay = 0.0
+        selected_model_id = target.model_id or request.model
+        should_stream = self._should_use_stream(selected_model_id)
+        request_options = self._resolve_request_options(
+            selected_model_id,
+            stream=should_stream,
+            endpoint_type=target.endpoint_type,
+            model_settings=request.model_settings,
+        )
+        request_tool_payload, request_options.tool_choice = self._apply_tool_choice(
+            tool_payload,
+            request_options.tool_choice,
+        )
+        variant = (request_options.model.lower().startswith("minimax"), target.endpoint_type.startswith("openai"))
+        cached_messages = formatted_by_variant.get(variant)
+        if cached_messages is None:
             request_messages = self._prepare_messages_for_model(message_payload, request_options.model)
             formatted_messages = self._format_messages_for_request(
                 settings=settings,
@@ -182,98 +361,148 @@ class VvLlmClient(LLMClient):
                 model_name=model_name,
                 messages=request_messages,
             )
-            request_messages_payload, request_tool_payload, request_extra_body = apply_claude_prompt_cache(
-                endpoint_type=target.endpoint_type,
-                model=request_options.model,
-                messages=formatted_messages,
-                tools=request_tool_payload,
-                extra_body=request_options.extra_body,
-                metadata=request_metadata,
-                prompt_bundle=request.prompt_bundle,
-            )
-            self._track_prompt_cache_state(
-                endpoint_type=target.endpoint_type,
-                model=request_options.model,
-                prompt_bundle=request.prompt_bundle,
-                tool_payload=request_tool_payload,
-            )
-            request_options = _RequestOptions(
-                model=request_options.model,
-                temperature=request_options.temperature,
-                top_p=request_options.top_p,
-                max_tokens=request_options.max_tokens,
-                max_completion_tokens=request_options.max_completion_tokens,
-                tool_choice=request_options.tool_choice,
-                parallel_tool_calls=request_options.parallel_tool_calls,
-                response_format=request_options.response_format,
-                timeout_seconds=request_options.timeout_seconds,
-                thinking=request_options.thinking,
-                reasoning_effort=request_options.reasoning_effort,
-                extra_body=request_extra_body,
-                extra_args=request_options.extra_args,
-                max_attempts=request_options.max_attempts,
-                backoff_seconds=request_options.backoff_seconds,
-                is_gemini_3_model=request_options.is_gemini_3_model,
-                tool_call_incremental=request_options.tool_call_incremental,
+            if share_formatted_messages:
+                # Chat clients edit the top-level message dicts in place, so keep a pristine copy.
+                formatted_by_variant[variant] = [dict(message) for message in formatted_messages]
+        else:
+            formatted_messages = [dict(message) for message in cached_messages]
+        request_messages_payload, request_tool_payload, request_extra_body = apply_claude_prompt_cache(
+            endpoint_type=target.endpoint_type,
+            model=request_options.model,
+            messages=formatted_messages,
+            tools=request_tool_payload,
+            extra_body=request_options.extra_body,
+            metadata=request_metadata,
+            prompt_bundle=request.prompt_bundle,
+        )
+        self._track_prompt_cache_state(
+            endpoint_type=target.endpoint_type,
+            model=request_options.model,
+            prompt_bundle=request.prompt_bundle,
+            tool_payload=request_tool_payload,
+        )
+        request_options = _RequestOptions(
+            model=request_options.model,
+            temperature=request_options.temperature,
+            top_p=request_options.top_p,
+            max_tokens=request_options.max_tokens,
+            max_completion_tokens=request_options.max_completion_tokens,
+            tool_choice=request_options.tool_choice,
+            parallel_tool_calls=request_options.parallel_tool_calls,
+            response_format=request_options.response_format,
+            timeout_seconds=request_options.timeout_seconds,
+            thinking=request_options.thinking,
+            reasoning_effort=request_options.reasoning_effort,
+            extra_body=request_extra_body,
+            extra_args=request_options.extra_args,
+            max_attempts=request_options.max_attempts,
+            backoff_seconds=request_options.backoff_seconds,
+            is_gemini_3_model=request_options.is_gemini_3_model,
+            tool_call_incremental=request_options.tool_call_incremental,
+        )
+        self._dump_request_messages(request_messages_payload, model_name=model_name)
+
+        for attempt in range(1, request_options.max_attempts + 1):
+            pool_key, chat_client = self._acquire_chat_client(
+                backend_type=backend_type,
+                model_name=model_name,
+                stream=should_stream,
+                target=target,
+                settings=settings,
             )
-            self._dump_request_messages(request_messages_payload, model_name=model_name)
-
-            for attempt in range(1, request_options.max_attempts + 1):
-                try:
-                    chat_client = create_chat_client(
-                        backend=backend_type,
-                        model=model_name,
-                        stream=should_stream,
-                        random_endpoint=False,
-                        endpoint_id=target.endpoint_id,
-                        settings=settings,
+            try:
+                if should_stream:
+                    response = self._stream_completion(
+                        chat_client=chat_client,
+                        options=request_options,
+                        messages=request_messages_payload,
+                        model_name=model_name,
+                        tool_payload=request_tool_payload,
+                        stream_callback=stream_callback,
+                    )
+                else:
+                    response = self._non_stream_completion(
+                        chat_client=chat_client,
+                        options=request_options,
+                        messages=request_messages_payload,
+                        model_name=model_name,
+                        tool_payload=request_tool_payload,
                     )
-                    if should_stream:
-                        response = self._stream_completion(
-                            chat_client=chat_client,
-                            options=request_options,
-                            messages=request_messages_payload,
-                            model_name=model_name,
-                            tool_payload=request_tool_payload,
-                            stream_callback=stream_callback,
-                        )
-                    else:
-                        response = self._non_stream_completion(
-                            chat_client=chat_client,
-                            options=request_options,
-                            messages=request_messages_payload,
-                            model_name=model_name,
-                            tool_payload=request_tool_payload,
-                        )
 
-                    response.raw["used_endpoint_id"] = target.endpoint_id
-                    response.raw["used_model_id"] = request_options.model
-                    response.raw["stream_mode"] = should_stream
-                    self._preferred_endpoint_id = target.endpoint_id
-                    return response
-                except APIConnectionError as exc:
-                    last_error = exc
-                    errors.append(f"{target.endpoint_id}: network timeout/connection error (attempt {attempt})")
-                    if attempt < request_options.max_attempts:
-                        self._sleep_backoff(attempt, request_options.backoff_seconds)
-                        continue
-                    break
-                except APIStatusError as exc:
-                    last_error = exc
-                    status = exc.status_code
-                    detail = getattr(exc, "message", "") or str(getattr(exc, "body", ""))
-                    errors.append(f"{target.endpoint_id}: status {status} - {detail} (attempt {attempt})")
-                    if status in {429, 500, 502, 503, 504, 408} and attempt < request_options.max_attempts:
-                        self._sleep_backoff(attempt, request_options.backoff_seconds)
-                        continue
-                    if status in {400, 413, 422}:
-                        raise
-                    break
-                except Exception:
+                response.raw["used_endpoint_id"] = target.endpoint_id
+                response.raw["used_model_id"] = request_options.model
+                response.raw["stream_mode"] = should_stream
+                return response, None
+            except APIConnectionError as exc:
+                last_error = exc
+                errors.append(f"{target.endpoint_id}: network timeout/connection error (attempt {attempt})")
+                if attempt < request_options.max_attempts:
+                    backoff_delay = self._sleep_backoff(request_options.backoff_seconds, previous_delay=backoff_delay)
+                    continue
+                break
+            except APIStatusError as exc:
+                last_error = exc
+                status = exc.status_code
+                detail = getattr(exc, "message", "") or str(getattr(exc, "body", ""))
+                errors.append(f"{target.endpoint_id}: status {status} - {detail} (attempt {attempt})")
+                if status in {429, 500, 502, 503, 504, 408} and attempt < request_options.max_attempts:
+                    backoff_delay = self._sleep_backoff(
+                        request_options.backoff_seconds,
+                        previous_delay=backoff_delay,
+                        retry_after=self._retry_after_seconds(exc),
+                    )
+                    continue
+                if status in {400, 413, 422}:
                     raise
+                break
+            except Exception:
+                raise
+            finally:
+                self._release_chat_client(pool_key, chat_client, settings=settings)
 
-        details = "; ".join(errors) if errors else "no attempts made"
-        raise RuntimeError(f"All endpoints failed: {details}") from last_error
+        return None, last_error
+
+    def _acquire_chat_client(
+        self,
+        *,
+        backend_type: BackendType,
+        model_name: str,
+        stream: bool,
+        target: EndpointTarget,
+        settings: Settings,
+    ) -> tuple[tuple[Any, ...] | None, Any]:
+        """Check out an idle chat client for the endpoint, creating one when none is free.
+
+        Pooled clients keep their lazily built HTTP client, so retries and later turns
+        against the same endpoint reuse its connections instead of opening new ones.
+        """
+        pool_key: tuple[Any, ...] | None = None
+        if target.endpoint_type not in _UNPOOLED_CHAT_CLIENT_ENDPOINT_TYPES:
+            pool_key = (backend_type, model_name, stream, target.endpoint_id)
+            with self._state_lock:
+                if self._chat_client_pool_settings is not settings:
+                    self._chat_client_pool = {}
+                    self._chat_client_pool_settings = settings
+                idle_clients = self._chat_client_pool.get(pool_key)
+                if idle_clients:
+                    return pool_key, idle_clients.pop()
+        chat_client = create_chat_client(
+            backend=backend_type,
+            model=model_name,
+            stream=stream,
+            random_endpoint=False,
+            endpoint_id=target.endpoint_id,
+            settings=settings,
+        )
+        return pool_key, chat_client
+
+    def _release_chat_client(self, pool_key: tuple[Any, ...] | None, chat_client: Any, *, settings: Settings) -> None:
+        # Chat clients carry per-call state, so each one is used by a single request at a time.
+        if pool_key is None:
+            return
+        with self._state_lock:
+            if self._chat_client_pool_settings is settings:
+                self._chat_client_pool.setdefault(pool_key, []).append(chat_client)
 
     def _ensure_settings(self, model: str) -> Settings:
         if self.settings is not None:
@@ -322,16 +551,21 @@ class VvLlmClient(LLMClient):
         *,
         preserve_reasoning_chain: bool = False,
     ) -> list[ChatCompletionMessageParam]:
-        last_assistant_index = max(
-            (index for index, message in enumerate(messages) if message.role == "assistant"),
-            default=-1,
-        )
+        # Only the last assistant turn keeps its reasoning unless the whole chain is
+        # preserved; find it from the end, where it usually sits.
+        last_assistant_index = -1
+        if not preserve_reasoning_chain:
+            for index in range(len(messages) - 1, -1, -1):
+                if messages[index].role == "assistant":
+                    last_assistant_index = index
+                    break
 
         payload: list[ChatCompletionMessageParam] = []
         for index, message in enumerate(messages):
-            include_reasoning = message.role == "assistant" and (preserve_reasoning_chain or index == last_assistant_index)
+            is_assistant = message.role == "assistant"
+            include_reasoning = is_assistant and (preserve_reasoning_chain or index == last_assistant_index)
             item = message.to_openai_message(include_reasoning_content=include_reasoning)
-            if preserve_reasoning_chain and message.role == "assistant" and "reasoning_content" not in item:
+            if preserve_reasoning_chain and is_assistant and "reasoning_content" not in item:
                 # Moonshot/DeepSeek/MiniMax reasoning tool-call flows require this field.
                 item["reasoning_content"] = message.reasoning_content or ""
             payload.append(cast(ChatCompletionMessageParam, item))
@@ -355,7 +589,8 @@ class VvLlmClient(LLMClient):
             [section.to_dict() for section in prompt_bundle.sections] if prompt_bundle is not None else None
         )
         tool_hash = hash_tool_payload(tool_payload)
-        self._prompt_cache_tracker.check(system_hash=system_hash, tool_hash=tool_hash)
+        with self._state_lock:
+            self._prompt_cache_tracker.check(system_hash=system_hash, tool_hash=tool_hash)
 
     def _should_preserve_reasoning_chain(self, requested_model: str) -> bool:
         if self._is_reasoning_chain_provider(self.backend):
@@ -372,23 +607,17 @@ class VvLlmClient(LLMClient):
 
     @staticmethod
     def _is_reasoning_chain_provider(value: str) -> bool:
-        normalized = value.strip().lower()
-        return any(
-            normalized == provider or normalized.startswith(f"{provider}-") or normalized.startswith(f"{provider}_")
-            for provider in _REASONING_CHAIN_PROVIDERS
-        )
+        return _REASONING_CHAIN_PROVIDER_RE.match(value.strip().lower()) is not None
 
     def _uses_deepseek_model(self, *, model: str, endpoint_type: str | None) -> bool:
         normalized_model = model.strip().lower()
         if normalized_model.startswith("deepseek-"):
             return True
-        normalized_backend = self.backend.strip().lower()
-        if self._is_reasoning_chain_provider(normalized_backend) and normalized_backend.startswith("deepseek"):
+        if _DEEPSEEK_PROVIDER_RE.match(self.backend.strip().lower()) is not None:
             return True
         if endpoint_type is None:
             return False
-        normalized_endpoint = endpoint_type.strip().lower()
-        return self._is_reasoning_chain_provider(normalized_endpoint) and normalized_endpoint.startswith("deepseek")
+        return _DEEPSEEK_PROVIDER_RE.match(endpoint_type.strip().lower()) is not None
 
     def _iter_reasoning_model_candidates(self, requested_model: str) -> list[str]:
         candidates: list[str] = [requested_model]
@@ -459,6 +688,9 @@ class VvLlmClient(LLMClient):
     def _build_tool_payload(tools: list[dict[str, object]]) -> list[dict[str, Any]]:
         if not tools:
             return []
+        # Tool schemas normally arrive wrapped already; callers copy the list before editing it.
+        if all(schema.get("type") == "function" and isinstance(schema.get("function"), dict) for schema in tools):
+            return cast(list[dict[str, Any]], tools)
 
         payload: list[dict[str, Any]] = []
         for schema in tools:
@@ -827,58 +1059,72 @@ class VvLlmClient(LLMClient):
         content_chars = 0
         reasoning_chars = 0
         complete_raw_content: list[dict[str, Any]] = []
-        tool_call_parts: dict[str, dict[str, Any]] = {}
-        last_active_tool_call_id: str | None = None
+        tool_call_parts: dict[_ToolCallKey, _ToolCallSlot] = {}
+        last_active_tool_call_id: _ToolCallKey | None = None
         usage_dump: dict[str, Any] | None = None
+        # Bound once: these run for every chunk of the stream, and event payloads are
+        # only built when a callback is listening.
+        read = self._read_field
+        extract_content = self._extract_content
+        extract_reasoning_content = self._extract_reasoning_content
+        accumulate_tool_call_delta = self._accumulate_tool_call_delta
+        estimate_stream_tokens = self._estimate_stream_tokens
+        incremental = options.tool_call_incremental
+        keep_extra_content = options.is_gemini_3_model
 
         for chunk in stream:
-            usage = self._read_field(chunk, "usage")
-            usage_candidate = self._usage_to_dict(usage)
-            if usage_candidate:
-                usage_dump = usage_candidate
-
-            chunk_reasoning = self._extract_reasoning_content(self._read_field(chunk, "reasoning_content"))
+            usage = read(chunk, "usage")
+            if usage is not None:
+                usage_candidate = self._usage_to_dict(usage)
+                if usage_candidate:
+                    usage_dump = usage_candidate
+
+            reasoning_field = read(chunk, "reasoning_content")
+            chunk_reasoning = extract_reasoning_content(reasoning_field) if reasoning_field is not None else ""
             if chunk_reasoning:
                 reasoning_parts.append(chunk_reasoning)
                 reasoning_chars += len(chunk_reasoning)
-                self._emit_stream_event(
-                    stream_callback,
-                    {
-                        "event": "reasoning_delta",
-                        "reasoning_delta": chunk_reasoning,
-                        "reasoning_chars": reasoning_chars,
-                        "estimated_tokens": self._estimate_stream_tokens(reasoning_chars),
-                    },
-                )
+                if stream_callback is not None:
+                    stream_callback(
+                        {
+                            "event": "reasoning_delta",
+                            "reasoning_delta": chunk_reasoning,
+                            "reasoning_chars": reasoning_chars,
+                            "estimated_tokens": estimate_stream_tokens(reasoning_chars),
+                        }
+                    )
 
-            raw_content = self._read_field(chunk, "raw_content")
+            raw_content = read(chunk, "raw_content")
             if raw_content is not None:
                 self._collect_raw_content(complete_raw_content, raw_content)
 
-            text = self._extract_content(self._read_field(chunk, "content"))
+            content_field = read(chunk, "content")
+            text = extract_content(content_field) if content_field is not None else ""
             if text:
                 content_parts.append(text)
                 content_chars += len(text)
-                self._emit_stream_event(
-                    stream_callback,
-                    {
-                        "event": "assistant_delta",
-                        "content_delta": text,
-                        "content_chars": content_chars,
-                        "estimated_tokens": self._estimate_stream_tokens(content_chars),
-                    },
-                )
+                if stream_callback is not None:
+                    stream_callback(
+                        {
+                            "event": "assistant_delta",
+                            "content_delta": text,
+                            "content_chars": content_chars,
+                            "estimated_tokens": estimate_stream_tokens(content_chars),
+                        }
+                    )
 
-            for tool_call_index, tool_delta in enumerate(self._read_field(chunk, "tool_calls") or []):
+            for tool_call_index, tool_delta in enumerate(read(chunk, "tool_calls") or []):
                 previous_active_tool_call_id = last_active_tool_call_id
-                last_active_tool_call_id = self._accumulate_tool_call_delta(
+                last_active_tool_call_id = accumulate_tool_call_delta(
                     tool_call_parts=tool_call_parts,
                     tool_delta=tool_delta,
                     default_index=tool_call_index,
                     last_active_tool_call_id=last_active_tool_call_id,
-                    incremental=options.tool_call_incremental,
-                    keep_extra_content=options.is_gemini_3_model,
+                    incremental=incremental,
+                    keep_extra_content=keep_extra_content,
                 )
+                if stream_callback is None:
+                    continue
                 self._emit_tool_call_stream_events(
                     stream_callback=stream_callback,
                     tool_call_parts=tool_call_parts,
@@ -890,13 +1136,13 @@ class VvLlmClient(LLMClient):
 
         parsed_tool_calls: list[ToolCall] = []
         tool_call_extra_content: dict[str, Any] = {}
-        for _, slot in sorted(tool_call_parts.items(), key=self._tool_call_sort_key):
-            name = str(slot.get("name", "")).strip()
+        for _, slot in sorted(tool_call_parts.items()):
+            name = slot.name.strip()
             if not name:
                 continue
-            raw_arguments = str(slot.get("arguments", ""))
-            tool_id = str(slot.get("id") or f"call_{uuid.uuid4().hex[:12]}")
-            raw_extra_content = slot.get("extra_content")
+            raw_arguments = slot.arguments
+            tool_id = slot.id or f"call_{uuid.uuid4().hex[:12]}"
+            raw_extra_content = slot.extra_content
             parsed_tool_calls.append(
                 ToolCall(
                     id=tool_id,
@@ -905,14 +1151,15 @@ class VvLlmClient(LLMClient):
                     extra_content=raw_extra_content if isinstance(raw_extra_content, dict) else None,
                 )
             )
-            if options.is_gemini_3_model and "extra_content" in slot:
-                tool_call_extra_content[tool_id] = slot["extra_content"]
+            if options.is_gemini_3_model and raw_extra_content is not None:
+                tool_call_extra_content[tool_id] = raw_extra_content
 
         normalized = self._normalize_tool_calls(parsed_tool_calls)
+        content = "".join(content_parts)
         usage_source = "provider_reported" if usage_dump is not None else "estimated"
         final_usage = usage_dump or self._estimate_usage(
             messages=messages,
-            content="".join(content_parts),
+            content=content,
             model=options.model,
         )
         raw_payload: dict[str, Any] = {
@@ -928,7 +1175,7 @@ class VvLlmClient(LLMClient):
             raw_payload["tool_call_extra_content"] = tool_call_extra_content
 
         return LLMResponse(
-            content="".join(content_parts),
+            content=content,
             tool_calls=normalized,
             raw=raw_payload,
         )
@@ -948,11 +1195,11 @@ class VvLlmClient(LLMClient):
         self,
         *,
         stream_callback: StreamCallback | None,
-        tool_call_parts: dict[str, dict[str, Any]],
+        tool_call_parts: dict[_ToolCallKey, _ToolCallSlot],
         tool_delta: Any,
         default_index: int,
-        previous_active_tool_call_id: str | None,
-        active_tool_call_id: str | None,
+        previous_active_tool_call_id: _ToolCallKey | None,
+        active_tool_call_id: _ToolCallKey | None,
     ) -> None:
         if stream_callback is None or not active_tool_call_id or active_tool_call_id not in tool_call_parts:
             return
@@ -967,31 +1214,31 @@ class VvLlmClient(LLMClient):
         has_arguments_delta = isinstance(arguments_raw, str) and bool(arguments_raw)
         slot = tool_call_parts[active_tool_call_id]
 
-        started_emitted = bool(slot.get("_stream_started_emitted"))
+        started_emitted = slot.stream_started_emitted
         if has_name and not started_emitted:
-            arguments_chars = len(str(slot.get("arguments") or ""))
+            arguments_chars = slot.arguments_chars
             self._emit_stream_event(
                 stream_callback,
                 {
                     "event": "tool_call_started",
-                    "tool_call_id": str(slot.get("id") or ""),
+                    "tool_call_id": slot.id,
                     "tool_call_index": self._resolve_tool_call_index(tool_delta, default_index),
-                    "function_name": str(slot.get("name") or ""),
+                    "function_name": slot.name,
                     "arguments_chars": arguments_chars,
                     "estimated_tokens": self._estimate_stream_tokens(arguments_chars),
                 },
             )
-            slot["_stream_started_emitted"] = True
+            slot.stream_started_emitted = True
 
         if has_arguments_delta:
-            arguments_chars = len(str(slot.get("arguments") or ""))
+            arguments_chars = slot.arguments_chars
             self._emit_stream_event(
                 stream_callback,
                 {
                     "event": "tool_call_progress",
-                    "tool_call_id": str(slot.get("id") or ""),
+                    "tool_call_id": slot.id,
                     "tool_call_index": self._resolve_tool_call_index(tool_delta, default_index),
-                    "function_name": str(slot.get("name") or ""),
+                    "function_name": slot.name,
                     "arguments_chars": arguments_chars,
                     "estimated_tokens": self._estimate_stream_tokens(arguments_chars),
                 },
@@ -1001,16 +1248,6 @@ class VvLlmClient(LLMClient):
         index_raw = self._read_field(tool_delta, "index")
         return index_raw if isinstance(index_raw, int) else default_index
 
-    @staticmethod
-    def _tool_call_sort_key(item: tuple[str, dict[str, Any]]) -> tuple[int, str]:
-        call_id, _ = item
-        index_text, _, _ = call_id.partition("_")
-        try:
-            index = int(index_text)
-        except ValueError:
-            index = 10**9
-        return index, call_id
-
     @classmethod
     def _collect_raw_content(cls, complete_raw_content: list[dict[str, Any]], chunk_raw_content: Any) -> None:
         if isinstance(chunk_raw_content, list):
@@ -1094,13 +1331,13 @@ class VvLlmClient(LLMClient):
     def _accumulate_tool_call_delta(
         self,
         *,
-        tool_call_parts: dict[str, dict[str, Any]],
+        tool_call_parts: dict[_ToolCallKey, _ToolCallSlot],
         tool_delta: Any,
         default_index: int,
-        last_active_tool_call_id: str | None,
+        last_active_tool_call_id: _ToolCallKey | None,
         incremental: bool,
         keep_extra_content: bool,
-    ) -> str | None:
+    ) -> _ToolCallKey | None:
         function = self._read_field(tool_delta, "function")
         if function is None:
             return last_active_tool_call_id
@@ -1120,28 +1357,24 @@ class VvLlmClient(LLMClient):
 
         if name:
             tool_id = delta_id or f"generated_{index}_{len(tool_call_parts)}"
-            unique_id = f"{index}_{tool_id}"
+            unique_id = (index, tool_id)
 
             if unique_id in tool_call_parts:
                 slot = tool_call_parts[unique_id]
                 if arguments:
-                    slot["arguments"] = self._merge_tool_arguments(
-                        existing=str(slot.get("arguments", "")),
-                        incoming=arguments,
-                        incremental=incremental,
-                    )
-                if delta_id and (not slot.get("id") or str(slot["id"]).startswith("generated_")):
-                    slot["id"] = delta_id
+                    slot.merge_arguments(arguments, incremental=incremental)
+                if delta_id and (not slot.id or slot.id.startswith("generated_")):
+                    slot.id = delta_id
                 if keep_extra_content and extra_content:
-                    slot["extra_content"] = extra_content
+                    slot.extra_content = extra_content
             else:
-                tool_call_parts[unique_id] = {
-                    "id": tool_id,
-                    "name": name,
-                    "arguments": arguments,
-                }
-                if keep_extra_content and extra_content:
-                    tool_call_parts[unique_id]["extra_content"] = extra_content
+                tool_call_parts[unique_id] = _ToolCallSlot(
+                    id=tool_id,
+                    name=name,
+                    argument_parts=[arguments],
+                    arguments_chars=len(arguments),
+                    extra_content=extra_content if keep_extra_content and extra_content else None,
+                )
 
             return unique_id
 
@@ -1151,31 +1384,19 @@ class VvLlmClient(LLMClient):
         target_id = last_active_tool_call_id
         if target_id is None and delta_id:
             for existing_id, slot in tool_call_parts.items():
-                if slot.get("id") == delta_id:
+                if slot.id == delta_id:
                     target_id = existing_id
                     break
 
         if target_id and target_id in tool_call_parts:
             slot = tool_call_parts[target_id]
             if arguments:
-                slot["arguments"] = self._merge_tool_arguments(
-                    existing=str(slot.get("arguments", "")),
-                    incoming=arguments,
-                    incremental=incremental,
-                )
-            if delta_id and (not slot.get("id") or str(slot["id"]).startswith("generated_")):
-                slot["id"] = delta_id
+                slot.merge_arguments(arguments, incremental=incremental)
+            if delta_id and (not slot.id or slot.id.startswith("generated_")):
+                slot.id = delta_id
 
         return target_id
 
-    @staticmethod
-    def _merge_tool_arguments(*, existing: str, incoming: str, incremental: bool) -> str:
-        if not existing:
-            return incoming
-        if incremental:
-            return existing + incoming
-        return incoming
-
     def _parse_non_stream_tool_calls(self, tool_calls_raw: Any) -> list[ToolCall]:
         parsed_tool_calls: list[ToolCall] = []
         for call in tool_calls_raw or []:
@@ -1233,6 +1454,8 @@ class VvLlmClient(LLMClient):
     def _extract_content(content: Any) -> str:
         if isinstance(content, str):
             return content
+        if content is None:
+            return ""
 
         if isinstance(content, list):
             parts: list[str] = []
@@ -1250,15 +1473,14 @@ class VvLlmClient(LLMClient):
                     parts.append(text)
             return "\n".join(parts)
 
-        if content is None:
-            return ""
-
         return str(content)
 
     @staticmethod
     def _extract_reasoning_content(content: Any) -> str:
         if isinstance(content, str):
             return content
+        if content is None:
+            return ""
 
         if isinstance(content, dict):
             for key in ("reasoning_content", "reasoning", "thinking", "text", "content"):
@@ -1342,22 +1564,57 @@ class VvLlmClient(LLMClient):
         return max(len(text) // 4, 1)
 
     @staticmethod
-    def _sleep_backoff(attempt: int, backoff_seconds: float) -> None:
-        jitter = random.uniform(0.0, 0.5)
-        sleep_seconds = backoff_seconds * attempt + jitter
-        time.sleep(sleep_seconds)
+    def _retry_after_seconds(exc: APIStatusError) -> float | None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        if headers is None:
+            return None
+        raw_ms = headers.get("retry-after-ms")
+        raw_value = headers.get("retry-after")
+        try:
+            if raw_ms is not None:
+                seconds = float(raw_ms) / 1000.0
+            elif raw_value is not None:
+                seconds = float(raw_value)
+            else:
+                return None
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(str(raw_value))
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=UTC)
+            seconds = (retry_at - datetime.now(UTC)).total_seconds()
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+
+    @staticmethod
+    def _sleep_backoff(backoff_seconds: float, *, previous_delay: float = 0.0, retry_after: float | None = None) -> float:
+        """Sleep before the next attempt and return the delay used.
+
+        Delays use decorrelated jitter: each is drawn between ``backoff_seconds`` and three
+        times the previous delay, capped at ten times the base, so concurrent callers
+        spread out instead of retrying in lockstep. A provider ``Retry-After`` hint raises
+        the delay, bounded by ``_RETRY_AFTER_MAX_SECONDS``.
+        """
+        delay = min(backoff_seconds * 10, random.uniform(backoff_seconds, max(backoff_seconds, previous_delay * 3)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, _RETRY_AFTER_MAX_SECONDS))
+        time.sleep(delay)
+        return delay
 
     def _dump_request_messages(self, messages: list[dict[str, Any]], *, model_name: str) -> None:
         if not self.debug_dump_dir:
             return
-        self._request_counter += 1
+        with self._state_lock:
+            self._request_counter += 1
+            request_index = self._request_counter
         dump_dir = Path(self.debug_dump_dir)
         try:
             dump_dir.mkdir(parents=True, exist_ok=True)
             safe_model_name = re.sub(r"[^a-zA-Z0-9._-]+", "_", model_name).strip("_") or "model"
-            filename = f"request_{self._request_counter:03d}_{safe_model_name}.json"
+            filename = f"request_{request_index:03d}_{safe_model_name}.json"
             payload = {
-                "request_index": self._request_counter,
+                "request_index": request_index,
                 "model": model_name,
                 "message_count": len(messages),
                 "messages": messages,
@@ -36,6 +36,7 @@ _COMPRESSED_AGENT_MEMORY_PATTERN = re.compile(
 )
 _ANALYSIS_BLOCK_PATTERN = re.compile(r"<analysis>[\s\S]*?</analysis>", re.IGNORECASE)
 _SUMMARY_BLOCK_PATTERN = re.compile(r"<summary>\s*([\s\S]*?)\s*</summary>", re.IGNORECASE)
+_COMPACTED_ARTIFACT_META_PATTERN = re.compile(r"^[ \t]*(tool_name|artifact_path):[ \t]*(.*?)\s*$", re.MULTILINE)
 
 _MEMORY_WARNING_PROMPTS = {
     "zh-CN": (
@@ -148,6 +149,67 @@ def _strongest_compaction_mode(*modes: CompactionMode) -> CompactionMode:
     return max(modes, key=_COMPACTION_MODE_RANK.__getitem__, default="none")
 
 
+# A compaction pass re-counts the same message list several times; a handful of
+# recent counts is enough to cover one runtime cycle.
+_TOKEN_COUNT_CACHE_SIZE = 8
+
+
+def _message_token_fingerprint(message: Message) -> tuple[object, ...]:
+    """Hashable view of every message field that feeds ``to_openai_message``."""
+    tool_calls = message.tool_calls
+    return (
+        message.role,
+        message.content,
+        message.name,
+        message.tool_call_id,
+        message.reasoning_content,
+        message.image_url,
+        json.dumps(tool_calls, ensure_ascii=False, sort_keys=True, default=str) if tool_calls else None,
+    )
+
+
+# Slack per message for role/name framing and JSON keys in the fallback estimate.
+_APPROX_MESSAGE_OVERHEAD_TOKENS = 64
+
+
+def _utf8_length(text: str | None) -> int:
+    if not text:
+        return 0
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _approx_message_length(messages: list[Message]) -> int | None:
+    """Cheap upper bound on the token count of ``messages``, or ``None`` when unknown.
+
+    Byte-level tokenizers never emit more tokens than UTF-8 bytes, so summing byte
+    lengths bounds the exact count without running the tokenizer. Image inputs
+    are priced by the model, so they opt out of the bound.
+    """
+    total = 0
+    for message in messages:
+        if message.image_url and message.role == "user":
+            return None
+        total += (
+            _utf8_length(message.content)
+            + _utf8_length(message.reasoning_content)
+            + _utf8_length(message.name)
+            + _utf8_length(message.tool_call_id)
+            + _APPROX_MESSAGE_OVERHEAD_TOKENS
+        )
+        for tool_call in message.tool_calls or ():
+            function = tool_call.get("function") if isinstance(tool_call, dict) else None
+            if not isinstance(function, dict):
+                total += _utf8_length(str(tool_call))
+                continue
+            arguments = function.get("arguments")
+            total += (
+                _utf8_length(arguments if isinstance(arguments, str) else str(arguments))
+                + _utf8_length(str(function.get("name") or ""))
+                + _APPROX_MESSAGE_OVERHEAD_TOKENS
+            )
+    return total
+
+
 ReservedOutputSource = Literal[
     "model_settings",
     "task_metadata",
@@ -205,6 +267,7 @@ class MemoryManager:
     summary_callback: SummaryCallback | None = None
     base_system_prompt: str = ""
     session_memory: SessionMemory | None = None
+    _token_count_cache: dict[tuple[object, ...], int] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not isinstance(self.microcompaction_policy, MicrocompactionPolicy):
@@ -288,6 +351,14 @@ class MemoryManager:
         if summary_removed or sanitized:
             strongest_mode = "structural"
 
+        if not force and self._fits_without_compaction(
+            working_messages,
+            total_tokens=total_tokens,
+            recent_tool_call_ids=recent_tool_call_ids,
+            microcompact_plan=microcompact_plan,
+        ):
+            return self._compaction_result(original_messages, working_messages, strongest_mode)
+
         message_length = self._calculate_effective_length(
             working_messages,
             total_tokens=total_tokens,
@@ -511,20 +582,26 @@ class MemoryManager:
     def _calculate_message_length(self, messages: list[Message]) -> int:
         if not messages:
             return 0
+        # Fingerprints are cheap next to tokenizing; str hashes are cached on the strings.
+        cache_key = (self.model, *map(_message_token_fingerprint, messages))
+        cache = self._token_count_cache
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
         payload = [message.to_openai_message() for message in messages]
-        return count_messages_tokens(payload, model=self.model)
+        count = count_messages_tokens(payload, model=self.model)
+        if len(cache) >= _TOKEN_COUNT_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        cache[cache_key] = count
+        return count
 
     def _estimate_tool_message_length(self, messages: list[Message], recent_tool_call_ids: set[str] | None) -> int:
         if not recent_tool_call_ids:
             return 0
         tool_messages = [
-            message.to_openai_message()
-            for message in messages
-            if message.role == "tool" and message.tool_call_id in recent_tool_call_ids
+            message for message in messages if message.role == "tool" and message.tool_call_id in recent_tool_call_ids
         ]
-        if not tool_messages:
-            return 0
-        return count_messages_tokens(tool_messages, model=self.model)
+        return self._calculate_message_length(tool_messages)
 
     def _calculate_effective_length(
         self,
@@ -537,6 +614,46 @@ class MemoryManager:
             return total_tokens + self._estimate_tool_message_length(messages, recent_tool_call_ids)
         return self._calculate_message_length(messages)
 
+    def _fits_without_compaction(
+        self,
+        messages: list[Message],
+        *,
+        total_tokens: int | None,
+        recent_tool_call_ids: set[str] | None,
+        microcompact_plan: MicrocompactPlan | None,
+    ) -> bool:
+        """Return True when an upper bound proves ``compact`` would be a no-op.
+
+        Skips the exact token count while the history is below every threshold
+        that reads it: autocompact, the memory warning and microcompaction.
+        """
+        if microcompact_plan is not None and microcompact_plan.candidates:
+            return False
+        if self.session_memory is not None and self.session_memory.config.extraction_callback is not None:
+            return False
+        limit = self.autocompact_threshold
+        if limit <= 0:
+            return False
+        if self.include_memory_warning:
+            limit = min(limit, self.warning_threshold - 1)
+        if self.microcompact_trigger_threshold > 0:
+            limit = min(limit, self.microcompact_trigger_threshold)
+
+        if total_tokens is not None and total_tokens > 0:
+            if not recent_tool_call_ids:
+                return total_tokens <= limit
+            tool_messages = [
+                message for message in messages if message.role == "tool" and message.tool_call_id in recent_tool_call_ids
+            ]
+            upper_bound = _approx_message_length(tool_messages)
+            return upper_bound is not None and total_tokens + upper_bound <= limit
+        upper_bound = _approx_message_length(messages)
+        return upper_bound is not None and upper_bound <= limit
+
+    def count_message_tokens(self, messages: list[Message]) -> int:
+        """Prompt token count for ``messages``, reusing recent counts of identical lists."""
+        return self._calculate_message_length(messages)
+
     def estimate_memory_usage_percentage(
         self,
         messages: list[Message],
@@ -878,25 +995,26 @@ class MemoryManager:
         return collapsed, updated
 
     def _compact_processed_image_messages(self, messages: list[Message]) -> tuple[list[Message], bool]:
-        assistant_indices = [idx for idx, message in enumerate(messages) if message.role == "assistant"]
-        if not assistant_indices:
+        last_assistant_index = next(
+            (idx for idx in range(len(messages) - 1, -1, -1) if messages[idx].role == "assistant"),
+            -1,
+        )
+        if last_assistant_index < 0:
             return messages, False
 
         updated = False
         compacted: list[Message] = []
         for idx, message in enumerate(messages):
-            if message.role == "user" and message.image_url:
-                has_following_assistant = any(assistant_index > idx for assistant_index in assistant_indices)
-                if has_following_assistant:
-                    updated = True
-                    compacted.append(
-                        replace(
-                            message,
-                            content=f"{message.content} [image payload compacted]".strip(),
-                            image_url=None,
-                        )
+            if message.role == "user" and message.image_url and idx < last_assistant_index:
+                updated = True
+                compacted.append(
+                    replace(
+                        message,
+                        content=f"{message.content} [image payload compacted]".strip(),
+                        image_url=None,
                     )
-                    continue
+                )
+                continue
             compacted.append(message)
         return compacted, updated
 
@@ -1004,6 +1122,10 @@ class MemoryManager:
         if backend is None:
             return False
         try:
+            # A resized artifact cannot be intact; skip reading and hashing it.
+            info = backend.file_info(artifact.path)
+            if info is not None and info.is_file and info.size != artifact.size_bytes:
+                return False
             content = backend.read_bytes(artifact.path)
             content.decode("utf-8")
         except (OSError, UnicodeDecodeError, ValueError):
@@ -1049,14 +1171,11 @@ class MemoryManager:
             artifact_info: dict[str, str] = {}
             if message.artifact_ref is not None:
                 artifact_info["path"] = message.artifact_ref.path
-            for line in message.content.splitlines():
-                stripped = line.strip()
-                if stripped.startswith("tool_name:"):
-                    artifact_info["tool"] = stripped[len("tool_name:") :].strip()
-                elif stripped.startswith("artifact_path:"):
-                    path = stripped[len("artifact_path:") :].strip()
-                    if path and path != "N/A":
-                        artifact_info["path"] = path
+            for key, value in _COMPACTED_ARTIFACT_META_PATTERN.findall(message.content):
+                if key == "tool_name":
+                    artifact_info["tool"] = value
+                elif value and value != "N/A":
+                    artifact_info["path"] = value
 
             if tool_call_id_to_info:
                 tool_call_id = message.tool_call_id
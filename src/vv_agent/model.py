@@ -147,11 +147,11 @@ class ScriptedModelProvider:
 
     @classmethod
     def new(cls, backend: str, default_model: str, responses: list[LLMResponse]) -> ScriptedModelProvider:
-        return cls(backend=backend, default_model=default_model, llm=ScriptedLLM(steps=list(responses)))
+        return cls(backend=backend, default_model=default_model, llm=ScriptedLLM(steps=responses))
 
     @classmethod
     def from_steps(cls, backend: str, default_model: str, steps: list[ScriptStep]) -> ScriptedModelProvider:
-        return cls(backend=backend, default_model=default_model, llm=ScriptedLLM(steps=list(steps)))
+        return cls(backend=backend, default_model=default_model, llm=ScriptedLLM(steps=steps))
 
     @classmethod
     def from_callback(
@@ -26,5 +26,5 @@ class ExecutionBackend(Protocol):
     ) -> AgentResult: ...
 
     def parallel_map(self, fn: Callable[..., Any], items: list[Any]) -> list[Any]:
-        """Execute fn over items using the backend's parallelism. Default: serial."""
+        """Execute fn over items using the backend's parallelism, returning results in item order."""
         ...
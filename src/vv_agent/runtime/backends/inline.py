@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import contextvars
+import threading
 from collections.abc import Callable
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from typing import Any
 
 from vv_agent.runtime.backends.base import CycleExecutor
@@ -17,6 +20,8 @@ from vv_agent.types import (
     _last_assistant_output,
 )
 
+_MAX_PARALLEL_MAP_WORKERS = 8
+
 
 def _task_token_usage(ctx: ExecutionContext | None) -> TaskTokenUsage:
     return ctx.model_call_ledger.usage() if ctx is not None else TaskTokenUsage()
@@ -93,4 +98,26 @@ class InlineBackend:
         )
 
     def parallel_map(self, fn: Callable[..., Any], items: list[Any]) -> list[Any]:
-        return [fn(item) for item in items]
+        """Run ``fn`` over ``items`` on a short-lived thread pool, keeping item order.
+
+        Once any call raises, items that have not started are cancelled and the
+        earliest failing item's exception propagates after running calls finish.
+        """
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+
+        failed = threading.Event()
+
+        def run_item(item: Any) -> Any:
+            if failed.is_set():
+                raise CancelledError
+            try:
+                return fn(item)
+            except BaseException:
+                failed.set()
+                raise
+
+        max_workers = min(len(items), _MAX_PARALLEL_MAP_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vv-agent-inline") as executor:
+            futures = [executor.submit(contextvars.copy_context().run, run_item, item) for item in items]
+        return [future.result() for future in futures]
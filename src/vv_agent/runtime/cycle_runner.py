@@ -13,7 +13,6 @@ from vv_agent.memory import CompactionExhaustedError, MemoryManager
 from vv_agent.memory.manager import CompactionMode
 from vv_agent.memory.microcompact import MicrocompactPlan, is_microcompacted_tool_content
 from vv_agent.memory.provider import MemoryCompactCompleted, MemoryCompactStarted, MemoryProvider, MemoryProviderResult
-from vv_agent.memory.token_utils import count_messages_tokens
 from vv_agent.model_settings import ModelSettings
 from vv_agent.runtime.hooks import RuntimeHookManager
 from vv_agent.runtime.model_calls import ModelCallDispatchResult
@@ -412,8 +411,7 @@ class CycleRunner:
         if isinstance(total_tokens, int) and total_tokens >= 0:
             return total_tokens
         try:
-            payload = [message.to_openai_message() for message in messages]
-            return count_messages_tokens(payload, model=memory_manager.model)
+            return memory_manager.count_message_tokens(messages)
         except Exception:
             return None
 
@@ -167,25 +167,32 @@ def plan_tool_schemas(
     memory_usage_percentage: int | None = None,
 ) -> list[dict[str, Any]]:
     tool_names = plan_tool_names(task, memory_usage_percentage=memory_usage_percentage)
+    denied_side_effects = task.metadata.get("_vv_agent_denied_side_effects", [])
+    denied_capability_tags = task.metadata.get("_vv_agent_denied_capability_tags", [])
+    deny_terminal_tools = task.metadata.get("_vv_agent_deny_terminal_tools", False)
+    denied_cost_dimensions = task.metadata.get("_vv_agent_denied_cost_dimensions", [])
+    # With no denials configured the metadata policy cannot reject anything, so skip
+    # re-normalizing the empty denial lists for every planned tool.
+    policy_active = deny_terminal_tools is not False or any(
+        not isinstance(values, list | tuple) or values
+        for values in (denied_side_effects, denied_capability_tags, denied_cost_dimensions)
+    )
     available_names = [
         name
         for name in tool_names
         if registry.has_tool(name)
         and registry.has_schema(name)
-        and metadata_policy_denial_source(
-            registry.tool_metadata(name),
-            denied_side_effects=task.metadata.get("_vv_agent_denied_side_effects", []),
-            denied_capability_tags=task.metadata.get(
-                "_vv_agent_denied_capability_tags",
-                [],
-            ),
-            deny_terminal_tools=task.metadata.get("_vv_agent_deny_terminal_tools", False),
-            denied_cost_dimensions=task.metadata.get(
-                "_vv_agent_denied_cost_dimensions",
-                [],
-            ),
+        and (
+            not policy_active
+            or metadata_policy_denial_source(
+                registry.tool_metadata(name),
+                denied_side_effects=denied_side_effects,
+                denied_capability_tags=denied_capability_tags,
+                deny_terminal_tools=deny_terminal_tools,
+                denied_cost_dimensions=denied_cost_dimensions,
+            )
+            is None
         )
-        is None
     ]
     schemas = registry.list_openai_schemas(tool_names=available_names)
     return _patch_dynamic_tool_schemas(task=task, tool_schemas=schemas)
@@ -35,6 +35,7 @@ class ToolContext:
     idempotency_key: str | None = None
     session: Any | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    _resolved_workspace: tuple[Path, Path] | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def run_id(self) -> str:
@@ -75,8 +76,17 @@ class ToolContext:
             return value
         return False
 
+    def resolved_workspace(self) -> Path:
+        """Return ``workspace.resolve()``, cached until ``workspace`` is reassigned."""
+        cached = self._resolved_workspace
+        if cached is not None and cached[0] is self.workspace:
+            return cached[1]
+        resolved = self.workspace.resolve()
+        self._resolved_workspace = (self.workspace, resolved)
+        return resolved
+
     def resolve_workspace_path(self, raw_path: str) -> Path:
-        base = self.workspace.resolve()
+        base = self.resolved_workspace()
         candidate = Path(raw_path).expanduser()
         target = candidate.resolve() if candidate.is_absolute() else (base / candidate).resolve()
         if not self.allow_outside_workspace_paths() and target != base and base not in target.parents:
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, TypeGuard
 
 from vv_agent.tools.base import ToolContext
 from vv_agent.types import ToolExecutionResult, ToolResultStatus
 
+# json.dumps builds a fresh JSONEncoder whenever non-default options are passed.
+_TOOL_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
 
 def to_json(data: Any) -> str:
-    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return _TOOL_JSON_ENCODER.encode(data)
+
+
+@lru_cache(maxsize=256)
+def error_json(message: str, error_code: str, *, include_ok: bool = True) -> str:
+    """Serialize a detail-free error payload; validation errors repeat, so results are memoized."""
+    payload: dict[str, Any] = {"error": message, "error_code": error_code}
+    if include_ok:
+        payload["ok"] = False
+    return to_json(payload)
 
 
 def builtin_error(
@@ -33,7 +47,7 @@ def builtin_error(
         tool_call_id="",
         status_code=ToolResultStatus.ERROR,
         error_code=error_code,
-        content=to_json(payload),
+        content=to_json(payload) if details else error_json(message, error_code),
         metadata=host_metadata,
     )
 
@@ -75,3 +89,33 @@ def normalize_todo_items(raw_items: Any) -> list[dict[str, Any]]:
 
 def resolve_workspace_path(context: ToolContext, raw_path: str) -> Path:
     return context.resolve_workspace_path(raw_path)
+
+
+def format_output_path(context: ToolContext, candidate_path: Path) -> str:
+    """Render a path relative to the workspace root, or absolute when it lies outside."""
+    return format_resolved_output_path(context, str(candidate_path.resolve()))
+
+
+def format_listed_output_path(context: ToolContext, base_root: str, rel_from_base: str) -> str:
+    """Render a file listed under the resolved ``base_root`` by a walk that skips directory links.
+
+    Only the file itself can be a symlink there, so one lstat replaces a full resolve
+    for regular files.
+    """
+    candidate = os.path.join(base_root, rel_from_base.replace("/", os.sep))
+    if os.path.islink(candidate):
+        return format_output_path(context, Path(candidate))
+    return format_resolved_output_path(context, candidate)
+
+
+def format_resolved_output_path(context: ToolContext, resolved: str) -> str:
+    workspace_root = str(context.resolved_workspace())
+    if resolved == workspace_root:
+        return "."
+    prefix = workspace_root if workspace_root.endswith(os.sep) else workspace_root + os.sep
+    if resolved.startswith(prefix):
+        return resolved[len(prefix) :].replace(os.sep, "/")
+    try:
+        return Path(resolved).relative_to(workspace_root).as_posix() or "."
+    except ValueError:
+        return resolved
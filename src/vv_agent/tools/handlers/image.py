@@ -19,6 +19,19 @@ _EXTENSION_TO_MIME = {
 _MAX_INLINE_IMAGE_BYTES = 5 * 1024 * 1024
 
 
+def _image_too_large(actual_bytes: int) -> ToolExecutionResult:
+    details = {
+        "max_bytes": _MAX_INLINE_IMAGE_BYTES,
+        "actual_bytes": actual_bytes,
+    }
+    return builtin_error(
+        "image is too large for inline message transport",
+        "image_too_large",
+        details=details,
+        metadata=details,
+    )
+
+
 def read_image(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionResult:
     raw_path = str(arguments.get("path", "")).strip()
     if not raw_path:
@@ -45,7 +58,16 @@ def read_image(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
         return builtin_error(str(exc), "path_escapes_workspace")
 
     backend = context.workspace_backend
-    if not backend.exists(raw_path) or not backend.is_file(raw_path):
+    # One metadata lookup answers both the existence and the size checks; is_file
+    # only decides existence when the backend cannot describe the path.
+    try:
+        info = backend.file_info(raw_path)
+    except (OSError, ValueError):
+        info = None
+        is_image_file = backend.is_file(raw_path)
+    else:
+        is_image_file = info is not None and info.is_file
+    if not is_image_file:
         return builtin_error(f"image file not found: {raw_path}", "image_not_found")
 
     suffix = PurePosixPath(raw_path).suffix.lower()
@@ -55,27 +77,20 @@ def read_image(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
             "unsupported_image_format",
         )
 
+    if info is not None and info.size > _MAX_INLINE_IMAGE_BYTES:
+        return _image_too_large(info.size)
+
     try:
         image_bytes = backend.read_bytes(raw_path)
     except OSError as exc:
         return builtin_error(str(exc), "image_not_found")
     if len(image_bytes) > _MAX_INLINE_IMAGE_BYTES:
-        details = {
-            "max_bytes": _MAX_INLINE_IMAGE_BYTES,
-            "actual_bytes": len(image_bytes),
-        }
-        return builtin_error(
-            "image is too large for inline message transport",
-            "image_too_large",
-            details=details,
-            metadata=details,
-        )
+        return _image_too_large(len(image_bytes))
 
     relative_path = raw_path
     suffix = PurePosixPath(raw_path).suffix.lower()
     mime_type = _EXTENSION_TO_MIME.get(suffix, "application/octet-stream")
-    encoded = base64.b64encode(image_bytes).decode("ascii")
-    image_url = f"data:{mime_type};base64,{encoded}"
+    image_url = (f"data:{mime_type};base64,".encode("ascii") + base64.b64encode(image_bytes)).decode("ascii")
     payload = {
         "status": "loaded",
         "source": "workspace",
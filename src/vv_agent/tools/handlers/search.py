@@ -3,6 +3,7 @@ from __future__ import annotations
 import base64
 import json
 import os
+import posixpath
 import re
 import shutil
 import subprocess
@@ -12,6 +13,7 @@ from pathlib import Path, PurePosixPath
 from typing import Any
 
 from vv_agent.tools.base import ToolContext
+from vv_agent.tools.handlers.common import format_listed_output_path
 from vv_agent.tools.handlers.sensitive_paths import is_sensitive_path
 from vv_agent.types import ToolExecutionResult, ToolResultStatus
 
@@ -286,16 +288,6 @@ def _decode_rg_field(field: Any) -> str:
         return ""
 
 
-def _format_output_path(context: ToolContext, candidate_path: Path) -> str:
-    resolved = candidate_path.resolve()
-    workspace_root = context.workspace.resolve()
-    try:
-        rel = resolved.relative_to(workspace_root).as_posix()
-        return rel or "."
-    except ValueError:
-        return str(resolved)
-
-
 def _search_files_local_rg(
     context: ToolContext,
     *,
@@ -318,8 +310,9 @@ def _search_files_local_rg(
         return None
 
     base_path = context.resolve_workspace_path(path)
-    if not base_path.exists() or not base_path.is_dir():
+    if not base_path.is_dir():
         return None
+    base_root = str(base_path)
     base_is_workspace_root = _is_workspace_root(path)
     ignored_root_names = _collect_ignored_root_names(base_path) if base_is_workspace_root and not include_ignored else []
 
@@ -408,8 +401,8 @@ def _search_files_local_rg(
             rel_from_base = _decode_rg_field(data.get("path"))
             if not rel_from_base:
                 continue
-            normalized = rel_from_base.replace("\\", "/")
-            rel_workspace = _format_output_path(context, base_path / normalized)
+            normalized = posixpath.normpath(rel_from_base.replace("\\", "/"))
+            rel_workspace = format_listed_output_path(context, base_root, normalized)
             if file_type and not _matches_file_type(rel_workspace, file_type):
                 continue
 
@@ -555,6 +548,14 @@ def _truncate_result_text(result_text: str, *, total_matches: int, files_with_ma
     return f"{truncated}{truncated_info}", True
 
 
+def _format_numbered_row(line: int, text: str, is_match: bool) -> str:
+    return f"  {line}: {text}" if is_match else f"  -{line}: {text}"
+
+
+def _format_plain_row(line: int, text: str, is_match: bool) -> str:
+    return f"  {text}" if is_match else f"  -{text}"
+
+
 def _estimate_match_row_size(row: dict[str, Any]) -> int:
     return len(str(row.get("path") or "")) + len(str(row.get("line") or "")) + len(str(row.get("text") or "")) + 32
 
@@ -716,8 +717,13 @@ def search_files(context: ToolContext, arguments: dict[str, Any]) -> ToolExecuti
                 file_counts[rel_path] = file_match_count
 
                 if output_mode == "content":
+                    # Matches arrive in order, so count newlines only since the previous one.
+                    line_no = 1
+                    counted_to = 0
                     for match in matches:
-                        line_no = text.count("\n", 0, match.start()) + 1
+                        match_start = match.start()
+                        line_no += text.count("\n", counted_to, match_start)
+                        counted_to = match_start
                         content_rows.append(
                             {
                                 "path": rel_path,
@@ -843,22 +849,15 @@ def search_files(context: ToolContext, arguments: dict[str, Any]) -> ToolExecuti
         else:
             if head_limited or structured_capped:
                 result_lines.append(f"Showing first {len(visible_rows)} rows.")
+            format_row = _format_numbered_row if show_line_numbers else _format_plain_row
+            append_line = result_lines.append
             current_file: str | None = None
             for row in visible_rows:
                 row_path = str(row["path"])
-                row_line = int(row["line"])
-                row_text = str(row["text"])
-                row_is_match = bool(row["is_match"])
-
                 if current_file != row_path:
-                    result_lines.append(f"File: {row_path}")
+                    append_line(f"File: {row_path}")
                     current_file = row_path
-
-                marker = "" if row_is_match else "-"
-                if show_line_numbers:
-                    result_lines.append(f"  {marker}{row_line}: {row_text}")
-                else:
-                    result_lines.append(f"  {marker}{row_text}")
+                append_line(format_row(int(row["line"]), str(row["text"]), bool(row["is_match"])))
 
         result_text = "\n".join(result_lines)
         metadata["matches"] = visible_rows
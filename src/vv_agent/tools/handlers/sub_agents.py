@@ -4,9 +4,10 @@ import uuid
 from dataclasses import replace
 from typing import Any, cast
 
+from vv_agent.runtime.backends.inline import InlineBackend
 from vv_agent.runtime.sub_task_identity import assigned_sub_task_identity, normalize_identity_string
 from vv_agent.tools.base import ToolContext
-from vv_agent.tools.handlers.common import to_json, trim_portable_whitespace
+from vv_agent.tools.handlers.common import error_json, to_json, trim_portable_whitespace
 from vv_agent.types import AgentStatus, SubTaskRequest, ToolExecutionResult, ToolResultStatus
 from vv_agent.workspace import (
     INVALID_EXCLUDE_FILES_PATTERN_CODE,
@@ -34,7 +35,7 @@ def _error(message: str, *, error_code: str, details: dict[str, Any] | None = No
         tool_call_id="",
         status_code=ToolResultStatus.ERROR,
         error_code=error_code,
-        content=to_json(payload),
+        content=to_json(payload) if details else error_json(message, error_code),
         metadata=payload,
     )
 
@@ -150,20 +151,18 @@ def _run_requests_in_parallel_if_possible(
     if sub_task_runner is None:
         raise RuntimeError("Sub-agent runtime is not available for this task")
 
+    if not requests:
+        return {}
     execution_backend = None
     if context.ctx is not None:
         execution_backend = context.ctx.metadata.get("execution_backend")
-    if execution_backend is not None and hasattr(execution_backend, "parallel_map") and requests:
-        outcomes = execution_backend.parallel_map(
-            lambda item: (item[0], sub_task_runner(item[1])),
-            requests,
-        )
-        return dict(outcomes)
-
-    outcome_map: dict[int, Any] = {}
-    for index, request in requests:
-        outcome_map[index] = sub_task_runner(request)
-    return outcome_map
+    if execution_backend is None or not hasattr(execution_backend, "parallel_map"):
+        execution_backend = InlineBackend()
+    outcomes = execution_backend.parallel_map(
+        lambda item: (item[0], sub_task_runner(item[1])),
+        requests,
+    )
+    return dict(outcomes)
 
 
 def _format_single_sync_result(outcome: Any) -> ToolExecutionResult:
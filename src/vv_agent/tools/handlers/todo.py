@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 from vv_agent.tools.base import ToolContext
-from vv_agent.tools.handlers.common import get_todo_list, is_string_keyed_dict, to_json
+from vv_agent.tools.handlers.common import error_json, get_todo_list, is_string_keyed_dict, to_json
 from vv_agent.types import ToolExecutionResult, ToolResultStatus
 
-_ALLOWED_STATUS = {"pending", "in_progress", "completed"}
-_ALLOWED_PRIORITY = {"low", "medium", "high"}
+_ALLOWED_STATUS = frozenset({"pending", "in_progress", "completed"})
+_ALLOWED_PRIORITY = frozenset({"low", "medium", "high"})
 
 
 def _error(message: str, *, error_code: str) -> ToolExecutionResult:
@@ -17,27 +18,71 @@ def _error(message: str, *, error_code: str) -> ToolExecutionResult:
         tool_call_id="",
         status_code=ToolResultStatus.ERROR,
         error_code=error_code,
-        content=to_json({"error": message, "error_code": error_code}),
+        content=error_json(message, error_code, include_ok=False),
     )
 
 
-def todo_write(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionResult:
-    todos = arguments.get("todos")
-    if not isinstance(todos, list):
-        return _error("`todos` must be an array", error_code="invalid_todos_payload")
+@dataclass(slots=True)
+class _TodoDraft:
+    """A validated TODO item; materialized as a stored dict only once the whole list passes."""
 
-    existing_todos = get_todo_list(context.shared_state)
-    existing_map: dict[str, dict[str, Any]] = {}
-    for item in existing_todos:
+    id: str
+    title: str
+    status: str
+    priority: str
+    created_at: str
+
+    def to_dict(self, *, updated_at: str) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "updated_at": updated_at,
+        }
+
+
+def _index_todos_by_id(todos: list[Any]) -> dict[str, dict[str, Any]]:
+    indexed: dict[str, dict[str, Any]] = {}
+    for item in todos:
         if not is_string_keyed_dict(item):
             continue
         raw_item_id = item.get("id")
         item_id = str(raw_item_id).strip() if raw_item_id is not None else ""
         if item_id:
-            existing_map[item_id] = item
+            indexed[item_id] = item
+    return indexed
+
+
+def _matches_existing_todos(drafts: list[_TodoDraft], existing_todos: list[Any]) -> bool:
+    if not drafts or len(drafts) != len(existing_todos):
+        return False
+    for draft, existing in zip(drafts, existing_todos, strict=True):
+        if not is_string_keyed_dict(existing) or "updated_at" not in existing:
+            return False
+        if (
+            existing.get("id") != draft.id
+            or existing.get("title") != draft.title
+            or existing.get("status") != draft.status
+            or existing.get("priority") != draft.priority
+            or existing.get("created_at") != draft.created_at
+        ):
+            return False
+    return True
+
+
+def todo_write(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionResult:
+    todos = arguments.get("todos")
+    if not isinstance(todos, list):
+        return _error("`todos` must be an array", error_code="invalid_todos_payload")
+
+    existing_todos = get_todo_list(context.shared_state)
+    existing_map: dict[str, dict[str, Any]] | None = None
 
-    now = datetime.now(tz=UTC).isoformat()
-    new_todo_list: list[dict[str, Any]] = []
+    now = datetime.now(UTC).isoformat()
+    drafts: list[_TodoDraft] = []
+    in_progress_count = 0
 
     for index, raw_todo_item in enumerate(todos):
         if not is_string_keyed_dict(raw_todo_item):
@@ -63,34 +108,32 @@ def todo_write(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
 
         raw_id = raw_todo_item.get("id")
         item_id = str(raw_id).strip() if raw_id is not None else ""
-        if not item_id:
+        created_at = now
+        if item_id:
+            if existing_map is None:
+                existing_map = _index_todos_by_id(existing_todos)
+            previous = existing_map.get(item_id)
+            if previous is not None:
+                created_at = str(previous.get("created_at", now))
+        else:
             item_id = uuid.uuid4().hex[:8]
 
-        if item_id in existing_map:
-            previous = dict(existing_map[item_id])
-            created_at = str(previous.get("created_at", now))
-        else:
-            created_at = now
-
-        new_todo_list.append(
-            {
-                "id": item_id,
-                "title": title,
-                "status": status,
-                "priority": priority,
-                "created_at": created_at,
-                "updated_at": now,
-            }
-        )
+        if status == "in_progress":
+            in_progress_count += 1
+        drafts.append(_TodoDraft(item_id, title, status, priority, created_at))
 
-    in_progress_items = [item for item in new_todo_list if item.get("status") == "in_progress"]
-    if len(in_progress_items) > 1:
+    if in_progress_count > 1:
         return _error(
             "Only one TODO item can be in_progress at a time",
             error_code="multiple_in_progress_todos",
         )
 
-    context.shared_state["todo_list"] = new_todo_list
+    if _matches_existing_todos(drafts, existing_todos):
+        # Models often re-send the full list unchanged; keep it, including updated_at.
+        new_todo_list = existing_todos
+    else:
+        new_todo_list = [draft.to_dict(updated_at=now) for draft in drafts]
+        context.shared_state["todo_list"] = new_todo_list
 
     result = {
         "action": "write",
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import errno
 import hashlib
+import heapq
 import os
 import posixpath
 import re
 import shutil
+import stat
 import subprocess
 import sysconfig
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from vv_agent.tools.base import ToolContext
-from vv_agent.tools.handlers.common import to_json
+from vv_agent.tools.handlers.common import format_listed_output_path, to_json
 from vv_agent.tools.handlers.sensitive_paths import is_sensitive_path
 from vv_agent.types import ToolExecutionResult, ToolResultCursor, ToolResultStatus
+from vv_agent.workspace.base import _compile_workspace_glob
 
 READ_FILE_MAX_LINES = 2_000
 READ_FILE_MAX_CHARS = 12_000
@@ -51,6 +56,10 @@ LIST_FILES_IGNORED_ROOTS = frozenset(
         "vendor",
     }
 )
+_MATCH_ALL_GLOBS = frozenset({"**/*", "**"})
+_MISSING_PATH_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+# A path component starting with "." other than a bare "." marks a hidden entry.
+_HIDDEN_COMPONENT_RE = re.compile(r"(?:^|/)\.(?!/|$)")
 _RG_EXECUTABLE_CACHE: str | None | bool = None
 
 
@@ -61,28 +70,11 @@ def _is_workspace_root(path: str) -> bool:
     return Path(normalized).as_posix() in {".", ""}
 
 
-def _compile_glob_pattern(pattern: str) -> re.Pattern[str]:
-    """Compile glob once; callers can reuse the regex across many paths."""
-    parts: list[str] = []
-    i = 0
-    while i < len(pattern):
-        if pattern[i : i + 3] == "**/":
-            parts.append("(?:.+/)?")
-            i += 3
-        elif pattern[i : i + 2] == "**":
-            parts.append(".*")
-            i += 2
-        elif pattern[i] == "*":
-            parts.append("[^/]*")
-            i += 1
-        elif pattern[i] == "?":
-            parts.append("[^/]")
-            i += 1
-        else:
-            parts.append(re.escape(pattern[i]))
-            i += 1
-    regex = "^" + "".join(parts) + "$"
-    return re.compile(regex)
+def _glob_max_dir_depth(pattern: str) -> int | None:
+    """Return how many directories deep a glob without ``**`` can match, or None when unbounded."""
+    if "**" in pattern:
+        return None
+    return pattern.count("/")
 
 
 def _normalize_relative_path(path: str) -> str:
@@ -94,14 +86,8 @@ def _normalize_relative_path(path: str) -> str:
     return normalized
 
 
-def _format_output_path(context: ToolContext, candidate_path: Path) -> str:
-    resolved = candidate_path.resolve()
-    workspace_root = context.workspace.resolve()
-    try:
-        rel = resolved.relative_to(workspace_root).as_posix()
-        return rel or "."
-    except ValueError:
-        return str(resolved)
+def _has_hidden_component(path: str) -> bool:
+    return _HIDDEN_COMPONENT_RE.search(path) is not None
 
 
 def _baseline_key(path: str) -> str:
@@ -113,13 +99,12 @@ def _content_hash(content: bytes) -> str:
 
 
 def _line_ending_label(text: str) -> str:
-    lf_count = text.count("\n")
     crlf_count = text.count("\r\n")
-    if crlf_count > 0 and crlf_count == lf_count:
+    if crlf_count == 0:
+        return "lf"
+    if crlf_count == text.count("\n"):
         return "crlf"
-    if crlf_count > 0:
-        return "mixed"
-    return "lf"
+    return "mixed"
 
 
 def _get_file_baselines(context: ToolContext) -> dict[str, dict[str, Any]]:
@@ -132,9 +117,11 @@ def _get_file_baselines(context: ToolContext) -> dict[str, dict[str, Any]]:
 
 def _decode_workspace_text(raw: bytes) -> tuple[str, bool]:
     has_bom = raw.startswith(UTF8_BOM)
-    payload = raw[len(UTF8_BOM) :] if has_bom else raw
     try:
-        return payload.decode("utf-8"), has_bom
+        if has_bom:
+            # Decode through a view so large BOM-prefixed files are not copied just to drop 3 bytes.
+            return str(memoryview(raw)[len(UTF8_BOM) :], "utf-8"), has_bom
+        return raw.decode("utf-8"), has_bom
     except UnicodeDecodeError as exc:
         raise ValueError("unsupported_encoding") from exc
 
@@ -152,10 +139,11 @@ def _record_file_baseline(
     text: str,
     is_partial: bool,
     source: str,
+    digest: str | None = None,
 ) -> None:
     baselines = _get_file_baselines(context)
     baselines[_baseline_key(path)] = {
-        "hash": _content_hash(raw),
+        "hash": digest if digest is not None else _content_hash(raw),
         "size": len(raw),
         "line_ending": _line_ending_label(text),
         "is_partial": bool(is_partial),
@@ -178,12 +166,31 @@ def _baseline_error(
         return "file_not_read"
     if baseline.get("is_partial") and not (allow_partial and baseline.get("source") == READ_FILE_BASELINE_SOURCE):
         return "file_not_read"
+    # A size change already proves the file changed; only hash when sizes agree.
+    recorded_size = baseline.get("size")
+    if isinstance(recorded_size, int) and recorded_size != len(current_raw):
+        return "file_changed_since_read"
     if baseline.get("hash") != _content_hash(current_raw):
         return "file_changed_since_read"
     return None
 
 
-def _workspace_error(message: str, *, error_code: str, **details: Any) -> ToolExecutionResult:
+def _read_file_bytes(context: ToolContext, path: str) -> bytes | None:
+    """Read ``path``, or return None when it is not a file.
+
+    ``is_file`` is only consulted after a failed read, which spares successful reads
+    a second path resolution and stat.
+    """
+    backend = context.workspace_backend
+    try:
+        return backend.read_bytes(path)
+    except Exception:
+        if backend.is_file(path):
+            raise
+        return None
+
+
+def _workspace_error_payload(message: str, error_code: str, details: dict[str, Any]) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "ok": False,
         "error": message,
@@ -191,11 +198,26 @@ def _workspace_error(message: str, *, error_code: str, **details: Any) -> ToolEx
         "message": message,
     }
     payload.update(details)
+    return payload
+
+
+@lru_cache(maxsize=256)
+def _path_error_json(message: str, error_code: str, path: str) -> str:
+    """Serialize a path-only workspace error; agents often retry the same missing path."""
+    return to_json(_workspace_error_payload(message, error_code, {"path": path}))
+
+
+def _workspace_error(message: str, *, error_code: str, **details: Any) -> ToolExecutionResult:
+    path = details.get("path")
+    if len(details) == 1 and isinstance(path, str):
+        content = _path_error_json(message, error_code, path)
+    else:
+        content = to_json(_workspace_error_payload(message, error_code, details))
     return ToolExecutionResult(
         tool_call_id="",
         status_code=ToolResultStatus.ERROR,
         error_code=error_code,
-        content=to_json(payload),
+        content=content,
         metadata={"error_code": error_code, **details},
     )
 
@@ -332,6 +354,10 @@ def _find_files_local_rg(
         command.append("--hidden")
     if glob_pattern and glob_pattern != "**/*":
         command.extend(["--glob", glob_pattern])
+    max_dir_depth = _glob_max_dir_depth(glob_pattern)
+    if max_dir_depth is not None:
+        # rg counts the files directly under the searched path as depth 1.
+        command.extend(["--max-depth", str(max_dir_depth + 1)])
     if base_is_workspace_root and not include_ignored:
         for ignored_name in ignored_root_names:
             command.extend(["--glob", f"!{ignored_name}/**"])
@@ -349,6 +375,8 @@ def _find_files_local_rg(
 
     assert process.stdout is not None
 
+    base_root = str(base_path)
+    match_all = glob_pattern in _MATCH_ALL_GLOBS
     matched_files: list[str] = []
     matched_count = 0
     scanned_count = 0
@@ -378,11 +406,10 @@ def _find_files_local_rg(
             rel_from_base = _normalize_relative_path(raw_entry.decode("utf-8", errors="replace"))
             if not rel_from_base:
                 continue
-            if not glob_regex.match(rel_from_base):
+            if not match_all and not glob_regex.match(rel_from_base):
                 continue
 
-            candidate_path = base_path / rel_from_base
-            rel_workspace = _format_output_path(context, candidate_path)
+            rel_workspace = format_listed_output_path(context, base_root, rel_from_base)
 
             matched_count += 1
             if len(matched_files) < max_results:
@@ -406,9 +433,8 @@ def _find_files_local_rg(
     if remainder and not scan_limited:
         rel_from_base = _normalize_relative_path(remainder.decode("utf-8", errors="replace"))
         scanned_count += 1
-        if scanned_count <= scan_limit and rel_from_base and glob_regex.match(rel_from_base):
-            candidate_path = base_path / rel_from_base
-            rel_workspace = _format_output_path(context, candidate_path)
+        if scanned_count <= scan_limit and rel_from_base and (match_all or glob_regex.match(rel_from_base)):
+            rel_workspace = format_listed_output_path(context, base_root, rel_from_base)
             matched_count += 1
             if len(matched_files) < max_results:
                 matched_files.append(rel_workspace)
@@ -431,9 +457,15 @@ def _find_files_local_fast(
     scan_limit: int,
 ) -> tuple[list[str], int, bool, bool, list[dict[str, Any]]]:
     base_path = context.resolve_workspace_path(path)
-    if not base_path.exists():
-        raise ValueError(f"path not found: {path}")
-    if not base_path.is_dir():
+    # One stat answers both the existence and the directory check.
+    try:
+        base_is_dir = stat.S_ISDIR(os.stat(base_path).st_mode)
+    except OSError as exc:
+        # Same errors Path.exists() treats as a missing path; anything else propagates.
+        if exc.errno not in _MISSING_PATH_ERRNOS:
+            raise
+        raise ValueError(f"path not found: {path}") from None
+    if not base_is_dir:
         raise ValueError(f"not a directory: {path}")
 
     root_listing = _is_workspace_root(path)
@@ -455,7 +487,7 @@ def _find_files_local_fast(
             # Ignore listing errors from inaccessible roots.
             pass
 
-    glob_regex = _compile_glob_pattern(glob_pattern)
+    glob_regex = _compile_workspace_glob(glob_pattern)
     rg_result = _find_files_local_rg(
         context=context,
         base_path=base_path,
@@ -476,8 +508,14 @@ def _find_files_local_fast(
     matched_count = 0
     scanned_count = 0
     scan_limited = False
+    # os.walk yields roots prefixed by the string it was given, so the base-relative
+    # directory is a slice instead of a Path.relative_to per directory.
+    base_root = str(base_path)
+    match_all = glob_pattern in _MATCH_ALL_GLOBS
+    max_dir_depth = _glob_max_dir_depth(glob_pattern)
+    base_prefix_len = len(base_root) if base_root.endswith(os.sep) else len(base_root) + 1
     for current_root, dirs, filenames in os.walk(
-        base_path,
+        base_root,
         topdown=True,
         onerror=lambda _e: None,
         followlinks=False,
@@ -489,13 +527,12 @@ def _find_files_local_fast(
             dirs[:] = [name for name in dirs if not name.startswith(".")]
             filenames = [name for name in filenames if not name.startswith(".")]
 
-        current_path = Path(current_root)
-        if root_listing and not include_ignored and current_path == base_path:
+        rel_dir = current_root[base_prefix_len:].replace(os.sep, "/")
+        if root_listing and not include_ignored and not rel_dir:
             dirs[:] = [name for name in dirs if name.lower() not in ignored_roots_set]
-
-        rel_dir = current_path.relative_to(base_path).as_posix()
-        if rel_dir == ".":
-            rel_dir = ""
+        if max_dir_depth is not None and (rel_dir.count("/") + 1 if rel_dir else 0) >= max_dir_depth:
+            # Nothing below this depth can match a glob without ``**``.
+            dirs.clear()
 
         for filename in filenames:
             scanned_count += 1
@@ -503,11 +540,12 @@ def _find_files_local_fast(
                 scan_limited = True
                 break
 
-            rel_from_base = f"{rel_dir}/{filename}" if rel_dir else filename
-            if not glob_regex.match(rel_from_base):
-                continue
+            if not match_all:
+                rel_from_base = f"{rel_dir}/{filename}" if rel_dir else filename
+                if not glob_regex.match(rel_from_base):
+                    continue
 
-            rel_workspace = _format_output_path(context, current_path / filename)
+            rel_workspace = format_listed_output_path(context, current_root, filename)
 
             matched_count += 1
             if len(matched_files) < max_results:
@@ -521,18 +559,23 @@ def _find_files_local_fast(
     return matched_files, matched_count, truncated, scan_limited, ignored_roots_summary
 
 
-def _sort_find_files(context: ToolContext, files: list[str], sort: str) -> list[str]:
+def _sort_find_files(context: ToolContext, files: list[str], sort: str, limit: int) -> list[str]:
+    """Return the first ``limit`` files in ``sort`` order; only that prefix is ever displayed."""
+    bounded = limit < len(files)
     if sort == "path_asc":
-        return sorted(files)
+        return heapq.nsmallest(limit, files) if bounded else sorted(files)
+
+    # Listed paths are already resolved and rendered relative to the resolved root
+    # (or absolute), so joining them back needs no second symlink resolution.
+    workspace_root = context.resolved_workspace()
 
     def key(file_path: str) -> tuple[float, str]:
         try:
-            stat = context.resolve_workspace_path(file_path).stat()
-            return (-stat.st_mtime, file_path)
+            return (-os.stat(workspace_root / file_path).st_mtime, file_path)
         except OSError:
             return (0.0, file_path)
 
-    return sorted(files, key=key)
+    return heapq.nsmallest(limit, files, key=key) if bounded else sorted(files, key=key)
 
 
 def find_files(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionResult:
@@ -602,7 +645,7 @@ def find_files(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
         except (OSError, ValueError) as exc:
             return _workspace_error(str(exc), error_code="workspace_backend_error", path=path)
         if not include_hidden:
-            all_files = [f for f in all_files if not any(part.startswith(".") for part in Path(f).parts)]
+            all_files = [f for f in all_files if not _has_hidden_component(f)]
         all_files = sorted(all_files)
         scan_limited = len(all_files) > scan_limit
         files = all_files[:scan_limit] if scan_limited else all_files
@@ -621,7 +664,9 @@ def find_files(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
         files = kept_files
         total_count = max(0, total_count - sensitive_files_omitted)
 
-    files = _sort_find_files(context, files, effective_sort) if isinstance(local_root, Path) else sorted(files)
+    if isinstance(local_root, Path):
+        files = _sort_find_files(context, files, effective_sort, offset + max_results)
+    # Backend listings were sorted before filtering, which keeps them ordered.
     visible_files = files[offset : offset + max_results]
     truncated = offset + len(visible_files) < total_count or scan_limited
 
@@ -662,7 +707,6 @@ def find_files(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
 
 
 def read_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionResult:
-    backend = context.workspace_backend
     if "path" not in arguments:
         return _workspace_error(
             "`path` is required.",
@@ -704,7 +748,15 @@ def read_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionR
             path=path,
         )
 
-    if not backend.is_file(path):
+    try:
+        raw = _read_file_bytes(context, path)
+    except (OSError, ValueError) as exc:
+        return _workspace_error(
+            str(exc),
+            error_code="workspace_backend_error",
+            path=path,
+        )
+    if raw is None:
         return _workspace_error(
             f"file not found: {path}",
             error_code="file_not_found",
@@ -727,14 +779,6 @@ def read_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionR
 
     show_line_numbers = bool(arguments.get("show_line_numbers", False))
 
-    try:
-        raw = backend.read_bytes(path)
-    except (OSError, ValueError) as exc:
-        return _workspace_error(
-            str(exc),
-            error_code="workspace_backend_error",
-            path=path,
-        )
     source_digest = _content_hash(raw)
     if cursor is not None and cursor.sha256 != source_digest:
         return _workspace_error(
@@ -787,6 +831,7 @@ def read_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionR
         text=text,
         is_partial=is_partial,
         source=READ_FILE_BASELINE_SOURCE,
+        digest=source_digest,
     )
 
     return ToolExecutionResult(
@@ -815,28 +860,29 @@ def _normalize_cursor_path(path: str) -> str:
     return "" if normalized == "." else normalized
 
 
+def _nth_newline_offset(text: str, count: int, start: int = 0, end: int | None = None) -> int:
+    """Return the offset of the ``count``-th newline in ``text[start:end]``, or -1 when it has fewer."""
+    offset = start - 1
+    stop = len(text) if end is None else end
+    for _ in range(count):
+        offset = text.find("\n", offset + 1, stop)
+        if offset == -1:
+            return -1
+    return offset
+
+
 def _line_start_offset(text: str, start_line: int) -> int:
     if start_line <= 1:
         return 0
-    lines_seen = 1
-    for offset, character in enumerate(text):
-        if character == "\n":
-            lines_seen += 1
-            if lines_seen == start_line:
-                return offset + 1
-    return len(text)
+    offset = _nth_newline_offset(text, start_line - 1)
+    return len(text) if offset == -1 else offset + 1
 
 
 def _line_end_offset(text: str, end_line: int | None) -> int:
-    if end_line is None:
+    if end_line is None or end_line < 1:
         return len(text)
-    lines_seen = 1
-    for offset, character in enumerate(text):
-        if character == "\n":
-            if lines_seen == end_line:
-                return offset
-            lines_seen += 1
-    return len(text)
+    offset = _nth_newline_offset(text, end_line)
+    return len(text) if offset == -1 else offset
 
 
 def _bounded_source_slice(
@@ -846,31 +892,49 @@ def _bounded_source_slice(
     end_offset: int,
     show_line_numbers: bool,
 ) -> tuple[str, int]:
-    prefix_text = text[:start_offset]
-    start_line = prefix_text.count("\n") + 1
+    if not show_line_numbers:
+        # Without prefixes every character costs exactly one, so the page is a plain
+        # slice cut at the character budget or after the last allowed newline.
+        stop = min(end_offset, start_offset + READ_FILE_MAX_CHARS)
+        last_newline = _nth_newline_offset(text, READ_FILE_MAX_LINES, start_offset, stop)
+        if last_newline != -1:
+            stop = last_newline + 1
+        return text[start_offset:stop], stop
+
+    start_line = text.count("\n", 0, start_offset) + 1
     output: list[str] = []
     visible_chars = 0
-    consumed = 0
     line_count = 0
-    at_line_start = start_offset == 0 or prefix_text.endswith("\n")
+    position = start_offset
+    at_line_start = start_offset == 0 or text[start_offset - 1] == "\n"
+    # Every source character costs at least one visible character, so nothing past
+    # READ_FILE_MAX_CHARS can be emitted; scan whole lines up to that bound.
+    limit = min(end_offset, start_offset + READ_FILE_MAX_CHARS)
 
-    for character in text[start_offset:end_offset]:
-        if at_line_start and line_count >= READ_FILE_MAX_LINES:
+    while position < limit:
+        if at_line_start:
+            if line_count >= READ_FILE_MAX_LINES:
+                break
+            prefix = f"{start_line + line_count}: "
+            # A prefix is only emitted together with the first character of its line.
+            if visible_chars + len(prefix) + 1 > READ_FILE_MAX_CHARS:
+                break
+            output.append(prefix)
+            visible_chars += len(prefix)
+        newline = text.find("\n", position, limit)
+        line_stop = limit if newline == -1 else newline + 1
+        taken = min(line_stop - position, READ_FILE_MAX_CHARS - visible_chars)
+        if taken <= 0:
             break
-        prefix = f"{start_line + line_count}: " if show_line_numbers and at_line_start else ""
-        added_chars = len(prefix) + 1
-        if visible_chars + added_chars > READ_FILE_MAX_CHARS:
+        output.append(text[position : position + taken])
+        visible_chars += taken
+        position += taken
+        if position != line_stop or newline == -1:
             break
-        if prefix:
-            output.append(prefix)
-        output.append(character)
-        visible_chars += added_chars
-        consumed += 1
-        at_line_start = character == "\n"
-        if at_line_start:
-            line_count += 1
+        at_line_start = True
+        line_count += 1
 
-    return "".join(output), start_offset + consumed
+    return "".join(output), position
 
 
 def _rendered_source_size_bytes(
@@ -887,15 +951,23 @@ def _rendered_source_size_bytes(
 
     line_number = text.count("\n", 0, start_offset) + 1
     at_line_start = start_offset == 0 or text[start_offset - 1] == "\n"
-    if at_line_start:
-        size_bytes += len(str(line_number)) + 2
+    # A prefix precedes every line that starts inside the slice; a trailing newline
+    # does not start one.
+    first_prefixed = line_number if at_line_start else line_number + 1
+    last_prefixed = line_number + source_slice.count("\n") - (1 if source_slice.endswith("\n") else 0)
+    return size_bytes + _line_prefix_size(first_prefixed, last_prefixed)
 
-    for index, character in enumerate(source_slice):
-        if character == "\n" and index + 1 < len(source_slice):
-            line_number += 1
-            size_bytes += len(str(line_number)) + 2
 
-    return size_bytes
+def _line_prefix_size(first_line: int, last_line: int) -> int:
+    """Return the total length of the ``"<n>: "`` prefixes for lines ``first_line..last_line``."""
+    total = 0
+    line = first_line
+    while line <= last_line:
+        digits = len(str(line))
+        band_end = min(last_line, 10**digits - 1)
+        total += (band_end - line + 1) * (digits + 2)
+        line = band_end + 1
+    return total
 
 
 def write_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionResult:
@@ -919,9 +991,12 @@ def write_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
         suffix = "\n" if trailing_newline else ""
         write_content = f"{prefix}{content}{suffix}"
 
-    exists_before = backend.exists(path)
-    is_existing_file = exists_before and backend.is_file(path)
+    # is_file implies exists for every backend, so one probe answers both.
+    is_existing_file = backend.is_file(path)
     known_full_before_write = not is_existing_file
+    # Bytes the written content lands after, when known exactly; lets the new
+    # baseline skip reading the whole file back after every append.
+    prior_raw: bytes | None = b"" if not (is_existing_file and append) else None
     if is_existing_file and not append:
         try:
             current_raw = backend.read_bytes(path)
@@ -941,7 +1016,7 @@ def write_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
         known_full_before_write = True
     elif is_existing_file and append:
         try:
-            current_raw = backend.read_bytes(path)
+            current_raw = prior_raw = backend.read_bytes(path)
         except Exception:
             current_raw = backend.read_text(path).encode("utf-8", errors="replace")
         known_full_before_write = (
@@ -956,8 +1031,15 @@ def write_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecution
 
     written_bytes = backend.write_text(path, write_content, append=append)
 
+    updated_raw: bytes | None = None
+    # Only backends that declare a verbatim round trip let the baseline skip the read back.
+    if prior_raw is not None and getattr(backend, "verbatim_text_round_trip", False):
+        written_raw = write_content.encode("utf-8")
+        if written_bytes == len(written_raw):
+            updated_raw = prior_raw + written_raw
     try:
-        updated_raw = backend.read_bytes(path)
+        if updated_raw is None:
+            updated_raw = backend.read_bytes(path)
         updated_text, _has_bom = _decode_workspace_text(updated_raw)
     except Exception:
         updated_text = backend.read_text(path)
@@ -1046,7 +1128,8 @@ def edit_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionR
 
     backend = context.workspace_backend
     path = str(arguments["path"])
-    if not backend.is_file(path):
+    raw = _read_file_bytes(context, path)
+    if raw is None:
         return _workspace_error(f"file not found: {path}", error_code="file_not_found", path=path)
 
     old_string = str(arguments["old_string"])
@@ -1062,7 +1145,6 @@ def edit_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionR
         )
     replace_all = bool(arguments.get("replace_all", False))
 
-    raw = backend.read_bytes(path)
     try:
         text, has_bom = _decode_workspace_text(raw)
     except ValueError:
@@ -1083,27 +1165,38 @@ def edit_file(context: ToolContext, arguments: dict[str, Any]) -> ToolExecutionR
 
     actual_old = old_string
     actual_new = new_string
-    occurrence_count = text.count(actual_old)
+    first_index = text.find(actual_old)
     line_ending = _line_ending_label(text)
-    if occurrence_count == 0 and line_ending == "crlf" and "\r\n" not in old_string:
+    if first_index == -1 and line_ending == "crlf" and "\r\n" not in old_string:
         actual_old = old_string.replace("\n", "\r\n")
         actual_new = new_string.replace("\n", "\r\n")
-        occurrence_count = text.count(actual_old)
+        first_index = text.find(actual_old)
 
-    if occurrence_count == 0:
+    if first_index == -1:
         return _workspace_error("`old_string` not found in file.", error_code="old_string_not_found", path=path)
-    if occurrence_count > 1 and not replace_all:
-        return _workspace_error(
-            "`old_string` matched multiple locations; make it unique or set replace_all=true.",
-            error_code="old_string_not_unique",
-            path=path,
-            match_count=occurrence_count,
-        )
 
+    old_end = first_index + len(actual_old)
     if replace_all:
-        updated = text.replace(actual_old, actual_new)
-        replaced_count = occurrence_count
+        length_delta = len(actual_new) - len(actual_old)
+        if length_delta:
+            updated = text.replace(actual_old, actual_new)
+            # Every replacement shifts the length by the same delta, so the count
+            # falls out of the result size without a separate scan.
+            replaced_count = (len(updated) - len(text)) // length_delta
+        else:
+            pieces = text.split(actual_old)
+            replaced_count = len(pieces) - 1
+            updated = actual_new.join(pieces)
     else:
+        if text.find(actual_old, old_end) != -1:
+            return _workspace_error(
+                "`old_string` matched multiple locations; make it unique or set replace_all=true.",
+                error_code="old_string_not_unique",
+                path=path,
+                match_count=text.count(actual_old),
+            )
+        # A bounded replace builds the result in one allocation instead of copying
+        # both slices and then concatenating them.
         updated = text.replace(actual_old, actual_new, 1)
         replaced_count = 1
 
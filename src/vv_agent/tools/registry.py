@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from copy import deepcopy
 from dataclasses import dataclass, field
 from typing import Any
@@ -10,28 +11,45 @@ from vv_agent.tools.executor import RegistryToolExecutor, ToolExecutor, ToolExpo
 from vv_agent.tools.metadata import ToolMetadata, normalize_tool_metadata
 from vv_agent.types import ToolCall, ToolExecutionResult
 
+_OPENAI_SCHEMAS_CACHE_MAX_ENTRIES = 64
+
 
 class ToolNotFoundError(KeyError):
     pass
 
 
+def _copy_schema(value: Any) -> Any:
+    """Copy a JSON-shaped schema tree without deepcopy's memo and dispatch overhead."""
+    if isinstance(value, dict):
+        return {key: _copy_schema(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_schema(item) for item in value]
+    if value is None or isinstance(value, str | int | float):
+        return value
+    return deepcopy(value)
+
+
 @dataclass(slots=True)
 class ToolRegistry:
     _tools: dict[str, ToolSpec] = field(default_factory=dict)
     _schemas: dict[str, dict[str, Any]] = field(default_factory=dict)
     _executors: dict[str, ToolExecutor] = field(default_factory=dict)
     _planner_extra_tool_names: set[str] = field(default_factory=set)
+    # JSON snapshots of list_openai_schemas results; decoding one yields fresh
+    # mutable schemas faster than copying the stored trees.
+    _openai_schemas_cache: dict[tuple[str, ...] | None, str] = field(default_factory=dict)
 
     def register(self, spec: ToolSpec) -> None:
         if spec.name in self._tools:
             raise ValueError(f"Tool already registered: {spec.name}")
         self._tools[spec.name] = spec
+        self._openai_schemas_cache.clear()
         if spec.name not in self._executors:
             schema = self._schemas.get(spec.name)
             self._executors[spec.name] = RegistryToolExecutor(
                 name=spec.name,
                 handler=spec.handler,
-                schema=deepcopy(schema) if schema else None,
+                schema=_copy_schema(schema) if schema else None,
                 tool_metadata=spec.tool_metadata,
             )
 
@@ -46,9 +64,10 @@ class ToolRegistry:
             raise ValueError(f"Tool schema must contain function.parameters: {tool_name}")
         assert_valid_tool_schema(function_schema["parameters"])
         self._schemas[tool_name] = closed_schema
+        self._openai_schemas_cache.clear()
         executor = self._executors.get(tool_name)
         if isinstance(executor, RegistryToolExecutor):
-            executor.schema = deepcopy(closed_schema)
+            executor.schema = _copy_schema(closed_schema)
             executor.sync_description_from_schema()
 
     def register_schemas(self, schemas: dict[str, dict[str, Any]]) -> None:
@@ -102,6 +121,7 @@ class ToolRegistry:
         if expose_to_model and is_model_visible:
             self.register_schema(executor.name, executor.openai_schema(None))
         self._tools[executor.name] = executor.spec(None)
+        self._openai_schemas_cache.clear()
         if planner_extra and is_model_visible:
             self._planner_extra_tool_names.add(executor.name)
 
@@ -112,11 +132,24 @@ class ToolRegistry:
         schema = self._schemas.get(name)
         if schema is None:
             raise KeyError(f"Schema not registered: {name}")
-        return deepcopy(schema)
+        return _copy_schema(schema)
 
     def list_openai_schemas(self, *, tool_names: list[str] | None = None) -> list[dict[str, Any]]:
+        cache_key = tuple(tool_names) if tool_names is not None else None
+        cached = self._openai_schemas_cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
         ordered_names = tool_names if tool_names is not None else list(self._tools.keys())
-        return [self.get_schema(name) for name in ordered_names if self._is_model_visible(name)]
+        schemas = [self.get_schema(name) for name in ordered_names if self._is_model_visible(name)]
+        try:
+            snapshot = json.dumps(schemas)
+        except (TypeError, ValueError):
+            return schemas
+        if json.loads(snapshot) == schemas:
+            if len(self._openai_schemas_cache) >= _OPENAI_SCHEMAS_CACHE_MAX_ENTRIES:
+                self._openai_schemas_cache.clear()
+            self._openai_schemas_cache[cache_key] = snapshot
+        return schemas
 
     def _is_model_visible(self, name: str) -> bool:
         executor = self._executors.get(name)
@@ -9,7 +9,7 @@ from enum import StrEnum
 from typing import Any, Literal, cast
 
 from vv_agent.budget import MAX_WIRE_INTEGER, BudgetExhaustion, BudgetUsageSnapshot
-from vv_agent.checkpoint import ResumeObservation, canonical_json_bytes, validate_sha256
+from vv_agent.checkpoint import ResumeObservation, canonical_json_bytes, validate_i_json, validate_sha256
 from vv_agent.microcompaction import MicrocompactionPolicy, normalize_microcompaction_policy
 from vv_agent.model_settings import ModelSettings
 from vv_agent.prompt import PromptBundle
@@ -116,13 +116,16 @@ class Message:
             payload["name"] = self.name
         if self.tool_call_id:
             payload["tool_call_id"] = self.tool_call_id
-        if self.role == "assistant" and self.tool_calls:
-            payload["tool_calls"] = self.tool_calls
-            if not self.content:
-                payload["content"] = None
-        if include_reasoning_content and self.role == "assistant" and self.reasoning_content:
-            payload["reasoning_content"] = self.reasoning_content
-        if self.role == "user" and self.image_url:
+        # Dispatch on the role once; system and tool messages need nothing more.
+        role = self.role
+        if role == "assistant":
+            if self.tool_calls:
+                payload["tool_calls"] = self.tool_calls
+                if not self.content:
+                    payload["content"] = None
+            if include_reasoning_content and self.reasoning_content:
+                payload["reasoning_content"] = self.reasoning_content
+        elif role == "user" and self.image_url:
             content_blocks: list[dict[str, Any]] = []
             if self.content:
                 content_blocks.append({"type": "text", "text": self.content})
@@ -710,11 +713,11 @@ class ToolExecutionResult:
                 raise ValueError(f"tool_result_invalid: {name} must be a string when present")
         if not isinstance(self.metadata, dict) or not all(isinstance(key, str) for key in self.metadata):
             raise ValueError("tool_result_invalid: metadata must be an object with string keys")
-        forbidden_metadata = sorted(set(self.metadata).intersection(_TOOL_RESULT_FORBIDDEN_METADATA_KEYS))
-        if forbidden_metadata:
+        if not _TOOL_RESULT_FORBIDDEN_METADATA_KEYS.isdisjoint(self.metadata):
+            forbidden_metadata = sorted(_TOOL_RESULT_FORBIDDEN_METADATA_KEYS.intersection(self.metadata))
             raise ValueError(f"tool_result_invalid: metadata contains model-visible payload keys: {forbidden_metadata}")
         try:
-            canonical_json_bytes(self.metadata, "tool result metadata")
+            validate_i_json(self.metadata, "tool result metadata")
         except (TypeError, ValueError, UnicodeError) as exc:
             raise ValueError("tool_result_invalid: metadata must be RFC 8785 I-JSON") from exc
         recovery_values = (
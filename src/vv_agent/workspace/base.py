@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Protocol
 
 INVALID_EXCLUDE_FILES_PATTERN_CODE = "invalid_exclude_files_pattern"
@@ -11,8 +12,13 @@ INVALID_EXCLUDE_FILES_PATTERN_MESSAGE = "exclude_files_pattern must be a valid p
 
 def _normalize_workspace_path(path: str) -> str:
     """Normalize a virtual workspace path without allowing root escape."""
+    path = str(path)
+    # Most paths arrive already normalized; return those without splitting.
+    # Segments starting with "." (including dotfiles) take the slow path.
+    if "\\" not in path and "//" not in path and "/." not in path and not path.startswith(("/", ".")) and not path.endswith("/"):
+        return path
     parts: list[str] = []
-    for part in str(path).replace("\\", "/").split("/"):
+    for part in path.replace("\\", "/").split("/"):
         if part in {"", "."}:
             continue
         if part == "..":
@@ -39,6 +45,28 @@ def _exclusive_workspace_path_segments(path: str) -> tuple[str, ...]:
     return segments
 
 
+_GLOB_WILDCARD_RE = re.compile(r"\*\*/|\*\*|\*|\?")
+_GLOB_WILDCARD_REGEX = {"**/": "(?:.+/)?", "**": ".*", "*": "[^/]*", "?": "[^/]"}
+
+
+@lru_cache(maxsize=256)
+def _compile_workspace_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a glob pattern supporting ``**`` into a regex for posix paths.
+
+    Literal runs between wildcards are escaped in one ``re.escape`` call rather
+    than character by character.
+    """
+    parts: list[str] = ["^"]
+    literal_start = 0
+    for match in _GLOB_WILDCARD_RE.finditer(pattern):
+        parts.append(re.escape(pattern[literal_start : match.start()]))
+        parts.append(_GLOB_WILDCARD_REGEX[match.group()])
+        literal_start = match.end()
+    parts.append(re.escape(pattern[literal_start:]))
+    parts.append("$")
+    return re.compile("".join(parts))
+
+
 @dataclass(slots=True)
 class FileInfo:
     path: str
@@ -50,6 +78,12 @@ class FileInfo:
 
 
 class WorkspaceBackend(Protocol):
+    # True when read_bytes returns exactly the UTF-8 bytes write_text stored, so callers
+    # may derive file contents from what they wrote. Backends or subclasses that filter,
+    # re-encode, or rewrite content on read or write must report False.
+    @property
+    def verbatim_text_round_trip(self) -> bool: ...
+
     def list_files(self, base: str, glob: str) -> list[str]: ...
     def read_text(self, path: str) -> str: ...
     def read_bytes(self, path: str) -> bytes: ...
@@ -136,6 +170,10 @@ class DiscoveryFilteredWorkspaceBackend:
     def exclude_pattern(self) -> str:
         return self._exclude_pattern
 
+    @property
+    def verbatim_text_round_trip(self) -> bool:
+        return bool(getattr(self._backend, "verbatim_text_round_trip", False))
+
     def list_files(self, base: str, glob: str) -> list[str]:
         return [path for path in self._backend.list_files(base, glob) if not self._regex.search(_normalize_workspace_path(path))]
 
@@ -4,6 +4,7 @@ import errno
 import hashlib
 import os
 import re
+import secrets
 import stat
 import tempfile
 from collections.abc import Iterable
@@ -12,41 +13,27 @@ from datetime import UTC, datetime
 from pathlib import Path
 
 from vv_agent.workspace.artifacts import ArtifactPathInvalidError, is_reserved_artifact_path
-from vv_agent.workspace.base import FileInfo, _exclusive_workspace_path_segments, _normalize_workspace_path
+from vv_agent.workspace.base import (
+    FileInfo,
+    _compile_workspace_glob,
+    _exclusive_workspace_path_segments,
+    _normalize_workspace_path,
+)
 
 _PRIVATE_ARTIFACT_ROOT_ENV = "VV_AGENT_PRIVATE_ARTIFACT_ROOT"
 _PRIVATE_ARTIFACT_ROOT_NAME = "vv-agent-artifacts"
-
-
-def _glob_match(path: str, pattern: str) -> bool:
-    """Match a posix path against a glob pattern supporting ``**``."""
-    parts: list[str] = []
-    i = 0
-    while i < len(pattern):
-        if pattern[i : i + 3] == "**/":
-            parts.append("(?:.+/)?")
-            i += 3
-        elif pattern[i : i + 2] == "**":
-            parts.append(".*")
-            i += 2
-        elif pattern[i] == "*":
-            parts.append("[^/]*")
-            i += 1
-        elif pattern[i] == "?":
-            parts.append("[^/]")
-            i += 1
-        else:
-            parts.append(re.escape(pattern[i]))
-            i += 1
-    regex = "^" + "".join(parts) + "$"
-    return re.match(regex, path) is not None
+_MATCH_ALL_GLOBS = frozenset({"**/*", "**"})
+_WRITE_TEXT_SLICE_CHARS = 256 * 1024
 
 
 class LocalWorkspaceBackend:
-    __slots__ = ("_allow_outside_root", "_artifact_root", "_root")
+    __slots__ = ("_allow_outside_root", "_artifact_root", "_root", "_root_prefix")
+    verbatim_text_round_trip: bool = True
 
     def __init__(self, root: Path, *, allow_outside_root: bool = False) -> None:
         self._root = root.resolve()
+        # Containment is checked on normalized strings rather than by walking Path.parents.
+        self._root_prefix = os.path.normcase(os.path.join(str(self._root), ""))
         self._allow_outside_root = bool(allow_outside_root)
         self._artifact_root = _private_artifact_root(self._root)
 
@@ -61,10 +48,14 @@ class LocalWorkspaceBackend:
     def _resolve(self, path: str) -> Path:
         candidate = Path(path).expanduser()
         target = candidate.resolve() if candidate.is_absolute() else (self._root / candidate).resolve()
-        if not self._allow_outside_root and target != self._root and self._root not in target.parents:
+        if not self._allow_outside_root and not self._is_within_root(target):
             raise ValueError(f"Path escapes workspace: {path}")
         return target
 
+    def _is_within_root(self, target: Path) -> bool:
+        normalized = os.path.normcase(os.path.join(str(target), ""))
+        return normalized.startswith(self._root_prefix)
+
     def _artifact_segments(self, path: str) -> tuple[str, ...] | None:
         if not isinstance(path, str) or path.startswith(("/", "\\")) or re.match(r"^[A-Za-z]:", path):
             return None
@@ -107,25 +98,31 @@ class LocalWorkspaceBackend:
         if self._artifact_segments(base) is not None:
             return []
         root = self._resolve(base)
-        if not root.exists() or not root.is_dir():
+        if not root.is_dir():
             return []
 
         pattern = str(glob or "**/*")
+        glob_regex = None if pattern in _MATCH_ALL_GLOBS else _compile_workspace_glob(pattern)
+        # Without ``**`` a glob only matches at a fixed depth, so deeper subtrees are pruned.
+        max_dir_depth = None if "**" in pattern else pattern.count("/")
+        # Build relative paths by slicing the walked directory strings instead of
+        # creating and relativizing a Path per file.
+        root_prefix_len = len(os.path.join(str(root), ""))
+        base_output = self._to_output_path(root)
+        inside_root = self._is_within_root(root)
+        output_prefix = "" if base_output == "." else f"{base_output}/"
         files: list[str] = []
         for current_root, dirs, filenames in os.walk(root, topdown=True, onerror=lambda _e: None, followlinks=False):
-            dirs.sort(key=str.lower)
-            filenames.sort(key=str.lower)
-            current = Path(current_root)
+            rel_dir = current_root[root_prefix_len:].replace(os.sep, "/")
+            if max_dir_depth is not None and (rel_dir.count("/") + 1 if rel_dir else 0) >= max_dir_depth:
+                dirs.clear()
+            dir_prefix = f"{rel_dir}/" if rel_dir else ""
             for filename in filenames:
-                candidate = current / filename
-                try:
-                    rel_from_base = candidate.relative_to(root).as_posix()
-                    if not _glob_match(rel_from_base, pattern):
-                        continue
-                    rel = self._to_output_path(candidate)
-                    if is_reserved_artifact_path(rel):
-                        continue
-                except (OSError, ValueError):
+                rel_from_base = dir_prefix + filename
+                if glob_regex is not None and glob_regex.match(rel_from_base) is None:
+                    continue
+                rel = output_prefix + rel_from_base if inside_root else os.path.join(current_root, filename)
+                if is_reserved_artifact_path(rel):
                     continue
                 files.append(rel)
         files.sort()
@@ -137,7 +134,7 @@ class LocalWorkspaceBackend:
 
     def read_bytes(self, path: str) -> bytes:
         target, _logical_path = self._resolve_read_target(path)
-        return target.read_bytes()
+        return _read_regular_file(target)
 
     def write_text(self, path: str, content: str, *, append: bool = False) -> int:
         if is_reserved_artifact_path(path):
@@ -145,11 +142,13 @@ class LocalWorkspaceBackend:
         target = self._resolve(path)
         if self._is_reserved_target(target):
             raise PermissionError("artifact paths are immutable")
-        target.parent.mkdir(parents=True, exist_ok=True)
-        data = content.encode("utf-8")
-        mode = "ab" if append else "wb"
-        with target.open(mode) as fh:
-            return fh.write(data)
+        write = _append_file if append else _replace_file
+        try:
+            return write(target, content)
+        except FileNotFoundError:
+            # Only a missing parent costs a mkdir; existing directories skip the syscall.
+            target.parent.mkdir(parents=True, exist_ok=True)
+            return write(target, content)
 
     def write_text_exclusive(self, path: str, content: str) -> int:
         return self.write_text_chunks_exclusive(path, (content,))
@@ -165,15 +164,16 @@ class LocalWorkspaceBackend:
 
     def file_info(self, path: str) -> FileInfo | None:
         target, logical_path = self._resolve_read_target(path)
-        if not target.exists():
+        try:
+            target_stat = target.stat()
+        except (FileNotFoundError, NotADirectoryError):
             return None
-        stat = target.stat()
         return FileInfo(
             path=logical_path or self._to_output_path(target),
-            is_file=target.is_file(),
-            is_dir=target.is_dir(),
-            size=stat.st_size,
-            modified_at=datetime.fromtimestamp(stat.st_mtime, tz=UTC).isoformat(),
+            is_file=stat.S_ISREG(target_stat.st_mode),
+            is_dir=stat.S_ISDIR(target_stat.st_mode),
+            size=target_stat.st_size,
+            modified_at=datetime.fromtimestamp(target_stat.st_mtime, UTC).isoformat(),
             suffix=target.suffix,
         )
 
@@ -221,6 +221,65 @@ def _private_artifact_root(workspace_root: Path) -> Path:
     return artifact_root.resolve()
 
 
+def _append_file(target: Path, content: str) -> int:
+    # Encode up front so an unencodable character cannot leave a partial append behind.
+    data = content.encode("utf-8")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    file_fd = os.open(target, flags, 0o666)
+    try:
+        _write_all(file_fd, data)
+    finally:
+        os.close(file_fd)
+    return len(data)
+
+
+def _replace_file(target: Path, content: str) -> int:
+    """Write ``content`` to a sibling temp file and atomically swap it into place.
+
+    The temp file is discarded on failure, so the text is encoded slice by slice
+    instead of materializing a full-size bytes copy.
+    """
+    try:
+        existing_mode: int | None = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        existing_mode = None
+    temp_path = target.with_name(f".{target.name}.{secrets.token_hex(6)}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    file_fd = os.open(temp_path, flags, 0o666)
+    try:
+        try:
+            total = _write_chunks(
+                file_fd,
+                (content[start : start + _WRITE_TEXT_SLICE_CHARS] for start in range(0, len(content), _WRITE_TEXT_SLICE_CHARS)),
+            )
+            if existing_mode is not None:
+                os.chmod(temp_path, existing_mode)
+        finally:
+            os.close(file_fd)
+        os.replace(temp_path, target)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temp_path)
+        raise
+    return total
+
+
+def _read_regular_file(target: Path) -> bytes:
+    """Read ``target`` only when it is a regular file.
+
+    The non-blocking open keeps a FIFO from stalling the read, so callers can read
+    first instead of checking ``is_file`` up front.
+    """
+    flags = os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    with open(os.open(target, flags), "rb") as handle:
+        mode = os.fstat(handle.fileno()).st_mode
+        if stat.S_ISDIR(mode):
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), str(target))
+        if not stat.S_ISREG(mode):
+            raise OSError(errno.EINVAL, "not a regular file", str(target))
+        return handle.read()
+
+
 def _write_all(file_descriptor: int, data: bytes) -> None:
     remaining = memoryview(data)
     while remaining:
@@ -1,45 +1,39 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections.abc import Iterable
 from datetime import UTC, datetime
+from functools import lru_cache
 from threading import RLock
+from time import time
 
 from vv_agent.workspace.artifacts import is_reserved_artifact_path
-from vv_agent.workspace.base import FileInfo, _exclusive_workspace_path_segments, _normalize_workspace_path
-
-
-def _glob_match(path: str, pattern: str) -> bool:
-    """Match a posix path against a glob pattern supporting ``**``."""
-    # Convert glob pattern to regex: ** matches any path segments, * matches within a segment
-    import re as _re
-
-    parts: list[str] = []
-    i = 0
-    while i < len(pattern):
-        if pattern[i : i + 3] == "**/":
-            parts.append("(?:.+/)?")
-            i += 3
-        elif pattern[i : i + 2] == "**":
-            parts.append(".*")
-            i += 2
-        elif pattern[i] == "*":
-            parts.append("[^/]*")
-            i += 1
-        elif pattern[i] == "?":
-            parts.append("[^/]")
-            i += 1
-        else:
-            parts.append(_re.escape(pattern[i]))
-            i += 1
-    regex = "^" + "".join(parts) + "$"
-    return _re.match(regex, path) is not None
+from vv_agent.workspace.base import (
+    FileInfo,
+    _compile_workspace_glob,
+    _exclusive_workspace_path_segments,
+    _normalize_workspace_path,
+)
+
+
+@lru_cache(maxsize=1024)
+def _isoformat_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=UTC).isoformat()
 
 
 class MemoryWorkspaceBackend:
-    __slots__ = ("_dirs", "_files", "_lock")
+    __slots__ = ("_created_at", "_dirs", "_files", "_lock", "_modified_at", "_paths", "_paths_sorted")
+    verbatim_text_round_trip: bool = True
 
     def __init__(self) -> None:
         self._files: dict[str, bytes] = {}
+        # Unix write time per file; directories all report the backend's creation time.
+        self._modified_at: dict[str, float] = {}
+        self._created_at = time()
+        # File keys in an order-on-demand list: writes append, listings sort
+        # once (cheap when only a few keys were added) and bisect to the prefix.
+        self._paths: list[str] = []
+        self._paths_sorted = True
         self._dirs: set[str] = {""}
         self._lock = RLock()
 
@@ -52,9 +46,27 @@ class MemoryWorkspaceBackend:
         if is_reserved_artifact_path(base_n):
             return []
         pattern = f"{base_n}/{glob}" if base_n else glob
+        wildcard_index = min((index for index in (pattern.find("*"), pattern.find("?")) if index != -1), default=-1)
+        if wildcard_index == -1:
+            with self._lock:
+                exists = pattern in self._files
+            return [pattern] if exists and not is_reserved_artifact_path(pattern) else []
+        # Every match starts with the literal text before the first wildcard, so the
+        # regex and reserved-path checks only run on keys sharing that prefix.
+        literal_prefix = pattern[:wildcard_index]
+        glob_regex = _compile_workspace_glob(pattern)
+        files: list[str] = []
         with self._lock:
-            files = [p for p in self._files if not is_reserved_artifact_path(p) and _glob_match(p, pattern)]
-        files.sort()
+            paths = self._paths
+            if not self._paths_sorted:
+                paths.sort()
+                self._paths_sorted = True
+            for index in range(bisect_left(paths, literal_prefix), len(paths)):
+                p = paths[index]
+                if not p.startswith(literal_prefix):
+                    break
+                if glob_regex.match(p) is not None and not is_reserved_artifact_path(p):
+                    files.append(p)
         return files
 
     def read_text(self, path: str) -> str:
@@ -80,7 +92,10 @@ class MemoryWorkspaceBackend:
             if append and key in self._files:
                 self._files[key] += data
             else:
+                if key not in self._files:
+                    self._add_path(key)
                 self._files[key] = data
+            self._modified_at[key] = time()
             self._ensure_parents(key)
         return len(data)
 
@@ -98,7 +113,9 @@ class MemoryWorkspaceBackend:
                 parent = "/".join(parts[:index])
                 if parent in self._files:
                     raise NotADirectoryError(parent)
+            self._add_path(key)
             self._files[key] = data
+            self._modified_at[key] = time()
             self._ensure_parents(key)
         return len(data)
 
@@ -106,16 +123,14 @@ class MemoryWorkspaceBackend:
         key = self._norm(path)
         with self._lock:
             if key in self._files:
-                suffix = ""
-                dot = key.rfind(".")
-                if dot != -1 and "/" not in key[dot:]:
-                    suffix = key[dot:]
+                _, dot, tail = key.rpartition(".")
+                suffix = dot + tail if dot and "/" not in tail else ""
                 return FileInfo(
                     path=key,
                     is_file=True,
                     is_dir=False,
                     size=len(self._files[key]),
-                    modified_at=datetime.now(tz=UTC).isoformat(),
+                    modified_at=_isoformat_timestamp(self._modified_at[key]),
                     suffix=suffix,
                 )
             if key in self._dirs:
@@ -124,7 +139,7 @@ class MemoryWorkspaceBackend:
                     is_file=False,
                     is_dir=True,
                     size=0,
-                    modified_at=datetime.now(tz=UTC).isoformat(),
+                    modified_at=_isoformat_timestamp(self._created_at),
                     suffix="",
                 )
             return None
@@ -144,7 +159,20 @@ class MemoryWorkspaceBackend:
             self._dirs.add(key)
             self._ensure_parents(key)
 
+    def _add_path(self, key: str) -> None:
+        paths = self._paths
+        if paths and key < paths[-1]:
+            self._paths_sorted = False
+        paths.append(key)
+
     def _ensure_parents(self, key: str) -> None:
-        parts = key.split("/")
-        for i in range(1, len(parts)):
-            self._dirs.add("/".join(parts[:i]))
+        # Directories are only ever added together with all their ancestors, so
+        # the walk up can stop at the first parent that is already known.
+        dirs = self._dirs
+        index = key.rfind("/")
+        while index != -1:
+            parent = key[:index]
+            if parent in dirs:
+                return
+            dirs.add(parent)
+            index = key.rfind("/", 0, index)
@@ -13,15 +13,68 @@ from __future__ import annotations
 import fnmatch
 import importlib
 import importlib.util
-from collections.abc import Iterable
+import math
+import os
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from functools import lru_cache
+from io import BytesIO
 from tempfile import SpooledTemporaryFile
-from typing import Any
+from typing import IO, Any
 
 from vv_agent.workspace.artifacts import is_reserved_artifact_path
-from vv_agent.workspace.base import FileInfo, _exclusive_workspace_path_segments, _normalize_workspace_path
+from vv_agent.workspace.base import (
+    FileInfo,
+    _compile_workspace_glob,
+    _exclusive_workspace_path_segments,
+    _normalize_workspace_path,
+)
 
 _BOTO3_AVAILABLE = importlib.util.find_spec("boto3") is not None
+# fnmatch treats ``[`` as a character class, so it ends a glob's literal prefix too.
+_GLOB_WILDCARD_RE = re.compile(r"[*?\[]")
+# fnmatch case-folds paths where os.path.normcase does (Windows).
+_FNMATCH_IS_CASE_SENSITIVE = os.path.normcase("A") == "A"
+_LIST_KEYS_MAX_WORKERS = 8
+# Appends to objects at least this large copy the existing bytes server-side
+# (UploadPartCopy) instead of downloading them; S3 requires every part but the
+# last to be at least 5 MiB, and a single copied part to be at most 5 GiB.
+_MULTIPART_APPEND_MIN_BYTES = 5 * 1024 * 1024
+_MULTIPART_COPY_MAX_PART_BYTES = 5 * 1024 * 1024 * 1024
+# Transfers at least this large go through boto3's transfer manager, which
+# splits them into parallel ranged GETs / multipart upload parts.
+_TRANSFER_MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+_TRANSFER_MAX_CONCURRENCY = 8
+
+
+def _copy_part_ranges(size: int) -> list[tuple[int, int]]:
+    """Split ``size`` bytes into inclusive copy ranges of near-equal length.
+
+    Equal splits keep every range within the 5 GiB copy limit without leaving a
+    short trailing range, which S3 would reject as a non-final part under 5 MiB.
+    """
+    part_count = max(math.ceil(size / _MULTIPART_COPY_MAX_PART_BYTES), 1)
+    part_size = math.ceil(size / part_count)
+    return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+
+def _is_missing_key_error(exc: Exception) -> bool:
+    response = getattr(exc, "response", {})
+    error = response.get("Error", {}) if isinstance(response, dict) else {}
+    metadata = response.get("ResponseMetadata", {}) if isinstance(response, dict) else {}
+    code = str(error.get("Code", "")) if isinstance(error, dict) else ""
+    status = metadata.get("HTTPStatusCode") if isinstance(metadata, dict) else None
+    return code in {"404", "NoSuchKey", "NotFound"} or status == 404
+
+
+def _transfer_config() -> Any:
+    TransferConfig = importlib.import_module("boto3.s3.transfer").TransferConfig
+    return TransferConfig(
+        multipart_threshold=_TRANSFER_MULTIPART_THRESHOLD_BYTES,
+        max_concurrency=_TRANSFER_MAX_CONCURRENCY,
+    )
 
 
 def _require_boto3() -> Any:
@@ -30,6 +83,41 @@ def _require_boto3() -> Any:
     return importlib.import_module("boto3")
 
 
+@lru_cache(maxsize=32)
+def _shared_s3_client(
+    *,
+    endpoint_url: str | None,
+    region_name: str | None,
+    aws_access_key_id: str | None,
+    aws_secret_access_key: str | None,
+    addressing_style: str,
+    max_pool_connections: int,
+) -> Any:
+    """Build an S3 client once per configuration; boto3 clients are thread-safe."""
+    boto3 = _require_boto3()
+    Config = importlib.import_module("botocore.config").Config
+
+    kwargs: dict[str, Any] = {
+        "config": Config(
+            s3={
+                "addressing_style": addressing_style,
+                "payload_signing_enabled": False,
+            },
+            request_checksum_calculation="when_required",
+            max_pool_connections=max_pool_connections,
+        ),
+    }
+    if endpoint_url:
+        kwargs["endpoint_url"] = endpoint_url
+    if region_name:
+        kwargs["region_name"] = region_name
+    if aws_access_key_id:
+        kwargs["aws_access_key_id"] = aws_access_key_id
+    if aws_secret_access_key:
+        kwargs["aws_secret_access_key"] = aws_secret_access_key
+    return boto3.client("s3", **kwargs)
+
+
 class S3WorkspaceBackend:
     """WorkspaceBackend backed by an S3-compatible bucket.
 
@@ -52,9 +140,14 @@ class S3WorkspaceBackend:
         ``"virtual"`` (default) or ``"path"``.  Most S3-compatible services
         (Aliyun OSS, Cloudflare R2) require virtual-hosted-style.
         MinIO typically needs ``"path"``.
+    max_pool_connections:
+        Upper bound on pooled HTTP connections to the endpoint. Backends built
+        with the same settings share one client and its pool.
     """
 
     __slots__ = ("_bucket", "_client", "_prefix")
+    # Appends rewrite the whole object, so write_file reads it back instead.
+    verbatim_text_round_trip: bool = False
 
     def __init__(
         self,
@@ -66,28 +159,16 @@ class S3WorkspaceBackend:
         aws_access_key_id: str | None = None,
         aws_secret_access_key: str | None = None,
         addressing_style: str = "virtual",
+        max_pool_connections: int = 64,
     ) -> None:
-        boto3 = _require_boto3()
-        Config = importlib.import_module("botocore.config").Config
-
-        kwargs: dict[str, Any] = {
-            "config": Config(
-                s3={
-                    "addressing_style": addressing_style,
-                    "payload_signing_enabled": False,
-                },
-                request_checksum_calculation="when_required",
-            ),
-        }
-        if endpoint_url:
-            kwargs["endpoint_url"] = endpoint_url
-        if region_name:
-            kwargs["region_name"] = region_name
-        if aws_access_key_id:
-            kwargs["aws_access_key_id"] = aws_access_key_id
-        if aws_secret_access_key:
-            kwargs["aws_secret_access_key"] = aws_secret_access_key
-        self._client: Any = boto3.client("s3", **kwargs)
+        self._client: Any = _shared_s3_client(
+            endpoint_url=endpoint_url,
+            region_name=region_name,
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            addressing_style=addressing_style,
+            max_pool_connections=max_pool_connections,
+        )
         self._bucket = bucket
         self._prefix = _normalize_workspace_path(prefix)
 
@@ -110,15 +191,47 @@ class S3WorkspaceBackend:
             return _normalize_workspace_path(key[len(self._prefix) + 1 :])
         return None
 
-    def _list_keys(self, prefix: str) -> list[str]:
-        """List all object keys under *prefix* (handles pagination)."""
-        keys: list[str] = []
+    def _list_keys(self, prefix: str, start_after: str = "") -> list[str]:
+        """List all object keys under *prefix* (handles pagination).
+
+        A listing that fits in one page costs a single request. Larger ones keep
+        that first page and split the rest at the next ``/`` level, paginating the
+        child prefixes in parallel, since each page request waits on the previous
+        continuation token.
+        """
         paginator = self._client.get_paginator("list_objects_v2")
-        for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix):
-            for obj in page.get("Contents", []):
-                keys.append(obj["Key"])
+        first_page = next(iter(paginator.paginate(**self._list_kwargs(prefix, start_after))), {})
+        keys = [obj["Key"] for obj in first_page.get("Contents", [])]
+        if not first_page.get("IsTruncated"):
+            return keys
+
+        # Everything up to the last key of the first page is already listed.
+        listed_through = keys[-1] if keys else start_after
+        child_prefixes: list[str] = []
+        for page in paginator.paginate(**self._list_kwargs(prefix, listed_through), Delimiter="/"):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+            child_prefixes.extend(entry["Prefix"] for entry in page.get("CommonPrefixes", []))
+        child_starts = [listed_through if listed_through.startswith(child) else "" for child in child_prefixes]
+        if len(child_prefixes) == 1:
+            keys.extend(self._list_keys(child_prefixes[0], child_starts[0]))
+        elif child_prefixes:
+            max_workers = min(_LIST_KEYS_MAX_WORKERS, len(child_prefixes))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vv-agent-s3-list") as executor:
+                for child_keys in executor.map(self._paginate_keys, child_prefixes, child_starts):
+                    keys.extend(child_keys)
         return keys
 
+    def _paginate_keys(self, prefix: str, start_after: str = "") -> list[str]:
+        paginator = self._client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(**self._list_kwargs(prefix, start_after))
+        return [obj["Key"] for page in pages for obj in page.get("Contents", [])]
+
+    def _list_kwargs(self, prefix: str, start_after: str) -> dict[str, str]:
+        kwargs = {"Bucket": self._bucket, "Prefix": prefix}
+        if start_after:
+            kwargs["StartAfter"] = start_after
+        return kwargs
+
     # -- Protocol implementation --------------------------------------------
 
     def list_files(self, base: str, glob: str) -> list[str]:
@@ -135,15 +248,28 @@ class S3WorkspaceBackend:
         if search_prefix and not search_prefix.endswith("/"):
             search_prefix += "/"
 
+        pattern = f"{base_norm}/{glob}" if base_norm else glob
+        if _FNMATCH_IS_CASE_SENSITIVE:
+            # Both matchers need the literal text before the first wildcard, so let
+            # S3 filter on it instead of listing the whole base.
+            wildcard = _GLOB_WILDCARD_RE.search(pattern)
+            literal_prefix = pattern[: wildcard.start()] if wildcard else pattern
+            narrowed_prefix = f"{self._prefix}/{literal_prefix}" if self._prefix else literal_prefix
+            # A wildcard inside ``base`` itself must not widen the listing.
+            if narrowed_prefix.startswith(search_prefix):
+                search_prefix = narrowed_prefix
         all_keys = self._list_keys(search_prefix)
 
-        pattern = f"{base_norm}/{glob}" if base_norm else glob
+        # Compile both matchers once per listing; fnmatch.fnmatch would normalize and
+        # look the pattern up again for every key.
+        fnmatch_regex = re.compile(fnmatch.translate(os.path.normcase(pattern)))
+        glob_regex = _compile_workspace_glob(pattern)
         result: list[str] = []
         for key in all_keys:
             rel = self._rel(key)
             if not rel or rel.endswith("/") or is_reserved_artifact_path(rel):
                 continue
-            if fnmatch.fnmatch(rel, pattern) or self._glob_match(rel, pattern):
+            if fnmatch_regex.match(os.path.normcase(rel)) is not None or glob_regex.match(rel) is not None:
                 result.append(rel)
         result.sort()
         return result
@@ -155,17 +281,41 @@ class S3WorkspaceBackend:
         resp = self._client.get_object(Bucket=self._bucket, Key=self._key(path))
         return resp["Body"].read()
 
+    def read_bytes_stream(self, path: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """Yield the object's bytes in chunks instead of buffering it whole."""
+        body = self._client.get_object(Bucket=self._bucket, Key=self._key(path))["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def read_to_file(self, path: str, dst: IO[bytes]) -> None:
+        """Download the object into *dst*, using parallel ranged GETs for large objects."""
+        self._client.download_fileobj(self._bucket, self._key(path), dst, Config=_transfer_config())
+
     def write_text(self, path: str, content: str, *, append: bool = False) -> int:
         if is_reserved_artifact_path(path):
             raise PermissionError("artifact paths are immutable")
         key = self._key(path)
+        data = content.encode("utf-8")
         if append:
             try:
-                existing = self.read_text(path)
-            except self._client.exceptions.NoSuchKey:
-                existing = ""
-            content = existing + content
-        data = content.encode("utf-8")
+                head = self._client.head_object(Bucket=self._bucket, Key=key)
+            except self._client.exceptions.ClientError as exc:
+                if not _is_missing_key_error(exc):
+                    raise
+            else:
+                existing_size = head.get("ContentLength")
+                if isinstance(existing_size, int) and existing_size >= _MULTIPART_APPEND_MIN_BYTES:
+                    return self._append_multipart(key, existing_size, head.get("ETag"), data)
+                try:
+                    existing = self._client.get_object(Bucket=self._bucket, Key=key)["Body"].read()
+                except self._client.exceptions.NoSuchKey:
+                    existing = b""
+                data = existing + data
+        if len(data) >= _TRANSFER_MULTIPART_THRESHOLD_BYTES:
+            self._client.upload_fileobj(BytesIO(data), self._bucket, key, Config=_transfer_config())
+            return len(data)
         self._client.put_object(
             Bucket=self._bucket,
             Key=key,
@@ -174,6 +324,47 @@ class S3WorkspaceBackend:
         )
         return len(data)
 
+    def _append_multipart(self, key: str, existing_size: int, etag: str | None, data: bytes) -> int:
+        if not data:
+            return existing_size
+        upload_id = self._client.create_multipart_upload(Bucket=self._bucket, Key=key)["UploadId"]
+        copy_source = {"Bucket": self._bucket, "Key": key}
+        copy_conditions = {"CopySourceIfMatch": etag} if etag else {}
+        parts: list[dict[str, Any]] = []
+        try:
+            for start, end in _copy_part_ranges(existing_size):
+                part_number = len(parts) + 1
+                copied = self._client.upload_part_copy(
+                    Bucket=self._bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    CopySource=copy_source,
+                    CopySourceRange=f"bytes={start}-{end}",
+                    **copy_conditions,
+                )
+                parts.append({"PartNumber": part_number, "ETag": copied["CopyPartResult"]["ETag"]})
+            part_number = len(parts) + 1
+            uploaded = self._client.upload_part(
+                Bucket=self._bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data,
+                ContentLength=len(data),
+            )
+            parts.append({"PartNumber": part_number, "ETag": uploaded["ETag"]})
+            self._client.complete_multipart_upload(
+                Bucket=self._bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self._client.abort_multipart_upload(Bucket=self._bucket, Key=key, UploadId=upload_id)
+            raise
+        return existing_size + len(data)
+
     def write_text_exclusive(self, path: str, content: str) -> int:
         return self.write_text_chunks_exclusive(path, (content,))
 
@@ -213,10 +404,8 @@ class S3WorkspaceBackend:
             return None
         modified = head.get("LastModified")
         modified_at = modified.isoformat() if modified else datetime.now(tz=UTC).isoformat()
-        suffix = ""
-        dot = path.rfind(".")
-        if dot != -1 and "/" not in path[dot:]:
-            suffix = path[dot:]
+        _, dot, tail = path.rpartition(".")
+        suffix = dot + tail if dot and "/" not in tail else ""
         return FileInfo(
             path=self._rel(key) or _normalize_workspace_path(path),
             is_file=True,
@@ -239,29 +428,3 @@ class S3WorkspaceBackend:
     def mkdir(self, path: str) -> None:
         # S3 没有真正的目录, 无需操作
         pass
-
-    @staticmethod
-    def _glob_match(path: str, pattern: str) -> bool:
-        """支持 ``**`` 的 glob 匹配."""
-        import re as _re
-
-        parts: list[str] = []
-        i = 0
-        while i < len(pattern):
-            if pattern[i : i + 3] == "**/":
-                parts.append("(?:.+/)?")
-                i += 3
-            elif pattern[i : i + 2] == "**":
-                parts.append(".*")
-                i += 2
-            elif pattern[i] == "*":
-                parts.append("[^/]*")
-                i += 1
-            elif pattern[i] == "?":
-                parts.append("[^/]")
-                i += 1
-            else:
-                parts.append(_re.escape(pattern[i]))
-                i += 1
-        regex = "^" + "".join(parts) + "$"
-        return _re.match(regex, path) is not None
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
+from copy import deepcopy
 from pathlib import Path
 
 import pytest
 
+from vv_agent import config
 from vv_agent.config import (
     ConfigError,
+    _build_vv_llm_settings,
     load_llm_settings_from_file,
     project_resolved_model_limits,
     resolve_model_endpoint,
@@ -111,6 +114,58 @@ endpoints = ["e"]
     assert resolve_model_endpoint(load_llm_settings_from_file(toml_file), "demo", "m").model_id == "m"
 
 
+def test_load_llm_settings_returns_isolated_copies_and_sees_file_changes(tmp_path: Path) -> None:
+    settings_file = tmp_path / "settings.json"
+    payload = {"VERSION": "2", "backends": {}, "endpoints": []}
+    settings_file.write_text(json.dumps(payload), encoding="utf-8")
+
+    first = load_llm_settings_from_file(settings_file)
+    first["backends"]["mutated"] = {}
+    assert load_llm_settings_from_file(settings_file) == payload
+
+    payload["endpoints"] = [{"id": "changed"}]
+    settings_file.write_text(json.dumps(payload), encoding="utf-8")
+    assert load_llm_settings_from_file(settings_file) == payload
+
+
+def test_load_llm_settings_parses_every_time_when_values_cannot_be_pickled(
+    sample_settings_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def refuse_pickle(*_args: object, **_kwargs: object) -> bytes:
+        raise TypeError("cannot pickle")
+
+    parsed_paths: list[Path] = []
+    parse = config._parse_llm_settings_file
+
+    def tracking_parse(source_path: Path, absolute_path: Path) -> dict[str, object]:
+        parsed_paths.append(source_path)
+        return parse(source_path, absolute_path)
+
+    monkeypatch.setattr(config.pickle, "dumps", refuse_pickle)
+    monkeypatch.setattr(config, "_parse_llm_settings_file", tracking_parse)
+    config._load_llm_settings_snapshot.cache_clear()
+
+    first = load_llm_settings_from_file(sample_settings_file)
+    first["backends"]["mutated"] = {}
+    parses_before_second_load = len(parsed_paths)
+    second = load_llm_settings_from_file(sample_settings_file)
+
+    assert "mutated" not in second["backends"]
+    assert second["backends"]["moonshot"]["default_endpoint"] == "moonshot-default"
+    assert len(parsed_paths) == parses_before_second_load + 1
+    config._load_llm_settings_snapshot.cache_clear()
+
+
+def test_load_llm_settings_only_maps_missing_files_to_not_found(tmp_path: Path) -> None:
+    parent_file = tmp_path / "settings.json"
+    parent_file.write_text("{}", encoding="utf-8")
+
+    with pytest.raises(ConfigError, match="Settings file not found"):
+        load_llm_settings_from_file(tmp_path / "missing.json")
+    with pytest.raises(NotADirectoryError):
+        load_llm_settings_from_file(parent_file / "settings.json")
+
+
 def test_load_llm_settings_rejects_unknown_extension(tmp_path: Path) -> None:
     settings_file = tmp_path / "settings.yaml"
     settings_file.write_text("{}", encoding="utf-8")
@@ -133,6 +188,16 @@ def test_resolve_model_endpoint(sample_settings_file: Path) -> None:
     assert resolved.native_multimodal is True
 
 
+def test_build_vv_llm_settings_leaves_caller_settings_untouched(sample_settings_file: Path) -> None:
+    settings = load_llm_settings_from_file(sample_settings_file)
+    snapshot = deepcopy(settings)
+
+    vv_settings = _build_vv_llm_settings(settings)
+
+    assert settings == snapshot
+    assert vv_settings.get_endpoint("moonshot-default").api_key == "sk-test-123456789"
+
+
 def test_resolve_model_endpoint_collects_all_endpoint_options(sample_settings_file: Path) -> None:
     settings = load_llm_settings_from_file(sample_settings_file)
     resolved = resolve_model_endpoint(settings, backend="moonshot", model="kimi-k3")
@@ -140,6 +205,28 @@ def test_resolve_model_endpoint_collects_all_endpoint_options(sample_settings_fi
     assert {item.endpoint.endpoint_id for item in resolved.endpoint_options} == {"moonshot-default", "moonshot-backup"}
 
 
+def test_resolve_model_endpoint_indexes_only_referenced_endpoints() -> None:
+    settings = {
+        "VERSION": "2",
+        "backends": {"demo": {"models": {"m": {"endpoints": [{"endpoint_id": " 7 ", "model_id": "m-7"}, "missing"]}}}},
+        "endpoints": [
+            {"id": "unused", "api_key": "sk-unused", "api_base": "https://unused.example"},
+            {"id": 7, "api_key": "sk-seven", "api_base": "https://seven.example"},
+        ],
+    }
+
+    with pytest.raises(ConfigError, match="Endpoint 'missing'"):
+        resolve_model_endpoint(settings, "demo", "m")
+
+    settings["backends"]["demo"]["models"]["m"]["endpoints"].pop()
+    resolved = resolve_model_endpoint(settings, "demo", "m")
+    assert [(option.endpoint.endpoint_id, option.model_id) for option in resolved.endpoint_options] == [("7", "m-7")]
+
+    settings["endpoints"] = [{"id": ""}, "bad"]
+    with pytest.raises(ConfigError, match="No valid endpoints"):
+        resolve_model_endpoint(settings, "demo", "m")
+
+
 def test_resolve_model_endpoint_rejects_missing_model_key(sample_settings_file: Path) -> None:
     settings = load_llm_settings_from_file(sample_settings_file)
     with pytest.raises(ConfigError, match="missing-model"):
@@ -44,6 +44,46 @@ def test_todo_write_enforces_single_in_progress(tmp_path: Path) -> None:
     assert payload["error_code"] == "multiple_in_progress_todos"
 
 
+def test_todo_write_keeps_unchanged_list_and_timestamps(tmp_path: Path) -> None:
+    registry = build_default_registry()
+    context = _context(tmp_path)
+
+    first = registry.execute(
+        ToolCall(
+            id="c1",
+            name=TASK_LIST_TOOL_NAME,
+            arguments={"todos": [{"id": "a1", "title": "a", "status": "in_progress", "priority": "high"}]},
+        ),
+        context,
+    )
+    stored = context.shared_state["todo_list"]
+    first_payload = json.loads(first.content)
+
+    repeated = registry.execute(
+        ToolCall(
+            id="c2",
+            name=TASK_LIST_TOOL_NAME,
+            arguments={"todos": [{"id": "a1", "title": "a", "status": "in_progress", "priority": "high"}]},
+        ),
+        context,
+    )
+    changed = registry.execute(
+        ToolCall(
+            id="c3",
+            name=TASK_LIST_TOOL_NAME,
+            arguments={"todos": [{"id": "a1", "title": "a", "status": "completed", "priority": "high"}]},
+        ),
+        context,
+    )
+
+    assert repeated.status_code is ToolResultStatus.SUCCESS
+    assert json.loads(repeated.content)["todos"] == first_payload["todos"]
+    assert changed.status_code is ToolResultStatus.SUCCESS
+    assert context.shared_state["todo_list"] is not stored
+    assert context.shared_state["todo_list"][0]["status"] == "completed"
+    assert context.shared_state["todo_list"][0]["created_at"] == first_payload["todos"][0]["created_at"]
+
+
 def test_ask_user_returns_structured_selection_metadata(tmp_path: Path) -> None:
     registry = build_default_registry()
     context = _context(tmp_path)
@@ -107,6 +107,46 @@ def test_register_tool_default_parameters() -> None:
     assert CUSTOM_WORKFLOW_TOOL_NAME in names
 
 
+def test_get_schema_returns_independent_copy() -> None:
+    registry = ToolRegistry()
+
+    def _noop(context: ToolContext, arguments: dict[str, object]) -> ToolExecutionResult:
+        del context, arguments
+        return ToolExecutionResult(tool_call_id="", content="{}")
+
+    registry.register_tool(
+        name="_noop",
+        handler=_noop,
+        description="No-op tool.",
+        parameters={"type": "object", "properties": {"tags": {"type": "array", "items": {"type": "string"}}}},
+    )
+    schema = registry.get_schema("_noop")
+    schema["function"]["description"] = "patched"
+    schema["function"]["parameters"]["properties"]["tags"]["items"]["type"] = "integer"
+
+    fresh = registry.get_schema("_noop")
+    assert fresh["function"]["description"] == "No-op tool."
+    assert fresh["function"]["parameters"]["properties"]["tags"]["items"] == {"type": "string"}
+
+
+def test_list_openai_schemas_reflects_new_tools_and_returns_fresh_lists() -> None:
+    registry = ToolRegistry()
+
+    def _noop(context: ToolContext, arguments: dict[str, object]) -> ToolExecutionResult:
+        del context, arguments
+        return ToolExecutionResult(tool_call_id="", content="{}")
+
+    registry.register_tool(name="_first", handler=_noop, description="First tool.")
+    listed = registry.list_openai_schemas()
+    listed[0]["function"]["description"] = "patched"
+
+    assert [schema["function"]["description"] for schema in registry.list_openai_schemas()] == ["First tool."]
+
+    registry.register_tool(name="_second", handler=_noop, description="Second tool.")
+    assert [schema["function"]["name"] for schema in registry.list_openai_schemas()] == ["_first", "_second"]
+    assert [schema["function"]["name"] for schema in registry.list_openai_schemas(tool_names=["_second"])] == ["_second"]
+
+
 def test_runtime_executes_custom_workflow_tool(tmp_path: Path) -> None:
     registry = _register_custom_workflow_tool()
     llm = ScriptedLLM(
@@ -72,3 +72,42 @@ def test_read_image_rejects_unsupported_extension(tmp_path: Path) -> None:
 
     assert result.status_code == ToolResultStatus.ERROR
     assert result.error_code == "unsupported_image_format"
+
+
+def test_read_image_rejects_oversized_file_without_reading_it(tmp_path: Path, monkeypatch) -> None:
+    registry = build_default_registry()
+    context = _context(tmp_path)
+
+    image_path = tmp_path / "huge.png"
+    with image_path.open("wb") as fh:
+        fh.truncate(5 * 1024 * 1024 + 1)
+
+    def _fail_read_bytes(self, path: str) -> bytes:
+        raise AssertionError("oversized images must be rejected before reading")
+
+    monkeypatch.setattr(LocalWorkspaceBackend, "read_bytes", _fail_read_bytes)
+
+    result = registry.execute(
+        ToolCall(id="c4", name=READ_IMAGE_TOOL_NAME, arguments={"path": "huge.png"}),
+        context,
+    )
+
+    assert result.status_code == ToolResultStatus.ERROR
+    assert result.error_code == "image_too_large"
+    assert result.metadata["actual_bytes"] == 5 * 1024 * 1024 + 1
+
+
+def test_read_image_reports_missing_and_directory_paths_as_not_found(tmp_path: Path) -> None:
+    registry = build_default_registry()
+    context = _context(tmp_path)
+
+    (tmp_path / "folder.png").mkdir()
+
+    for call_id, path in (("c5", "missing.png"), ("c6", "folder.png")):
+        result = registry.execute(
+            ToolCall(id=call_id, name=READ_IMAGE_TOOL_NAME, arguments={"path": path}),
+            context,
+        )
+
+        assert result.status_code == ToolResultStatus.ERROR
+        assert result.error_code == "image_not_found"
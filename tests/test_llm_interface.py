@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Callable
 from pathlib import Path
 from types import SimpleNamespace
@@ -121,6 +122,225 @@ def test_llm_failover_to_next_endpoint(monkeypatch) -> None:
     assert response.raw["used_endpoint_id"] == "second"
 
 
+def test_llm_reuses_chat_client_across_retries_and_turns(monkeypatch) -> None:
+    attempts: list[int] = []
+
+    def flaky_call(kwargs: dict[str, Any]) -> Any:
+        del kwargs
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise APIConnectionError(request=httpx.Request("POST", "https://only.example/v1/chat/completions"))
+        return SimpleNamespace(content="ok", tool_calls=[], reasoning_content=None, usage=_FakeUsage())
+
+    _FakeChatClient.behavior_by_endpoint = {"only": flaky_call}
+    _FakeChatClient.seen_calls = []
+    created: list[_FakeChatClient] = []
+
+    def counting_create_chat_client(*, endpoint_id: str, **kwargs: Any) -> _FakeChatClient:
+        client = _fake_create_chat_client(endpoint_id=endpoint_id, **kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", counting_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+    monkeypatch.setattr(VvLlmClient, "_should_use_stream", staticmethod(lambda model: False))
+
+    llm = VvLlmClient(
+        endpoint_targets=[EndpointTarget(endpoint_id="only", api_key="k", api_base="https://only.example/v1")],
+        backend="openai",
+        selected_model="gpt-4o-mini",
+        randomize_endpoints=False,
+        max_retries_per_endpoint=2,
+        backoff_seconds=0.0,
+    )
+
+    first = _complete(llm, model="gpt-4o-mini", messages=[Message(role="user", content="hello")], tools=[])
+    second = _complete(llm, model="gpt-4o-mini", messages=[Message(role="user", content="again")], tools=[])
+
+    assert first.content == "ok"
+    assert second.content == "ok"
+    assert len(attempts) == 3
+    assert len(created) == 1
+
+
+def test_llm_hedges_to_next_endpoint_when_first_is_slow(monkeypatch) -> None:
+    release_slow = threading.Event()
+
+    def slow_call(kwargs: dict[str, Any]) -> Any:
+        del kwargs
+        release_slow.wait(timeout=5)
+        return SimpleNamespace(content="slow", tool_calls=[], reasoning_content=None, usage=_FakeUsage())
+
+    _FakeChatClient.behavior_by_endpoint = {
+        "slow": slow_call,
+        "fast": SimpleNamespace(content="fast", tool_calls=[], reasoning_content=None, usage=_FakeUsage()),
+    }
+    _FakeChatClient.seen_calls = []
+
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", _fake_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+    monkeypatch.setattr(VvLlmClient, "_should_use_stream", staticmethod(lambda model: False))
+
+    llm = VvLlmClient(
+        endpoint_targets=[
+            EndpointTarget(endpoint_id="slow", api_key="k1", api_base="https://slow.example/v1"),
+            EndpointTarget(endpoint_id="fast", api_key="k2", api_base="https://fast.example/v1"),
+        ],
+        backend="openai",
+        selected_model="gpt-4o-mini",
+        randomize_endpoints=False,
+        max_retries_per_endpoint=1,
+        backoff_seconds=0.0,
+        hedge_delay_seconds=0.05,
+    )
+
+    try:
+        response = _complete(llm, model="gpt-4o-mini", messages=[Message(role="user", content="hello")], tools=[])
+    finally:
+        release_slow.set()
+
+    assert response.content == "fast"
+    assert response.raw["used_endpoint_id"] == "fast"
+    assert llm._ordered_targets()[0].endpoint_id == "fast"
+
+
+def test_llm_hedge_raises_non_retryable_error_without_waiting_for_slow_leg(monkeypatch) -> None:
+    release_slow = threading.Event()
+
+    def slow_call(kwargs: dict[str, Any]) -> Any:
+        del kwargs
+        release_slow.wait(timeout=5)
+        return SimpleNamespace(content="slow", tool_calls=[], reasoning_content=None, usage=_FakeUsage())
+
+    def bad_request(kwargs: dict[str, Any]) -> Any:
+        del kwargs
+        request = httpx.Request("POST", "https://second.example/v1/chat/completions")
+        response = httpx.Response(400, request=request)
+        raise APIStatusError("invalid request", response=response, body={"error": "invalid request"})
+
+    _FakeChatClient.behavior_by_endpoint = {"slow": slow_call, "second": bad_request}
+    _FakeChatClient.seen_calls = []
+
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", _fake_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+    monkeypatch.setattr(VvLlmClient, "_should_use_stream", staticmethod(lambda model: False))
+
+    llm = VvLlmClient(
+        endpoint_targets=[
+            EndpointTarget(endpoint_id="slow", api_key="k1", api_base="https://slow.example/v1"),
+            EndpointTarget(endpoint_id="second", api_key="k2", api_base="https://second.example/v1"),
+        ],
+        backend="openai",
+        selected_model="gpt-4o-mini",
+        randomize_endpoints=False,
+        max_retries_per_endpoint=1,
+        backoff_seconds=0.0,
+        hedge_delay_seconds=0.05,
+    )
+
+    try:
+        with pytest.raises(APIStatusError):
+            _complete(llm, model="gpt-4o-mini", messages=[Message(role="user", content="hello")], tools=[])
+        assert not release_slow.is_set()
+    finally:
+        release_slow.set()
+
+    assert llm._ordered_targets()[0].endpoint_id == "slow"
+
+
+def test_llm_hedge_legs_format_separately_and_report_errors_in_start_order(monkeypatch) -> None:
+    second_started = threading.Event()
+
+    def mutating_failure(kwargs: dict[str, Any]) -> Any:
+        kwargs["messages"][0]["content"] += " [tool prompt]"
+        second_started.wait(timeout=5)
+        raise APIConnectionError(request=httpx.Request("POST", "https://first.example/v1/chat/completions"))
+
+    def failing_after_start(kwargs: dict[str, Any]) -> Any:
+        second_started.set()
+        raise APIStatusError(
+            "unavailable",
+            response=httpx.Response(503, request=httpx.Request("POST", "https://second.example/v1/chat/completions")),
+            body={"error": "unavailable"},
+        )
+
+    _FakeChatClient.behavior_by_endpoint = {"first": mutating_failure, "second": failing_after_start}
+    _FakeChatClient.seen_calls = []
+    prepare_calls: list[str] = []
+    original_prepare = VvLlmClient._prepare_messages_for_model
+
+    def counting_prepare(messages: list[ChatCompletionMessageParam], model: str) -> list[ChatCompletionMessageParam]:
+        prepare_calls.append(model)
+        return original_prepare(messages, model)
+
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", _fake_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+    monkeypatch.setattr(VvLlmClient, "_should_use_stream", staticmethod(lambda model: False))
+    monkeypatch.setattr(VvLlmClient, "_prepare_messages_for_model", staticmethod(counting_prepare))
+
+    llm = VvLlmClient(
+        endpoint_targets=[
+            EndpointTarget(endpoint_id="first", api_key="k1", api_base="https://first.example/v1"),
+            EndpointTarget(endpoint_id="second", api_key="k2", api_base="https://second.example/v1"),
+        ],
+        backend="openai",
+        selected_model="gpt-4o-mini",
+        randomize_endpoints=False,
+        max_retries_per_endpoint=1,
+        backoff_seconds=0.0,
+        hedge_delay_seconds=0.01,
+    )
+
+    with pytest.raises(RuntimeError, match=r"All endpoints failed: first: .*; second: status 503"):
+        _complete(llm, model="gpt-4o-mini", messages=[Message(role="user", content="hello")], tools=[])
+
+    assert prepare_calls == ["gpt-4o-mini", "gpt-4o-mini"]
+    second_call = next(call for call in _FakeChatClient.seen_calls if call["endpoint_id"] == "second")
+    assert second_call["messages"] == [{"role": "user", "content": "hello"}]
+
+
+def test_llm_failover_reuses_formatted_messages_without_sharing_mutations(monkeypatch) -> None:
+    def mutating_failure(kwargs: dict[str, Any]) -> Any:
+        kwargs["messages"][0]["content"] += " [tool prompt]"
+        kwargs["messages"].insert(0, {"role": "system", "content": "injected"})
+        raise APIConnectionError(request=httpx.Request("POST", "https://first.example/v1/chat/completions"))
+
+    _FakeChatClient.behavior_by_endpoint = {
+        "first": mutating_failure,
+        "second": SimpleNamespace(content="ok", tool_calls=[], reasoning_content=None, usage=_FakeUsage()),
+    }
+    _FakeChatClient.seen_calls = []
+    prepare_calls: list[str] = []
+    original_prepare = VvLlmClient._prepare_messages_for_model
+
+    def counting_prepare(messages: list[ChatCompletionMessageParam], model: str) -> list[ChatCompletionMessageParam]:
+        prepare_calls.append(model)
+        return original_prepare(messages, model)
+
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", _fake_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+    monkeypatch.setattr(VvLlmClient, "_should_use_stream", staticmethod(lambda model: False))
+    monkeypatch.setattr(VvLlmClient, "_prepare_messages_for_model", staticmethod(counting_prepare))
+
+    llm = VvLlmClient(
+        endpoint_targets=[
+            EndpointTarget(endpoint_id="first", api_key="k1", api_base="https://first.example/v1"),
+            EndpointTarget(endpoint_id="second", api_key="k2", api_base="https://second.example/v1"),
+        ],
+        backend="openai",
+        selected_model="gpt-4o-mini",
+        randomize_endpoints=False,
+        max_retries_per_endpoint=1,
+        backoff_seconds=0.0,
+    )
+
+    response = _complete(llm, model="gpt-4o-mini", messages=[Message(role="user", content="hello")], tools=[])
+
+    assert response.raw["used_endpoint_id"] == "second"
+    assert prepare_calls == ["gpt-4o-mini"]
+    assert _FakeChatClient.seen_calls[-1]["messages"] == [{"role": "user", "content": "hello"}]
+
+
 def test_llm_bridge_preserves_provider_reported_zero_cache_usage(monkeypatch) -> None:
     usage = Usage(
         prompt_tokens=11,
@@ -211,6 +431,50 @@ def test_llm_retries_transient_status_on_the_same_endpoint(monkeypatch) -> None:
     assert attempts == 2
 
 
+def test_llm_retry_honors_retry_after_and_bounds_jittered_backoff(monkeypatch) -> None:
+    attempts = 0
+    sleeps: list[float] = []
+
+    def rate_limited_once(kwargs: dict[str, Any]) -> Any:
+        nonlocal attempts
+        del kwargs
+        attempts += 1
+        if attempts == 1:
+            request = httpx.Request("POST", "https://first.example/v1/chat/completions")
+            response = httpx.Response(429, headers={"retry-after": "3"}, request=request)
+            raise APIStatusError("rate limited", response=response, body={"error": "rate limited"})
+        return SimpleNamespace(content="ok", tool_calls=[], reasoning_content=None, usage=_FakeUsage())
+
+    _FakeChatClient.behavior_by_endpoint = {"first": rate_limited_once}
+    _FakeChatClient.seen_calls = []
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", _fake_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+    monkeypatch.setattr(VvLlmClient, "_should_use_stream", staticmethod(lambda model: False))
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.time.sleep", sleeps.append)
+    llm = VvLlmClient(
+        endpoint_targets=[EndpointTarget(endpoint_id="first", api_key="k", api_base="https://first.example/v1")],
+        randomize_endpoints=False,
+        max_retries_per_endpoint=2,
+        backoff_seconds=0.0,
+    )
+
+    response = _complete(llm, model="demo", messages=[Message(role="user", content="hello")], tools=[])
+
+    assert response.content == "ok"
+    assert sleeps == [3.0]
+
+    sleeps.clear()
+    delay = 0.0
+    for _ in range(6):
+        delay = VvLlmClient._sleep_backoff(1.0, previous_delay=delay)
+    assert all(1.0 <= slept <= 10.0 for slept in sleeps)
+    assert VvLlmClient._sleep_backoff(1.0, retry_after=600.0) == 60.0
+
+    request = httpx.Request("POST", "https://first.example/v1/chat/completions")
+    response = httpx.Response(503, headers={"retry-after-ms": "250", "retry-after": "9"}, request=request)
+    assert VvLlmClient._retry_after_seconds(APIStatusError("busy", response=response, body=None)) == 0.25
+
+
 def test_llm_auth_status_fails_over_without_same_endpoint_retry(monkeypatch) -> None:
     def unauthorized_call(kwargs: dict[str, Any]) -> Any:
         del kwargs
@@ -334,6 +598,36 @@ def test_llm_stream_aggregates_tool_calls(monkeypatch) -> None:
     assert response.tool_calls[0].arguments["todos"][0]["title"] == "a"
 
 
+def test_llm_stream_orders_tool_calls_by_numeric_index(monkeypatch) -> None:
+    def tool_delta(index: int, call_id: str, name: str) -> SimpleNamespace:
+        return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments="{}"))
+
+    chunk = SimpleNamespace(
+        usage=_FakeUsage(),
+        content=None,
+        reasoning_content=None,
+        tool_calls=[tool_delta(10, "tc10", "tenth"), tool_delta(2, "tc2", "second")],
+    )
+    _FakeChatClient.behavior_by_endpoint = {"stream": lambda kwargs: [chunk]}
+    _FakeChatClient.seen_calls = []
+
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.create_chat_client", _fake_create_chat_client)
+    monkeypatch.setattr("vv_agent.llm.vv_llm_client.format_messages", _passthrough_format_messages)
+
+    llm = VvLlmClient(
+        endpoint_targets=[EndpointTarget(endpoint_id="stream", api_key="k", api_base="https://stream.example/v1")],
+        backend="moonshot",
+        selected_model="kimi-k2.5",
+        randomize_endpoints=False,
+        max_retries_per_endpoint=1,
+        backoff_seconds=0.0,
+    )
+
+    response = _complete(llm, model="kimi-k2.5", messages=[Message(role="user", content="hi")], tools=[])
+
+    assert [(call.id, call.name) for call in response.tool_calls] == [("tc2", "second"), ("tc10", "tenth")]
+
+
 def test_llm_stream_emits_tool_call_progress_events(monkeypatch) -> None:
     chunk_1 = SimpleNamespace(
         usage=None,
@@ -909,6 +1203,29 @@ def test_minimax_provider_defaults_new_models_to_reasoning_chain() -> None:
     assert llm._should_preserve_reasoning_chain("minimax-m3") is True
 
 
+@pytest.mark.parametrize(
+    ("provider", "expected"),
+    [
+        ("deepseek", True),
+        (" MiniMax_cn ", True),
+        ("moonshot-intl", True),
+        ("deepseekx", False),
+        ("openai", False),
+        ("", False),
+    ],
+)
+def test_reasoning_chain_provider_requires_exact_name_or_separator(provider: str, expected: bool) -> None:
+    assert VvLlmClient._is_reasoning_chain_provider(provider) is expected
+
+
+def test_deepseek_endpoint_type_enables_reasoning_options_only_for_deepseek_names() -> None:
+    llm = VvLlmClient(endpoint_targets=[], backend="openai")
+
+    assert llm._uses_deepseek_model(model="m", endpoint_type="DeepSeek_Beta") is True
+    assert llm._uses_deepseek_model(model="m", endpoint_type="deepseeker") is False
+    assert llm._uses_deepseek_model(model="m", endpoint_type="moonshot") is False
+
+
 def test_build_message_payload_keeps_reasoning_only_for_last_assistant_by_default() -> None:
     llm = VvLlmClient(endpoint_targets=[], backend="openai", selected_model="gpt-4o")
     payload = llm._build_message_payload(
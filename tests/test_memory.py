@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import json
+from dataclasses import replace
 from pathlib import Path
 from typing import Any
 
 from vv_agent.memory import MemoryManager, SessionMemory, SessionMemoryConfig, SessionMemoryEntry
-from vv_agent.memory.microcompact import COMPACT_MARKER_OPENING
+from vv_agent.memory.microcompact import COMPACT_MARKER_OPENING, build_compacted_tool_content
 from vv_agent.microcompaction import MicrocompactionPolicy
 from vv_agent.types import Message
 from vv_agent.workspace import LocalWorkspaceBackend, MemoryWorkspaceBackend
+from vv_agent.workspace.artifacts import persist_text_artifact
 
 
 def _fake_summary(_prompt: str, _backend: str | None, _model: str | None) -> str:
@@ -227,6 +229,24 @@ def test_memory_compacts_large_tool_result_to_workspace_artifact(tmp_path: Path)
     assert "tool: read_file" in compacted[1].content
 
 
+def test_memory_artifact_intact_check_rejects_resized_artifact_without_reading(tmp_path: Path) -> None:
+    read_paths: list[str] = []
+
+    class _TrackingBackend(LocalWorkspaceBackend):
+        def read_bytes(self, path: str) -> bytes:
+            read_paths.append(path)
+            return super().read_bytes(path)
+
+    backend = _TrackingBackend(tmp_path)
+    manager = _build_manager(workspace=tmp_path, workspace_backend=backend)
+    artifact = persist_text_artifact(backend, "memory-artifact", "call_1", "x" * 200)
+    assert manager._artifact_is_intact(artifact) is True
+    read_paths.clear()
+
+    assert manager._artifact_is_intact(replace(artifact, size_bytes=artifact.size_bytes + 1)) is False
+    assert read_paths == []
+
+
 def test_memory_compacts_processed_image_payload() -> None:
     manager = _build_manager(keep_recent_messages=2)
     image_payload = "data:image/png;base64," + ("a" * 400)
@@ -246,6 +266,52 @@ def test_memory_compacts_processed_image_payload() -> None:
     assert "image payload compacted" in image_messages[0].content
 
 
+def test_memory_collects_compacted_artifact_metadata_from_markers() -> None:
+    manager = _build_manager()
+    marker = build_compacted_tool_content(
+        "output line\r\n" * 3,
+        artifact_path=".vv-agent/artifacts/scope/call-1.txt",
+        tool_name="bash",
+    )
+    messages = [
+        Message(role="tool", content=marker, tool_call_id="call_1"),
+        Message(
+            role="tool",
+            content=build_compacted_tool_content("x" * 50, artifact_path="N/A", tool_name="bash"),
+            tool_call_id="call_2",
+        ),
+    ]
+
+    artifacts = manager._collect_compacted_artifacts(
+        messages,
+        {"call_1": {"name": "shell", "arguments": '{"cmd": "ls"}'}},
+    )
+
+    assert artifacts == [
+        {
+            "tool": "bash",
+            "path": ".vv-agent/artifacts/scope/call-1.txt",
+            "arguments": '{"cmd": "ls"}',
+        }
+    ]
+
+
+def test_memory_keeps_image_payload_after_last_assistant() -> None:
+    manager = _build_manager()
+    image_payload = "data:image/png;base64," + ("a" * 400)
+    messages = [
+        Message(role="system", content="sys"),
+        Message(role="user", content="[Image loaded] first.png", image_url=image_payload),
+        Message(role="assistant", content="first parsed"),
+        Message(role="user", content="[Image loaded] second.png", image_url=image_payload),
+    ]
+
+    compacted, changed = manager._compact_processed_image_messages(messages)
+    assert changed is True
+    assert compacted[1].image_url is None
+    assert compacted[3] is messages[3]
+
+
 def test_memory_uses_token_based_length_with_recent_tool_ids() -> None:
     manager = _build_manager(
         model_context_window=120,
@@ -280,6 +346,59 @@ def test_memory_uses_token_based_length_with_recent_tool_ids() -> None:
     assert len(compacted2) == 2
 
 
+def test_memory_reuses_token_counts_until_message_content_changes(monkeypatch) -> None:
+    import vv_agent.memory.manager as manager_module
+
+    counted: list[int] = []
+
+    def fake_count(payload: list[dict[str, Any]], *, model: str = "") -> int:
+        del model
+        counted.append(len(payload))
+        return sum(len(str(item.get("content") or "")) for item in payload)
+
+    monkeypatch.setattr(manager_module, "count_messages_tokens", fake_count)
+    manager = _build_manager()
+    messages = [
+        Message(role="system", content="sys"),
+        Message(role="user", content="hello"),
+    ]
+
+    assert manager.count_message_tokens(messages) == 8
+    assert manager.count_message_tokens(list(messages)) == 8
+    assert counted == [2]
+
+    messages[1].content = "hello again"
+    assert manager.count_message_tokens(messages) == 14
+    assert counted == [2, 2]
+
+
+def test_memory_compact_skips_exact_count_when_far_below_threshold(monkeypatch) -> None:
+    import vv_agent.memory.manager as manager_module
+
+    counted: list[int] = []
+
+    def fake_count(payload: list[dict[str, Any]], *, model: str = "") -> int:
+        del model
+        counted.append(len(payload))
+        return sum(len(str(item.get("content") or "")) for item in payload)
+
+    monkeypatch.setattr(manager_module, "count_messages_tokens", fake_count)
+    manager = _build_manager(model_context_window=10_000, reserved_output_tokens=0, autocompact_buffer_tokens=0)
+    messages = [
+        Message(role="system", content="sys"),
+        Message(role="user", content="你好"),
+    ]
+
+    compacted, changed = manager.compact(messages, cycle_index=1)
+    assert changed is False
+    assert compacted == messages
+    assert counted == []
+
+    messages.append(Message(role="assistant", content="x" * 9_000))
+    manager.compact(messages, cycle_index=2)
+    assert counted == [3]
+
+
 def test_memory_thresholds_respect_configured_ceiling() -> None:
     manager = MemoryManager(
         model_context_window=200_000,
@@ -15,7 +15,7 @@ from vv_agent import (
 )
 from vv_agent.config import ResolvedModelConfig
 from vv_agent.constants import TASK_FINISH_TOOL_NAME
-from vv_agent.llm import LlmRequest, ScriptedLLM
+from vv_agent.llm import LlmRequest, ScriptedLLM, ScriptExhaustedError
 from vv_agent.model import ModelError
 from vv_agent.types import LLMResponse, Message, ToolCall
 
@@ -83,6 +83,19 @@ def test_scripted_llm_callback_receives_the_complete_request() -> None:
     assert requests[0].model_settings == ModelSettings(temperature=0.2)
 
 
+def test_scripted_llm_replays_any_iterable_in_order_then_exhausts() -> None:
+    llm = ScriptedLLM(steps=(LLMResponse(content=str(index)) for index in range(2)))
+    request = LlmRequest(model="demo-model", messages=[Message(role="user", content="hello")])
+
+    assert llm.complete(request).content == "0"
+    llm.steps.append(LLMResponse(content="appended"))
+    assert [step.content for step in llm.steps if isinstance(step, LLMResponse)] == ["1", "appended"]
+    assert [llm.complete(request).content for _ in range(2)] == ["1", "appended"]
+    assert not llm.steps
+    with pytest.raises(ScriptExhaustedError):
+        llm.complete(request)
+
+
 def test_scripted_provider_default_model_is_runner_fallback(tmp_path: Path) -> None:
     provider = ScriptedModelProvider.new(
         "scripted",
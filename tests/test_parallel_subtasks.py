@@ -7,6 +7,7 @@ from pathlib import Path
 import pytest
 
 from vv_agent.agent import RunContext
+from vv_agent.runtime.backends.inline import InlineBackend
 from vv_agent.runtime.backends.thread import ThreadBackend
 from vv_agent.runtime.context import ExecutionContext
 from vv_agent.runtime.sub_task_manager import SubTaskManager
@@ -159,11 +160,11 @@ class TestParallelSubTasks:
         assert result.status_code == ToolResultStatus.SUCCESS
         assert set(call_log) == {"task A", "task B", "task C"}
 
-    def test_create_sub_task_batch_fallback_serial(self, tmp_path: Path):
-        call_order: list[str] = []
+    def test_create_sub_task_batch_fallback_runs_concurrently(self, tmp_path: Path):
+        barrier = threading.Barrier(2, timeout=5)
 
         def mock_runner(request: SubTaskRequest) -> SubTaskOutcome:
-            call_order.append(request.task_description)
+            barrier.wait()
             return SubTaskOutcome(
                 task_id=f"sub_{request.task_description}",
                 agent_name=request.agent_name,
@@ -193,7 +194,39 @@ class TestParallelSubTasks:
         )
 
         assert result.status_code == ToolResultStatus.SUCCESS
-        assert call_order == ["first", "second"]
+        assert [item["index"] for item in result.metadata["results"]] == [0, 1]
+        assert [item["final_answer"] for item in result.metadata["results"]] == ["done: first", "done: second"]
+
+    def test_create_sub_task_batch_runs_every_identical_task(self, tmp_path: Path):
+        calls: list[SubTaskRequest] = []
+        lock = threading.Lock()
+
+        def recording_runner(request: SubTaskRequest) -> SubTaskOutcome:
+            with lock:
+                calls.append(request)
+            return _completed_outcome(request)
+
+        context = ToolContext(
+            workspace=tmp_path,
+            shared_state={},
+            cycle_index=1,
+            workspace_backend=LocalWorkspaceBackend(tmp_path),
+            sub_task_runner=recording_runner,
+            sub_task_manager=_build_manager(),
+            task_id="parent_task",
+        )
+
+        result = create_sub_task(
+            context,
+            {
+                "agent_id": "worker",
+                "tasks": [{"task_description": "roll a die"} for _ in range(3)],
+            },
+        )
+
+        assert result.status_code == ToolResultStatus.SUCCESS
+        assert sorted(request.metadata["batch_index"] for request in calls) == [0, 1, 2]
+        assert result.metadata["summary"] == {"total": 3, "completed": 3, "failed": 0}
 
     def test_create_sub_task_batch_async_returns_task_ids(self, tmp_path: Path):
         def mock_runner(request: SubTaskRequest) -> SubTaskOutcome:
@@ -272,6 +305,35 @@ class TestParallelSubTasks:
         unique_threads = set(thread_ids)
         assert len(unique_threads) >= 2, f"Expected parallel execution, got threads: {unique_threads}"
 
+    def test_inline_backend_parallel_map_runs_concurrently_in_item_order(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def worker(x: int) -> int:
+            barrier.wait()
+            return x * 2
+
+        assert InlineBackend().parallel_map(worker, [1, 2, 3]) == [2, 4, 6]
+
+    def test_inline_backend_parallel_map_stops_queued_items_after_a_failure(self):
+        started: list[int] = []
+        lock = threading.Lock()
+        all_workers_busy = threading.Barrier(8, timeout=5)
+
+        def worker(x: int) -> int:
+            with lock:
+                started.append(x)
+            all_workers_busy.wait()
+            if x == 0:
+                raise ValueError("first item failed")
+            time.sleep(0.2)
+            return x
+
+        with pytest.raises(ValueError, match="first item failed"):
+            InlineBackend().parallel_map(worker, list(range(10)))
+
+        # Eight workers hold items 0-7 when item 0 fails, so queued items 8 and 9 never start.
+        assert sorted(started) == list(range(8))
+
 
 def _completed_outcome(request: SubTaskRequest) -> SubTaskOutcome:
     return SubTaskOutcome(
@@ -250,5 +250,5 @@ def test_public_runner_executes_configured_child_without_runtime_task(tmp_path:
         public_runner["child_model"],
         public_runner["parent_model"],
     ]
-    assert llm.steps == []
+    assert not llm.steps
     assert public_runner["constructs_agent_task"] is False
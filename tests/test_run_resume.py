@@ -225,7 +225,7 @@ def test_approved_continue_tool_returns_to_the_model_loop(tmp_path: Path) -> Non
     assert resumed.trace_id == interrupted.trace_id
     assert len(resumed.raw_result.cycles) == expected["cycles"]
     assert executions == ["item"]
-    assert model.steps == []
+    assert not model.steps
     terminal_types = {"run_completed", "run_failed", "run_cancelled"}
     assert not any(event.run_id == interrupted.run_id and event.type in terminal_types for event in resumed.events)
     resumed_lifecycle = [
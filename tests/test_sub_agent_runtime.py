@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 
 import pytest
@@ -65,6 +66,14 @@ def _parent_client(provider: ModelMapProvider) -> LLMClient:
     return provider.client(provider.resolve(ModelRef.named("parent-model")))
 
 
+def _finish_with_section_answer(request: LlmRequest) -> LLMResponse:
+    section = request.messages[-1].content.rsplit(" ", 1)[-1]
+    return LLMResponse(
+        content="sub done",
+        tool_calls=[ToolCall(id="s1", name=TASK_FINISH_TOOL_NAME, arguments={"message": f"sub-{section}"})],
+    )
+
+
 def test_sub_agent_session_helpers_expose_registered_session() -> None:
     captured_events: list[tuple[str, dict[str, int]]] = []
 
@@ -203,15 +212,7 @@ def test_create_sub_task_batch_aggregates_sub_agent_results(tmp_path: Path) -> N
         ]
     )
 
-    sub_llm = ScriptedLLM(
-        steps=[
-            LLMResponse(
-                content="sub done",
-                tool_calls=[ToolCall(id="s1", name=TASK_FINISH_TOOL_NAME, arguments={"message": answer})],
-            )
-            for answer in ("sub-A", "sub-B")
-        ]
-    )
+    sub_llm = ScriptedLLM(steps=[_finish_with_section_answer, _finish_with_section_answer])
     provider = _shared_model_provider(parent_llm=parent_llm, child_llm=sub_llm)
 
     runtime = AgentRuntime(
@@ -247,6 +248,72 @@ def test_create_sub_task_batch_aggregates_sub_agent_results(tmp_path: Path) -> N
     assert batch_payload["results"][1]["final_answer"] == "sub-B"
 
 
+def test_create_sub_task_batch_runs_children_concurrently_on_default_backend(tmp_path: Path) -> None:
+    parent_llm = ScriptedLLM(
+        steps=[
+            LLMResponse(
+                content="batch delegate",
+                tool_calls=[
+                    ToolCall(
+                        id="p1",
+                        name=CREATE_SUB_TASK_TOOL_NAME,
+                        arguments={
+                            "agent_id": "writer-sub",
+                            "tasks": [
+                                {"task_description": "Write section A"},
+                                {"task_description": "Write section B"},
+                            ],
+                        },
+                    )
+                ],
+            ),
+            LLMResponse(
+                content="finish parent",
+                tool_calls=[ToolCall(id="p2", name=TASK_FINISH_TOOL_NAME, arguments={"message": "done"})],
+            ),
+        ]
+    )
+    # Each child blocks until the other one has started, so a serial batch would time out.
+    both_children_started = threading.Barrier(2, timeout=5)
+
+    def finish_after_sibling_starts(request: LlmRequest) -> LLMResponse:
+        both_children_started.wait()
+        return _finish_with_section_answer(request)
+
+    sub_llm = ScriptedLLM(steps=[finish_after_sibling_starts, finish_after_sibling_starts])
+    provider = _shared_model_provider(parent_llm=parent_llm, child_llm=sub_llm)
+
+    runtime = AgentRuntime(
+        llm_client=_parent_client(provider),
+        model_provider=provider,
+        tool_registry=build_default_registry(),
+        default_workspace=tmp_path,
+        tool_registry_factory=build_default_registry,
+    )
+    assert isinstance(runtime.execution_backend, InlineBackend)
+    task = AgentTask(
+        task_id="parent_batch_inline",
+        model="parent-model",
+        prompt_bundle=build_raw_system_prompt_bundle("sys"),
+        user_prompt="run parent batch task",
+        max_cycles=4,
+        sub_agents={
+            "writer-sub": SubAgentConfig(
+                model="kimi-k2.5",
+                backend="moonshot",
+                description="write sections",
+            )
+        },
+    )
+
+    result = runtime.run(task)
+    assert result.status == AgentStatus.COMPLETED
+
+    batch_payload = json.loads(result.cycles[0].tool_results[0].content)
+    assert batch_payload["summary"] == {"total": 2, "completed": 2, "failed": 0}
+    assert [item["final_answer"] for item in batch_payload["results"]] == ["sub-A", "sub-B"]
+
+
 def test_create_sub_task_batch_uses_execution_backend_parallel_map(tmp_path: Path) -> None:
     class _TrackingInlineBackend(InlineBackend):
         def __init__(self) -> None:
@@ -343,6 +343,29 @@ def test_find_files_reports_estimated_count_when_scan_limit_reached(registry, to
     assert payload["scan_limit"] == 12
 
 
+def test_find_files_glob_without_globstar_skips_deeper_directories(registry, tool_context: ToolContext) -> None:
+    for idx in range(3):
+        (tool_context.workspace / f"top_{idx}.txt").write_text("x", encoding="utf-8")
+    (tool_context.workspace / "src").mkdir()
+    (tool_context.workspace / "src" / "mod.txt").write_text("x", encoding="utf-8")
+    deep = tool_context.workspace / "src" / "deep"
+    deep.mkdir()
+    for idx in range(40):
+        (deep / f"scan_{idx:03d}.txt").write_text("x", encoding="utf-8")
+
+    arguments = {"glob": "*.txt", "scan_limit": 12, "max_results": 5, "sort": "path_asc"}
+    call = ToolCall(id="call_list", name=FIND_FILES_TOOL_NAME, arguments=arguments)
+    payload = json.loads(registry.execute(call, tool_context).content)
+    assert payload["files"] == ["top_0.txt", "top_1.txt", "top_2.txt"]
+    assert payload.get("count_is_estimate") is None
+
+    arguments = {"glob": "src/*.txt", "scan_limit": 12, "max_results": 5}
+    call = ToolCall(id="call_list", name=FIND_FILES_TOOL_NAME, arguments=arguments)
+    payload = json.loads(registry.execute(call, tool_context).content)
+    assert payload["files"] == ["src/mod.txt"]
+    assert payload.get("count_is_estimate") is None
+
+
 def test_find_files_can_list_inside_ignored_root(registry, tool_context: ToolContext) -> None:
     (tool_context.workspace / "node_modules" / "pkg").mkdir(parents=True, exist_ok=True)
     (tool_context.workspace / "node_modules" / "pkg" / "a.js").write_text("a", encoding="utf-8")
@@ -407,13 +430,20 @@ def test_find_files_glob_matches_rg_dot_slash_paths(
         def kill(self) -> None:
             self.returncode = -9
 
+    commands: list[list[str]] = []
+
+    def _fake_popen(*args, **kwargs):
+        commands.append(args[0])
+        return _FakeProcess()
+
     monkeypatch.setattr(workspace_io, "_resolve_rg_executable", lambda: "rg")
-    monkeypatch.setattr(workspace_io.subprocess, "Popen", lambda *args, **kwargs: _FakeProcess())
+    monkeypatch.setattr(workspace_io.subprocess, "Popen", _fake_popen)
 
     call = ToolCall(id="call_list", name=FIND_FILES_TOOL_NAME, arguments={"path": ".", "glob": "*.md"})
     result = registry.execute(call, tool_context)
     payload = json.loads(result.content)
 
+    assert commands[0][commands[0].index("--max-depth") + 1] == "1"
     assert payload["files"] == ["doc.md"]
     assert payload["count"] == 1
     assert payload["truncated"] is False
@@ -466,6 +496,27 @@ def test_find_files_rejects_pattern_argument(registry, tool_context: ToolContext
     ]
 
 
+def test_find_files_reports_missing_and_non_directory_base(registry, tool_context: ToolContext) -> None:
+    (tool_context.workspace / "plain.txt").write_text("x", encoding="utf-8")
+
+    missing = registry.execute(
+        ToolCall(id="find_missing", name=FIND_FILES_TOOL_NAME, arguments={"path": "missing"}),
+        tool_context,
+    )
+    not_directory = registry.execute(
+        ToolCall(id="find_not_directory", name=FIND_FILES_TOOL_NAME, arguments={"path": "plain.txt"}),
+        tool_context,
+    )
+    below_file = registry.execute(
+        ToolCall(id="find_below_file", name=FIND_FILES_TOOL_NAME, arguments={"path": "plain.txt/child"}),
+        tool_context,
+    )
+
+    assert missing.error_code == "path_not_found"
+    assert not_directory.error_code == "not_a_directory"
+    assert below_file.error_code == "path_not_found"
+
+
 def test_find_files_supports_offset_sort_and_sensitive_filter(registry, tool_context: ToolContext) -> None:
     first = tool_context.workspace / "first.txt"
     second = tool_context.workspace / "second.txt"
@@ -541,6 +592,38 @@ def test_find_files_non_local_backend_honors_scan_limit(registry, tmp_path: Path
     assert payload["scan_limit"] == 2
 
 
+def test_read_and_edit_file_report_non_files_as_not_found(registry, tool_context: ToolContext) -> None:
+    (tool_context.workspace / "folder").mkdir()
+    paths = ["missing.txt", "folder"]
+    if hasattr(os, "mkfifo"):
+        os.mkfifo(tool_context.workspace / "pipe")
+        paths.append("pipe")
+
+    for path in paths:
+        read_result = registry.execute(
+            ToolCall(id=f"read_{path}", name=READ_FILE_TOOL_NAME, arguments={"path": path}),
+            tool_context,
+        )
+        edit_result = registry.execute(
+            ToolCall(
+                id=f"edit_{path}",
+                name=EDIT_FILE_TOOL_NAME,
+                arguments={"path": path, "old_string": "a", "new_string": "b"},
+            ),
+            tool_context,
+        )
+        assert read_result.error_code == "file_not_found"
+        assert edit_result.error_code == "file_not_found"
+
+
+def test_read_and_edit_file_report_missing_files_before_invalid_arguments(tool_context: ToolContext) -> None:
+    read_result = workspace_io.read_file(tool_context, {"path": "missing.txt", "start_line": "x"})
+    edit_result = workspace_io.edit_file(tool_context, {"path": "missing.txt", "old_string": "", "new_string": "b"})
+
+    assert read_result.error_code == "file_not_found"
+    assert edit_result.error_code == "file_not_found"
+
+
 def test_read_file_can_show_line_numbers(registry, tool_context: ToolContext) -> None:
     target = tool_context.workspace / "notes.txt"
     target.write_text("alpha\nbeta\ngamma", encoding="utf-8")
@@ -625,6 +708,18 @@ def test_search_files(registry, tool_context: ToolContext) -> None:
     assert payload["matches"][0]["line"] == 1
 
 
+def test_search_result_truncation_counts_lines_like_splitlines() -> None:
+    max_lines = search_handler._MAX_RESULT_LINES
+    trailing_newline = "row\n" * max_lines
+    text, truncated = search_handler._truncate_result_text(trailing_newline, total_matches=1, files_with_matches=1)
+    assert (text, truncated) == (trailing_newline, False)
+
+    form_feed_rows = "row\x0c" * max_lines + "last"
+    text, truncated = search_handler._truncate_result_text(form_feed_rows, total_matches=1, files_with_matches=1)
+    assert truncated is True
+    assert f"Shown: {max_lines} lines" in text
+
+
 def test_search_files_defaults_to_files_with_matches(registry, tool_context: ToolContext) -> None:
     (tool_context.workspace / "a.txt").write_text("token one", encoding="utf-8")
     (tool_context.workspace / "b.txt").write_text("token two", encoding="utf-8")
@@ -969,6 +1064,18 @@ def test_search_files_supports_multiline_and_head_limit(registry, tool_context:
     assert payload["summary"]["total_matches"] == 1
 
 
+def test_search_files_multiline_reports_line_of_each_match(registry, tool_context: ToolContext) -> None:
+    (tool_context.workspace / "multi_lines.txt").write_text("a\nopen\nclose\nb\n\nopen\nclose\n", encoding="utf-8")
+    call = ToolCall(
+        id="call_multi_lines",
+        name=SEARCH_FILES_TOOL_NAME,
+        arguments={"pattern": "open\\nclose", "path": "multi_lines.txt", "output_mode": "content", "multiline": True},
+    )
+    result = registry.execute(call, tool_context)
+
+    assert [row["line"] for row in result.metadata["matches"]] == [2, 6]
+
+
 def test_search_files_caps_structured_payload_without_duplication(
     registry,
     tool_context: ToolContext,
@@ -1386,6 +1493,29 @@ def test_edit_file_rejects_file_changed_since_read(registry, tool_context: ToolC
     assert target.read_text(encoding="utf-8") == "hello user"
 
 
+def test_edit_file_rejects_same_size_change_since_read(registry, tool_context: ToolContext) -> None:
+    target = tool_context.workspace / "same_size.txt"
+    target.write_text("hello world", encoding="utf-8")
+
+    registry.execute(
+        ToolCall(id="read_same_size", name=READ_FILE_TOOL_NAME, arguments={"path": "same_size.txt"}),
+        tool_context,
+    )
+    target.write_text("hello there", encoding="utf-8")
+
+    result = registry.execute(
+        ToolCall(
+            id="edit_same_size",
+            name=EDIT_FILE_TOOL_NAME,
+            arguments={"path": "same_size.txt", "old_string": "hello", "new_string": "hi"},
+        ),
+        tool_context,
+    )
+
+    assert result.error_code == "file_changed_since_read"
+    assert target.read_text(encoding="utf-8") == "hello there"
+
+
 def test_edit_file_allows_consecutive_edits_after_full_read(registry, tool_context: ToolContext) -> None:
     target = tool_context.workspace / "consecutive.txt"
     target.write_text("alpha beta gamma", encoding="utf-8")
@@ -1508,6 +1638,80 @@ def test_edit_file_accepts_append_to_known_existing_file_baseline(registry, tool
     assert target.read_text(encoding="utf-8") == "before changed"
 
 
+def test_write_file_append_records_baseline_without_reading_file_back(registry, tmp_path: Path) -> None:
+    read_paths: list[str] = []
+
+    class _TrackingBackend(LocalWorkspaceBackend):
+        def read_bytes(self, path: str) -> bytes:
+            read_paths.append(path)
+            return super().read_bytes(path)
+
+    context = ToolContext(
+        workspace=tmp_path,
+        shared_state={"todo_list": []},
+        cycle_index=1,
+        workspace_backend=_TrackingBackend(tmp_path),
+    )
+    registry.execute(
+        ToolCall(id="create_log", name=WRITE_FILE_TOOL_NAME, arguments={"path": "log.txt", "content": "start\n"}),
+        context,
+    )
+    for idx in range(3):
+        read_paths.clear()
+        result = registry.execute(
+            ToolCall(
+                id=f"append_log_{idx}",
+                name=WRITE_FILE_TOOL_NAME,
+                arguments={"path": "log.txt", "content": f"entry {idx}", "append": True, "trailing_newline": True},
+            ),
+            context,
+        )
+        assert result.status_code is ToolResultStatus.SUCCESS
+        assert read_paths == ["log.txt"]
+
+    result = registry.execute(
+        ToolCall(
+            id="edit_log",
+            name=EDIT_FILE_TOOL_NAME,
+            arguments={"path": "log.txt", "old_string": "entry 2", "new_string": "entry two"},
+        ),
+        context,
+    )
+    assert result.status_code is ToolResultStatus.SUCCESS
+    assert (tmp_path / "log.txt").read_text(encoding="utf-8") == "start\nentry 0\nentry 1\nentry two\n"
+
+
+def test_write_file_rereads_baseline_from_transforming_backend(registry, tmp_path: Path) -> None:
+    class _CrlfBackend(LocalWorkspaceBackend):
+        verbatim_text_round_trip: bool = False
+
+        def write_text(self, path: str, content: str, *, append: bool = False) -> int:
+            super().write_text(path, content.replace("\n", "\r\n"), append=append)
+            return len(content.encode("utf-8"))
+
+    context = ToolContext(
+        workspace=tmp_path,
+        shared_state={"todo_list": []},
+        cycle_index=1,
+        workspace_backend=_CrlfBackend(tmp_path),
+    )
+    result = registry.execute(
+        ToolCall(id="create_notes", name=WRITE_FILE_TOOL_NAME, arguments={"path": "notes.txt", "content": "a\nb"}),
+        context,
+    )
+    assert result.status_code is ToolResultStatus.SUCCESS
+
+    result = registry.execute(
+        ToolCall(
+            id="edit_notes",
+            name=EDIT_FILE_TOOL_NAME,
+            arguments={"path": "notes.txt", "old_string": "b", "new_string": "c"},
+        ),
+        context,
+    )
+    assert result.status_code is ToolResultStatus.SUCCESS
+
+
 def test_edit_file_replace_all_replaces_every_match(registry, tool_context: ToolContext) -> None:
     target = tool_context.workspace / "replace_all.txt"
     target.write_text("hello world\nhello agent", encoding="utf-8")
@@ -1536,6 +1740,33 @@ def test_edit_file_replace_all_replaces_every_match(registry, tool_context: Tool
     assert target.read_text(encoding="utf-8") == "hi world\nhi agent"
 
 
+def test_edit_file_replace_all_counts_same_length_replacements(registry, tool_context: ToolContext) -> None:
+    target = tool_context.workspace / "replace_same_length.txt"
+    target.write_text("cat cat\ncat", encoding="utf-8")
+
+    registry.execute(
+        ToolCall(id="read_same_length", name=READ_FILE_TOOL_NAME, arguments={"path": "replace_same_length.txt"}),
+        tool_context,
+    )
+    result = registry.execute(
+        ToolCall(
+            id="edit_same_length",
+            name=EDIT_FILE_TOOL_NAME,
+            arguments={
+                "path": "replace_same_length.txt",
+                "old_string": "cat",
+                "new_string": "dog",
+                "replace_all": True,
+            },
+        ),
+        tool_context,
+    )
+
+    payload = json.loads(result.content)
+    assert payload["replaced_count"] == 3
+    assert target.read_text(encoding="utf-8") == "dog dog\ndog"
+
+
 def test_edit_file_success_returns_changed_files_and_diff_metadata(registry, tool_context: ToolContext) -> None:
     target = tool_context.workspace / "diff.txt"
     target.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
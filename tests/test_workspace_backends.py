@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import itertools
+import os
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from io import BytesIO
 from pathlib import Path
@@ -16,6 +19,9 @@ from vv_agent.workspace import (
     MemoryWorkspaceBackend,
 )
 from vv_agent.workspace import artifacts as artifact_runtime
+from vv_agent.workspace import memory as memory_module
+from vv_agent.workspace import s3 as s3_module
+from vv_agent.workspace.base import _normalize_workspace_path
 from vv_agent.workspace.s3 import S3WorkspaceBackend
 
 
@@ -29,19 +35,45 @@ class _FakeNoSuchKey(_FakeClientError):
     pass
 
 
+class _FakeStreamingBody(BytesIO):
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        while chunk := self.read(chunk_size):
+            yield chunk
+
+
 class _FakeS3Exceptions:
     NoSuchKey = _FakeNoSuchKey
     ClientError = _FakeClientError
 
 
 class _FakePaginator:
-    def __init__(self, objects: dict[str, bytes]) -> None:
-        self._objects = objects
+    def __init__(self, client: _FakeS3Client) -> None:
+        self._client = client
 
-    def paginate(self, **kwargs: Any) -> list[dict[str, list[dict[str, str]]]]:
+    def paginate(self, **kwargs: Any) -> list[dict[str, Any]]:
         prefix = str(kwargs["Prefix"])
-        contents = [{"Key": key} for key in sorted(self._objects) if key.startswith(prefix)]
-        return [{"Contents": contents}]
+        delimiter = kwargs.get("Delimiter")
+        start_after = str(kwargs.get("StartAfter", ""))
+        self._client.list_prefixes.append(prefix)
+        self._client.list_requests.append(dict(kwargs))
+        contents: list[dict[str, str]] = []
+        common_prefixes: list[dict[str, str]] = []
+        for key in sorted(self._client.objects):
+            if not key.startswith(prefix) or key <= start_after:
+                continue
+            if delimiter and delimiter in key[len(prefix) :]:
+                common_prefix = prefix + key[len(prefix) :].split(delimiter, 1)[0] + delimiter
+                if {"Prefix": common_prefix} not in common_prefixes:
+                    common_prefixes.append({"Prefix": common_prefix})
+                continue
+            contents.append({"Key": key})
+        page_size = self._client.page_size
+        pages: list[dict[str, Any]] = [
+            {"Contents": contents[start : start + page_size], "IsTruncated": start + page_size < len(contents)}
+            for start in range(0, max(len(contents), 1), page_size)
+        ]
+        pages[0]["CommonPrefixes"] = common_prefixes
+        return pages
 
 
 class _FakeS3Client:
@@ -49,15 +81,58 @@ class _FakeS3Client:
         self.exceptions = _FakeS3Exceptions()
         self.objects: dict[str, bytes] = {}
         self.put_requests: list[dict[str, Any]] = []
+        self.list_prefixes: list[str] = []
+        self.list_requests: list[dict[str, Any]] = []
+        self.head_requests: list[str] = []
+        self.get_requests: list[str] = []
+        self.page_size = 1000
+        self.multipart_uploads: dict[str, list[tuple[int, bytes]]] = {}
+        self.transfer_configs: list[Any] = []
 
     def get_paginator(self, _name: str) -> _FakePaginator:
-        return _FakePaginator(self.objects)
+        return _FakePaginator(self)
 
-    def get_object(self, **kwargs: Any) -> dict[str, BytesIO]:
+    def get_object(self, **kwargs: Any) -> dict[str, Any]:
         key = str(kwargs["Key"])
+        self.get_requests.append(key)
         if key not in self.objects:
             raise _FakeNoSuchKey(key)
-        return {"Body": BytesIO(self.objects[key])}
+        body = self.objects[key]
+        return {"Body": _FakeStreamingBody(body), "ContentLength": len(body), "ETag": f'"{hash(body)}"'}
+
+    def download_fileobj(self, bucket: str, key: str, fileobj: Any, Config: Any = None) -> None:
+        self.transfer_configs.append(Config)
+        fileobj.write(self.objects[key])
+
+    def upload_fileobj(self, fileobj: Any, bucket: str, key: str, Config: Any = None) -> None:
+        self.transfer_configs.append(Config)
+        self.objects[key] = fileobj.read()
+
+    def create_multipart_upload(self, **kwargs: Any) -> dict[str, str]:
+        upload_id = f"upload-{len(self.multipart_uploads)}"
+        self.multipart_uploads[upload_id] = []
+        return {"UploadId": upload_id}
+
+    def upload_part_copy(self, **kwargs: Any) -> dict[str, Any]:
+        source = self.objects[kwargs["CopySource"]["Key"]]
+        assert kwargs["CopySourceIfMatch"] == f'"{hash(source)}"'
+        start, end = (int(bound) for bound in str(kwargs["CopySourceRange"]).removeprefix("bytes=").split("-"))
+        self.multipart_uploads[kwargs["UploadId"]].append((kwargs["PartNumber"], source[start : end + 1]))
+        return {"CopyPartResult": {"ETag": f"copy-{kwargs['PartNumber']}"}}
+
+    def upload_part(self, **kwargs: Any) -> dict[str, str]:
+        body = bytes(kwargs["Body"])
+        assert kwargs["ContentLength"] == len(body)
+        self.multipart_uploads[kwargs["UploadId"]].append((kwargs["PartNumber"], body))
+        return {"ETag": f"part-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs: Any) -> None:
+        parts = sorted(self.multipart_uploads.pop(kwargs["UploadId"]))
+        assert [part["PartNumber"] for part in kwargs["MultipartUpload"]["Parts"]] == [number for number, _ in parts]
+        self.objects[str(kwargs["Key"])] = b"".join(body for _, body in parts)
+
+    def abort_multipart_upload(self, **kwargs: Any) -> None:
+        self.multipart_uploads.pop(kwargs["UploadId"], None)
 
     def put_object(self, **kwargs: Any) -> None:
         key = str(kwargs["Key"])
@@ -77,10 +152,16 @@ class _FakeS3Client:
 
     def head_object(self, **kwargs: Any) -> dict[str, Any]:
         key = str(kwargs["Key"])
+        self.head_requests.append(key)
         if key not in self.objects:
-            raise _FakeClientError(key)
+            raise _FakeClientError(
+                key,
+                response={"Error": {"Code": "404"}, "ResponseMetadata": {"HTTPStatusCode": 404}},
+            )
+        body = self.objects[key]
         return {
-            "ContentLength": len(self.objects[key]),
+            "ContentLength": len(body),
+            "ETag": f'"{hash(body)}"',
             "LastModified": datetime.now(tz=UTC),
         }
 
@@ -245,6 +326,18 @@ def test_local_workspace_backend_replaces_invalid_utf8_when_reading_text(tmp_pat
     assert backend.read_text("mixed.log") == "ok\ufffddone"
 
 
+def test_local_workspace_backend_reads_bytes_only_from_regular_files(tmp_path: Path) -> None:
+    (tmp_path / "folder").mkdir()
+    backend = LocalWorkspaceBackend(tmp_path)
+
+    with pytest.raises(IsADirectoryError):
+        backend.read_bytes("folder")
+    if hasattr(os, "mkfifo"):
+        os.mkfifo(tmp_path / "pipe")
+        with pytest.raises(OSError, match="not a regular file"):
+            backend.read_bytes("pipe")
+
+
 def test_workspace_backends_normalize_inner_dot_segments(tmp_path: Path) -> None:
     backends = [
         LocalWorkspaceBackend(tmp_path / "local"),
@@ -258,6 +351,143 @@ def test_workspace_backends_normalize_inner_dot_segments(tmp_path: Path) -> None
         assert backend.list_files(".", "*.txt") == ["canonical.txt"]
 
 
+def test_local_and_memory_backends_share_glob_semantics(tmp_path: Path) -> None:
+    backends = [LocalWorkspaceBackend(tmp_path), MemoryWorkspaceBackend()]
+    for backend in backends:
+        for path in ("top.py", "src/main.py", "src/pkg/test_a.py", "src/pkg/test_ab.py", "docs/a+b.md"):
+            backend.write_text(path, "x")
+
+    expected = {
+        "*.py": ["top.py"],
+        "src/*.py": ["src/main.py"],
+        "**/test_?.py": ["src/pkg/test_a.py"],
+        "src/**": ["src/main.py", "src/pkg/test_a.py", "src/pkg/test_ab.py"],
+        "docs/a+b.md": ["docs/a+b.md"],
+    }
+    for backend in backends:
+        for pattern, files in expected.items():
+            assert backend.list_files(".", pattern) == files
+
+
+def test_s3_list_files_lists_only_the_glob_literal_prefix() -> None:
+    backend = _make_s3_backend()
+    for path in ("logs/2024-01/app.log", "logs/2024-02/app.log", "logs/2023-12/app.log", "src/main.py"):
+        backend.write_text(path, "x")
+    client = backend._client
+
+    assert backend.list_files(".", "logs/2024-*/app.log") == ["logs/2024-01/app.log", "logs/2024-02/app.log"]
+    assert client.list_prefixes[-1] == "tenant/workspace/logs/2024-"
+    assert backend.list_files("logs", "[2]*/app.log") == [
+        "logs/2023-12/app.log",
+        "logs/2024-01/app.log",
+        "logs/2024-02/app.log",
+    ]
+    assert client.list_prefixes[-1] == "tenant/workspace/logs/"
+
+
+def test_s3_list_files_splits_truncated_listings_by_child_prefix() -> None:
+    backend = _make_s3_backend()
+    paths = ["top.txt", *(f"dir{index}/file{item}.txt" for index in range(3) for item in range(3)), "one/deep/x.txt"]
+    for path in paths:
+        backend.write_text(path, "x")
+    client = backend._client
+    client.page_size = 2
+
+    assert backend.list_files(".", "**/*") == sorted(paths)
+    assert "tenant/workspace/dir1/" in client.list_prefixes
+    root_requests = [request for request in client.list_requests if request["Prefix"] == "tenant/workspace/"]
+    assert root_requests == [
+        {"Bucket": "test-bucket", "Prefix": "tenant/workspace/"},
+        {
+            "Bucket": "test-bucket",
+            "Prefix": "tenant/workspace/",
+            "StartAfter": "tenant/workspace/dir0/file1.txt",
+            "Delimiter": "/",
+        },
+    ]
+    assert {"Bucket": "test-bucket", "Prefix": "tenant/workspace/dir0/", "StartAfter": "tenant/workspace/dir0/file1.txt"} in (
+        client.list_requests
+    )
+
+    client.list_prefixes.clear()
+    client.page_size = 1000
+    assert backend.list_files(".", "**/*") == sorted(paths)
+    assert client.list_prefixes == ["tenant/workspace/"]
+
+
+def test_s3_backends_with_the_same_settings_share_one_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    created: list[dict[str, Any]] = []
+
+    def _fake_client(service_name: str, **kwargs: Any) -> object:
+        created.append({"service_name": service_name, **kwargs})
+        return object()
+
+    real_import_module = s3_module.importlib.import_module
+
+    def _import_module(name: str) -> Any:
+        if name == "botocore.config":
+            return SimpleNamespace(Config=lambda **kwargs: kwargs)
+        return real_import_module(name)
+
+    monkeypatch.setattr(s3_module, "_require_boto3", lambda: SimpleNamespace(client=_fake_client))
+    monkeypatch.setattr(s3_module.importlib, "import_module", _import_module)
+    s3_module._shared_s3_client.cache_clear()
+    try:
+        first = S3WorkspaceBackend(bucket="one", endpoint_url="https://s3.example")
+        second = S3WorkspaceBackend(bucket="two", prefix="tenant", endpoint_url="https://s3.example")
+        other = S3WorkspaceBackend(bucket="one", endpoint_url="https://s3.example", aws_access_key_id="other")
+    finally:
+        s3_module._shared_s3_client.cache_clear()
+
+    assert first._client is second._client
+    assert other._client is not first._client
+    assert len(created) == 2
+    assert created[0]["config"]["max_pool_connections"] == 64
+
+
+def test_s3_workspace_streams_object_chunks() -> None:
+    backend = _make_s3_backend()
+    backend.write_text("big.bin", "abcdefg")
+
+    assert list(backend.read_bytes_stream("big.bin", chunk_size=3)) == [b"abc", b"def", b"g"]
+
+
+def _patch_transfer_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    real_import_module = s3_module.importlib.import_module
+
+    def _import_module(name: str) -> Any:
+        if name == "boto3.s3.transfer":
+            return SimpleNamespace(TransferConfig=lambda **kwargs: kwargs)
+        return real_import_module(name)
+
+    monkeypatch.setattr(s3_module.importlib, "import_module", _import_module)
+
+
+def test_s3_workspace_read_to_file_uses_transfer_manager(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = _make_s3_backend()
+    backend.write_text("big.bin", "payload")
+    _patch_transfer_config(monkeypatch)
+    dst = BytesIO()
+
+    backend.read_to_file("big.bin", dst)
+
+    assert dst.getvalue() == b"payload"
+    assert backend._client.transfer_configs == [{"multipart_threshold": 8 << 20, "max_concurrency": 8}]
+
+
+def test_s3_workspace_large_writes_use_transfer_manager(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = _make_s3_backend()
+    _patch_transfer_config(monkeypatch)
+    monkeypatch.setattr(s3_module, "_TRANSFER_MULTIPART_THRESHOLD_BYTES", 8)
+
+    assert backend.write_text("small.txt", "1234567") == 7
+    assert backend.write_text("big.txt", "12345678") == 8
+
+    assert [request["Key"] for request in backend._client.put_requests] == ["tenant/workspace/small.txt"]
+    assert backend.read_text("big.txt") == "12345678"
+    assert len(backend._client.transfer_configs) == 1
+
+
 def test_local_workspace_parent_escape_matches_rust_contract(tmp_path: Path) -> None:
     backend = LocalWorkspaceBackend(tmp_path)
 
@@ -288,6 +518,60 @@ def test_virtual_workspace_parent_escape_is_clamped_to_root() -> None:
         assert info.path == "escape.txt"
 
 
+def test_memory_workspace_listing_stays_sorted_across_out_of_order_writes() -> None:
+    backend = MemoryWorkspaceBackend()
+    for path in ("src/b.py", "src/a.py", "docs/x.py"):
+        backend.write_text(path, "x")
+
+    assert backend.list_files("src", "*.py") == ["src/a.py", "src/b.py"]
+
+    backend.write_text("src/0.py", "x")
+    backend.write_text("src/a.py", "y", append=True)
+    backend.write_text_exclusive("src/c.py", "x")
+
+    assert backend.list_files(".", "**/*.py") == ["docs/x.py", "src/0.py", "src/a.py", "src/b.py", "src/c.py"]
+
+
+def test_virtual_workspace_suffix_comes_from_the_last_path_segment() -> None:
+    expected = {"pkg.v1/Makefile": "", "pkg.v1/archive.tar.gz": ".gz", ".env": ".env"}
+
+    for backend in (MemoryWorkspaceBackend(), _make_s3_backend()):
+        for path, suffix in expected.items():
+            backend.write_text(path, "x")
+            info = backend.file_info(path)
+            assert info is not None
+            assert info.suffix == suffix
+
+
+def test_memory_workspace_registers_every_missing_parent_directory() -> None:
+    backend = MemoryWorkspaceBackend()
+
+    backend.mkdir("a/b")
+    backend.write_text("a/b/c/d/file.txt", "x")
+    backend.write_text("a/e/file.txt", "y")
+
+    assert backend._dirs == {"", "a", "a/b", "a/b/c", "a/b/c/d", "a/e"}
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("src/app.py", "src/app.py"),
+        ("", ""),
+        ("a/.env", "a/.env"),
+        ("./a/b", "a/b"),
+        ("a/./b/", "a/b"),
+        ("a//b", "a/b"),
+        ("/a/../../b", "b"),
+        ("a\\b", "a/b"),
+        ("..", ""),
+        ("a/...b", "a/...b"),
+    ],
+)
+def test_normalize_workspace_path_keeps_normal_paths_and_rewrites_the_rest(path: str, expected: str) -> None:
+    assert _normalize_workspace_path(path) == expected
+
+
 def test_memory_workspace_dot_and_parent_paths_address_root() -> None:
     backend = MemoryWorkspaceBackend()
 
@@ -309,6 +593,40 @@ def test_s3_workspace_append_reports_uploaded_utf8_byte_count() -> None:
     assert backend.read_text("note.txt") == initial + appended
 
 
+def test_s3_workspace_append_preserves_existing_bytes_verbatim() -> None:
+    backend = _make_s3_backend()
+    backend._client.objects["tenant/workspace/raw.log"] = b"\xff\xfe"
+
+    assert backend.write_text("raw.log", "ok", append=True) == 4
+    assert backend._client.objects["tenant/workspace/raw.log"] == b"\xff\xfeok"
+
+
+def test_s3_workspace_append_copies_large_objects_server_side(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = _make_s3_backend()
+    monkeypatch.setattr(s3_module, "_MULTIPART_APPEND_MIN_BYTES", 4)
+    monkeypatch.setattr(s3_module, "_MULTIPART_COPY_MAX_PART_BYTES", 3)
+    backend.write_text("big.log", "abcdefg")
+    put_count = len(backend._client.put_requests)
+
+    backend._client.get_requests.clear()
+
+    assert backend.write_text("big.log", "世界", append=True) == 7 + len("世界".encode())
+    assert backend._client.get_requests == []
+    assert backend.read_text("big.log") == "abcdefg世界"
+    assert len(backend._client.put_requests) == put_count
+    assert backend._client.multipart_uploads == {}
+
+
+@pytest.mark.parametrize("size", [(5 << 30) + (1 << 20), 5 << 30, (10 << 30) + 1, 5 << 20])
+def test_s3_append_copy_ranges_respect_part_size_limits(size: int) -> None:
+    ranges = s3_module._copy_part_ranges(size)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == size - 1
+    assert all(next_start == end + 1 for (_, end), (next_start, _) in itertools.pairwise(ranges))
+    assert all(5 << 20 <= end - start + 1 <= 5 << 30 for start, end in ranges)
+
+
 def test_discovery_filtered_workspace_hides_only_listed_paths() -> None:
     backend = MemoryWorkspaceBackend()
     backend.write_text("notes/readme.md", "notes")
@@ -330,6 +648,14 @@ def test_discovery_filtered_workspace_hides_only_listed_paths() -> None:
     filtered.mkdir("logs/archive")
     assert backend.exists("generated/new.bin") is True
     assert backend.exists("logs/archive") is True
+    assert filtered.verbatim_text_round_trip is True
+
+
+def test_workspace_backends_declare_verbatim_text_round_trip(tmp_path: Path) -> None:
+    assert LocalWorkspaceBackend(tmp_path).verbatim_text_round_trip is True
+    assert MemoryWorkspaceBackend().verbatim_text_round_trip is True
+    assert _make_s3_backend().verbatim_text_round_trip is False
+    assert DiscoveryFilteredWorkspaceBackend(_make_s3_backend(), r"^logs/").verbatim_text_round_trip is False
 
 
 @pytest.mark.parametrize("pattern", [r"(?=secret)", r"(a)\1", r"\p{Greek}"])
@@ -363,6 +689,33 @@ class TestLocalWorkspaceBackend:
         backend.write_text("log.txt", "b", append=True)
         assert backend.read_text("log.txt") == "ab"
 
+    def test_overwrite_replaces_file_atomically_and_keeps_mode(self, backend: LocalWorkspaceBackend, tmp: Path) -> None:
+        target = tmp / "nested" / "dir" / "script.sh"
+        backend.write_text("nested/dir/script.sh", "echo one\n")
+        target.chmod(0o755)
+
+        backend.write_text("nested/dir/script.sh", "echo two\n")
+
+        assert target.read_text(encoding="utf-8") == "echo two\n"
+        assert target.stat().st_mode & 0o777 == 0o755
+        assert sorted(path.name for path in target.parent.iterdir()) == ["script.sh"]
+
+    def test_overwrite_spanning_several_encode_slices(self, backend: LocalWorkspaceBackend, tmp: Path) -> None:
+        content = "é" * 600_000 + "end"
+
+        written = backend.write_text("large.txt", content)
+
+        assert written == len(content.encode("utf-8"))
+        assert (tmp / "large.txt").read_text(encoding="utf-8") == content
+
+    def test_append_with_unencodable_text_leaves_file_untouched(self, backend: LocalWorkspaceBackend, tmp: Path) -> None:
+        backend.write_text("log.txt", "a")
+
+        with pytest.raises(UnicodeEncodeError):
+            backend.write_text("log.txt", "b\ud800", append=True)
+
+        assert (tmp / "log.txt").read_text(encoding="utf-8") == "a"
+
     def test_read_bytes(self, backend: LocalWorkspaceBackend, tmp: Path) -> None:
         (tmp / "bin.dat").write_bytes(b"\x00\x01\x02")
         assert backend.read_bytes("bin.dat") == b"\x00\x01\x02"
@@ -472,6 +825,14 @@ class TestMemoryWorkspaceBackend:
         files = backend.list_files(".", "**/*.py")
         assert files == ["a.py"]
 
+    def test_list_files_under_subdirectory_and_exact_path(self, backend: MemoryWorkspaceBackend) -> None:
+        backend.write_text("src/a.py", "x")
+        backend.write_text("src/pkg/b.py", "y")
+        backend.write_text("srcx/c.py", "z")
+        assert backend.list_files("src", "**/*.py") == ["src/a.py", "src/pkg/b.py"]
+        assert backend.list_files("src", "pkg/b.py") == ["src/pkg/b.py"]
+        assert backend.list_files("src", "pkg/missing.py") == []
+
     def test_file_info(self, backend: MemoryWorkspaceBackend) -> None:
         backend.write_text("info.txt", "data")
         info = backend.file_info("info.txt")
@@ -481,6 +842,21 @@ class TestMemoryWorkspaceBackend:
         assert info.size == 4
         assert info.suffix == ".txt"
 
+    def test_file_info_reports_last_write_time(self, backend: MemoryWorkspaceBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = iter([1_700_000_000.0, 1_700_000_060.0])
+        monkeypatch.setattr(memory_module, "time", lambda: next(clock))
+
+        backend.write_text("log.txt", "a")
+        first = backend.file_info("log.txt")
+        assert first is not None
+        assert backend.file_info("log.txt") == first
+        assert first.modified_at == "2023-11-14T22:13:20+00:00"
+
+        backend.write_text("log.txt", "b", append=True)
+        updated = backend.file_info("log.txt")
+        assert updated is not None
+        assert updated.modified_at == "2023-11-14T22:14:20+00:00"
+
     def test_file_info_dir(self, backend: MemoryWorkspaceBackend) -> None:
         backend.mkdir("mydir")
         info = backend.file_info("mydir")